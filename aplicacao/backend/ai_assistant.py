@@ -1,74 +1,153 @@
 import os
 import google.generativeai as genai
-from backend.db_config import get_db_connection
+from db_config import get_connection
 import psycopg
+import ai_cache
+import area_cache
+import similaridade
+from tabulate import tabulate
 
-# Configure a API do Gemini
-try:
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-except TypeError:
-    print("\nERRO: Chave da API do Gemini não configurada.")
-    print("Verifique se sua variável de ambiente 'GEMINI_API_KEY' está correta.")
-    exit()
+MODELO_GEMINI = 'gemini-1.5-flash-latest'
 
+_gemini_configurado = False
+_modelo = None
+
+
+def _configurar_gemini():
+    """
+    Configura a API do Gemini na primeira utilização, e não na importação do módulo.
+    Retorna False (sem encerrar o programa) se a chave não estiver definida.
+    """
+    global _gemini_configurado
+    if _gemini_configurado:
+        return True
+
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("\nERRO: Chave da API do Gemini não configurada.")
+        print("Verifique se sua variável de ambiente 'GEMINI_API_KEY' está correta.")
+        return False
+
+    genai.configure(api_key=api_key)
+    _gemini_configurado = True
+    return True
+
+
+def _get_modelo():
+    """Reaproveita a mesma instância de GenerativeModel entre as chamadas."""
+    global _modelo
+    if _modelo is None:
+        _modelo = genai.GenerativeModel(MODELO_GEMINI)
+    return _modelo
+
+
+def _ask_gemini(prompt, usar_cache=None):
+    """
+    Função genérica para enviar um prompt para a IA e retornar a resposta.
+    Respostas são reaproveitadas do cache em disco (ai_cache); use usar_cache=False,
+    ou AI_CACHE_DESATIVADO=1 no .env, para sempre consultar a IA.
+    """
+    if usar_cache is None:
+        usar_cache = os.getenv("AI_CACHE_DESATIVADO", "0") != "1"
+
+    if usar_cache:
+        resposta = ai_cache.obter(MODELO_GEMINI, prompt)
+        if resposta is not None:
+            return resposta
+
+    if not _configurar_gemini():
+        return "O assistente de IA não está disponível sem a chave da API."
 
-def _ask_gemini(prompt):
-    """Função genérica para enviar um prompt para a IA e retornar a resposta."""
     print("\n🤖 Pensando... A IA está gerando sugestões criativas...")
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash-latest')
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        response = _get_modelo().generate_content(prompt)
+        resposta = response.text.strip()
     except Exception as e:
         return f"Ocorreu um erro ao contatar a IA: {e}"
 
+    # Só respostas bem-sucedidas vão para o cache
+    if usar_cache:
+        ai_cache.gravar(MODELO_GEMINI, prompt, resposta)
+    return resposta
+
+
+def _get_area_ids(alunos=(), professores=()):
+    """
+    Busca, numa única ida ao banco, os ids das áreas de interesse de vários alunos
+    (via projetos em que participam) e professores (via projetos que orientam).
+    Retorna {('aluno' | 'professor', id_usuario): {id_area, ...}}.
+    """
+    query = """
+            SELECT 'aluno' AS tipo, ap.id_aluno AS id_usuario, pa.id_area
+            FROM cpe_enc.aluno_projeto ap
+                     JOIN cpe_enc.projeto_area pa ON ap.id_projeto = pa.id_projeto
+            WHERE ap.id_aluno = ANY(%(alunos)s)
+            UNION
+            SELECT 'professor', p.id_professor_orientador, pa.id_area
+            FROM cpe_enc.projeto p
+                     JOIN cpe_enc.projeto_area pa ON p.id_projeto = pa.id_projeto
+            WHERE p.id_professor_orientador = ANY(%(professores)s);
+            """
+
+    areas = {}
+    with get_connection() as conn:
+        if not conn: return areas
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute(query, {"alunos": list(alunos), "professores": list(professores)})
+                for tipo, id_usuario, id_area in cur.fetchall():
+                    areas.setdefault((tipo, id_usuario), set()).add(id_area)
+        except psycopg.Error as e:
+            print(f"Erro de banco de dados ao buscar interesses: {e}")
+
+    return areas
+
 
 def _get_interests_by_user(user_id, user_type):
     """Busca as áreas de interesse de um aluno ou professor com base em seus projetos."""
     if user_type == 'aluno':
-        query = """
-                SELECT DISTINCT ai.nome_area
-                FROM cpe_enc.aluno_projeto ap
-                         JOIN cpe_enc.projeto_area pa ON ap.id_projeto = pa.id_projeto
-                         JOIN cpe_enc.area_de_interesse ai ON pa.id_area = ai.id_area
-                WHERE ap.id_aluno = %s; \
-                """
+        areas = _get_area_ids(alunos=[user_id])
     elif user_type == 'professor':
-        query = """
-                SELECT DISTINCT ai.nome_area
-                FROM cpe_enc.projeto p
-                         JOIN cpe_enc.projeto_area pa ON p.id_projeto = pa.id_projeto
-                         JOIN cpe_enc.area_de_interesse ai ON pa.id_area = ai.id_area
-                WHERE p.id_professor_orientador = %s; \
-                """
+        areas = _get_area_ids(professores=[user_id])
     else:
         return []
 
-    conn = get_db_connection()
-    if not conn: return []
+    return area_cache.nomes(areas.get((user_type, user_id), set()))
 
-    interests = []
-    try:
-        with conn.cursor() as cur:
-            cur.execute(query, (user_id,))
-            results = cur.fetchall()
-            interests = [row[0] for row in results]
-    except psycopg.Error as e:
-        print(f"Erro de banco de dados ao buscar interesses: {e}")
-    finally:
-        if conn: conn.close()
 
-    return interests
+def get_interests_for_pairs(pares):
+    """
+    Versão em lote para muitos pares (id_aluno, id_professor): uma única consulta
+    para todos. Retorna {(id_aluno, id_professor): (areas do aluno, areas do professor)},
+    com os nomes das áreas ordenados.
+    """
+    pares = list(pares)
+    areas = _get_area_ids(alunos={a for a, _ in pares}, professores={p for _, p in pares})
+    return {
+        (a, p): (area_cache.nomes(areas.get(('aluno', a), set())),
+                 area_cache.nomes(areas.get(('professor', p), set())))
+        for a, p in pares
+    }
+
+
+def _ler_id(mensagem):
+    try:
+        return int(input(mensagem))
+    except ValueError:
+        print("ID inválido. Por favor, digite um número.")
+        return None
 
 
 def suggest_projects_with_professor():
     """Handler para a Opção 1: Sugerir projeto com um professor específico."""
-    aluno_id = input("Qual o seu ID de aluno? ")
-    professor_id = input("Qual o ID do professor com quem você gostaria de trabalhar? ")
+    aluno_id = _ler_id("Qual o seu ID de aluno? ")
+    if aluno_id is None: return
+    professor_id = _ler_id("Qual o ID do professor com quem você gostaria de trabalhar? ")
+    if professor_id is None: return
 
     print("\nBuscando informações no banco de dados...")
-    aluno_interests = _get_interests_by_user(aluno_id, 'aluno')
-    prof_interests = _get_interests_by_user(professor_id, 'professor')
+    aluno_interests, prof_interests = get_interests_for_pairs([(aluno_id, professor_id)])[(aluno_id, professor_id)]
 
     if not aluno_interests:
         print(
@@ -79,8 +158,8 @@ def suggest_projects_with_professor():
             f"Erro: Não foram encontradas áreas de interesse para o professor com ID {professor_id}. Não é possível continuar.")
         return
 
-    # Combina as listas e remove duplicatas
-    combined_interests = list(set(aluno_interests + prof_interests))
+    # Combina as listas e remove duplicatas (ordenado para que o prompt, e a chave do cache, seja estável)
+    combined_interests = sorted(set(aluno_interests + prof_interests))
 
     prompt = f"""
     Você é um conselheiro acadêmico especialista em inovação.
@@ -108,7 +187,8 @@ def suggest_projects_with_professor():
 
 def find_professors_with_similar_interests():
     """Handler para a Opção 2: Encontrar professores com interesses em comum."""
-    aluno_id = input("Qual o seu ID de aluno? ")
+    aluno_id = _ler_id("Qual o seu ID de aluno? ")
+    if aluno_id is None: return
 
     print("\nBuscando suas áreas de interesse...")
     aluno_interests = _get_interests_by_user(aluno_id, 'aluno')
@@ -120,23 +200,41 @@ def find_professors_with_similar_interests():
 
     print(f"Seus interesses são: {', '.join(aluno_interests)}")
 
+    # Professores reais, pela semelhança entre as áreas dos projetos (calculada localmente)
+    professores = similaridade.professores_similares(aluno_id, k=5)
+    if not professores:
+        print("\nNenhum professor orienta projetos nas suas áreas de interesse.")
+        return
+
+    print("\n--- Professores com Interesses em Comum ---")
+    print(tabulate(
+        [(p['id_professor'], p['nome_completo'], f"{p['similaridade']:.0%}", ', '.join(p['areas_em_comum']))
+         for p in professores],
+        headers=["ID", "Professor", "Similaridade", "Áreas em comum"], tablefmt="grid"
+    ))
+
+    if input("\nDeseja ideias de projetos da IA para esses professores? (s/n): ").lower() != 's':
+        return
+
+    perfis = "\n".join(f"    - {p['nome_completo']}: {', '.join(p['areas_em_comum'])}" for p in professores)
     prompt = f"""
     Você é um assistente de pesquisa inteligente para uma universidade.
-    Um aluno precisa de ajuda para encontrar um orientador e ter ideias de projetos.
+    Um aluno está procurando um orientador e ideias de projetos.
 
     Contexto:
     - As áreas de interesse do aluno, com base nos projetos que ele já participou, são: {', '.join(aluno_interests)}.
+    - Professores com interesses em comum e as áreas compartilhadas:
+{perfis}
 
     Tarefa:
-    1. Descreva o perfil de 2 ou 3 tipos de professores ideais para este aluno, com base nos interesses dele.
-    2. Para cada perfil de professor, sugira 2 ideias de projetos inovadores que o aluno poderia desenvolver com ele.
-    3. As ideias de projeto devem ser diretamente relacionadas aos interesses do aluno.
+    Para cada professor listado, sugira 2 ideias de projetos inovadores que o aluno poderia desenvolver com ele,
+    diretamente relacionadas às áreas em comum.
 
     Seja criativo e prático nas suas sugestões. Formate a resposta de forma clara.
     """
 
     suggestion = _ask_gemini(prompt)
-    print("\n--- 🤖 Professores e Projetos Recomendados ---")
+    print("\n--- 🤖 Ideias de Projetos ---")
     print(suggestion)
 
 
@@ -147,6 +245,7 @@ def menu_ai_assistant():
         print("1 - Quero desenvolver um projeto com um professor específico.")
         print("2 - Quero descobrir professores com meus interesses e ter ideias de projetos.")
         print("3 - Sair")
+        print("4 - Ver estatísticas do cache de respostas")
 
         choice = input("Escolha uma opção: ")
 
@@ -157,6 +256,12 @@ def menu_ai_assistant():
         elif choice == '3':
             print("Até logo!")
             break
+        elif choice == '4':
+            stats = ai_cache.estatisticas()
+            print(f"\nEntradas no cache: {stats['entradas']}")
+            print(f"Acertos: {stats['hits']} | Falhas: {stats['misses']} | "
+                  f"Taxa de acerto: {stats['taxa_acerto']:.0%}")
+            print(f"Expiradas: {stats['expirados']} | Removidas por limite (LRU): {stats['removidos_lru']}")
         else:
             print("Opção inválida. Por favor, tente novamente.")
 
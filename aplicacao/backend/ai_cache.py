@@ -0,0 +1,124 @@
+"""
+Cache persistente (SQLite) das respostas do Gemini usadas por ai_assistant.
+
+A chave é o hash SHA-256 do nome do modelo + prompt normalizado (espaços
+colapsados), então prompts idênticos gerados por suggest_projects_with_professor
+reaproveitam a resposta. As entradas expiram após AI_CACHE_TTL segundos e o
+total é limitado a AI_CACHE_MAX_ENTRADAS, removendo as menos usadas
+recentemente (LRU).
+"""
+import os
+import re
+import time
+import hashlib
+import sqlite3
+import threading
+
+CACHE_ARQUIVO = os.getenv("AI_CACHE_ARQUIVO", os.path.join(".cache", "ai_respostas.sqlite3"))
+CACHE_TTL = float(os.getenv("AI_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRADAS = int(os.getenv("AI_CACHE_MAX_ENTRADAS", "500"))
+
+_conn = None
+_lock = threading.Lock()
+_contadores = {"hits": 0, "misses": 0, "expirados": 0, "removidos_lru": 0}
+
+
+def _conexao():
+    global _conn
+    if _conn is None:
+        pasta = os.path.dirname(CACHE_ARQUIVO)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        _conn = sqlite3.connect(CACHE_ARQUIVO, check_same_thread=False)
+        _conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resposta (
+                chave TEXT PRIMARY KEY,
+                modelo TEXT NOT NULL,
+                resposta TEXT NOT NULL,
+                criado_em REAL NOT NULL,
+                ultimo_acesso REAL NOT NULL
+            )
+            """
+        )
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_resposta_acesso ON resposta (ultimo_acesso)")
+        _conn.commit()
+    return _conn
+
+
+def chave(modelo, prompt):
+    """Hash do modelo + prompt com espaços normalizados (indentação e quebras de linha não contam)."""
+    normalizado = re.sub(r"\s+", " ", prompt).strip()
+    return hashlib.sha256(f"{modelo}\n{normalizado}".encode("utf-8")).hexdigest()
+
+
+def obter(modelo, prompt):
+    """Retorna a resposta em cache ou None (ausente ou expirada)."""
+    k = chave(modelo, prompt)
+    agora = time.time()
+    with _lock:
+        conn = _conexao()
+        linha = conn.execute("SELECT resposta, criado_em FROM resposta WHERE chave = ?", (k,)).fetchone()
+        if linha is None:
+            _contadores["misses"] += 1
+            return None
+
+        resposta, criado_em = linha
+        if agora - criado_em > CACHE_TTL:
+            conn.execute("DELETE FROM resposta WHERE chave = ?", (k,))
+            conn.commit()
+            _contadores["expirados"] += 1
+            _contadores["misses"] += 1
+            return None
+
+        conn.execute("UPDATE resposta SET ultimo_acesso = ? WHERE chave = ?", (agora, k))
+        conn.commit()
+        _contadores["hits"] += 1
+        return resposta
+
+
+def gravar(modelo, prompt, resposta):
+    """Armazena a resposta e aplica a expiração por TTL e o limite de entradas (LRU)."""
+    agora = time.time()
+    with _lock:
+        conn = _conexao()
+        conn.execute(
+            """
+            INSERT INTO resposta (chave, modelo, resposta, criado_em, ultimo_acesso)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (chave) DO UPDATE SET resposta = excluded.resposta,
+                criado_em = excluded.criado_em, ultimo_acesso = excluded.ultimo_acesso
+            """,
+            (chave(modelo, prompt), modelo, resposta, agora, agora)
+        )
+        conn.execute("DELETE FROM resposta WHERE criado_em < ?", (agora - CACHE_TTL,))
+        excedente = conn.execute(
+            """
+            DELETE FROM resposta WHERE chave IN (
+                SELECT chave FROM resposta ORDER BY ultimo_acesso DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (CACHE_MAX_ENTRADAS,)
+        ).rowcount
+        _contadores["removidos_lru"] += max(excedente, 0)
+        conn.commit()
+
+
+def estatisticas():
+    """Contadores do processo atual mais o número de entradas no arquivo."""
+    with _lock:
+        entradas = _conexao().execute("SELECT COUNT(*) FROM resposta").fetchone()[0]
+    consultas = _contadores["hits"] + _contadores["misses"]
+    return {
+        **_contadores,
+        "entradas": entradas,
+        "taxa_acerto": _contadores["hits"] / consultas if consultas else 0.0,
+    }
+
+
+def limpar():
+    """Remove todas as respostas armazenadas."""
+    with _lock:
+        conn = _conexao()
+        conn.execute("DELETE FROM resposta")
+        conn.commit()
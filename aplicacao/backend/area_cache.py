@@ -0,0 +1,57 @@
+"""
+Cache em memória da tabela area_de_interesse (id_area -> nome_area).
+
+A tabela é pequena e quase nunca muda, então as consultas de interesses
+trazem só os ids e os nomes são resolvidos aqui. O cache é recarregado
+quando aparece um id desconhecido, quando passa de AREA_CACHE_TTL segundos
+ou quando invalidar() é chamado (ex.: após alterar áreas).
+"""
+import os
+import time
+import threading
+import psycopg
+from db_config import get_connection
+
+AREA_CACHE_TTL = float(os.getenv("AREA_CACHE_TTL", "300"))
+
+_areas = None
+_carregado_em = 0.0
+_lock = threading.Lock()
+
+
+def _carregar():
+    global _areas, _carregado_em
+    with get_connection() as conn:
+        if not conn:
+            return
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT id_area, nome_area FROM cpe_enc.area_de_interesse;")
+                _areas = dict(cur.fetchall())
+                _carregado_em = time.monotonic()
+        except psycopg.Error as e:
+            print(f"Erro ao carregar as áreas de interesse: {e}")
+
+
+def get_areas():
+    """Retorna o dicionário {id_area: nome_area}, carregando-o se necessário."""
+    with _lock:
+        if _areas is None or time.monotonic() - _carregado_em > AREA_CACHE_TTL:
+            _carregar()
+        return dict(_areas or {})
+
+
+def nomes(ids_area):
+    """Converte ids de área em nomes, ordenados. Recarrega uma vez se algum id for novo."""
+    areas = get_areas()
+    if any(i not in areas for i in ids_area):
+        invalidar()
+        areas = get_areas()
+    return sorted(areas[i] for i in ids_area if i in areas)
+
+
+def invalidar():
+    """Descarta o cache; a próxima leitura consulta o banco novamente."""
+    global _areas
+    with _lock:
+        _areas = None
@@ -0,0 +1,175 @@
+"""
+Teste de carga da aprovação de candidaturas (crud.aio.candidatura_crud).
+
+Cria um cenário próprio: um projeto com 'vagas' vagas de 1 a 'posicoes_max'
+posições e 'por_vaga' candidaturas em cada uma, de alunos já cadastrados.
+Depois dispara 'aprovadores' corrotinas que tentam aprovar todas as candidaturas
+em ordem aleatória, cada uma 'tentativas' vezes, simulando avaliadores que
+disputam as mesmas vagas e as mesmas candidaturas. As corrotinas dividem um
+pool assíncrono de 'conexoes' conexões.
+
+Ao final são informados a vazão e a latência das tentativas, e conferido que:
+- nenhuma vaga ficou com mais aprovadas do que numero_posicoes;
+- toda vaga ficou com min(numero_posicoes, candidaturas) aprovadas (nenhuma posição perdida);
+- vaga.posicoes_preenchidas bate com o número de aprovadas.
+O cenário é apagado no final.
+
+Uso (a partir de aplicacao/backend, com as migrations aplicadas e alunos no banco):
+    python -m benchmarks.bench_candidaturas --aprovadores 300 --conexoes 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from collections import Counter
+
+from db_config import get_db_connection, get_async_pool, close_async_pool
+from crud.aio import candidatura_crud
+from benchmarks.bench_pool import _percentil
+
+
+def criar_cenario(conn, vagas, por_vaga, posicoes_max, semente):
+    """Cria o projeto, as vagas e as candidaturas. Retorna (id_projeto, ids das candidaturas)."""
+    rng = random.Random(semente)
+    with conn.cursor() as cur:
+        cur.execute("SELECT id_usuario FROM cpe_enc.professor LIMIT 1;")
+        professor = cur.fetchone()
+        cur.execute("SELECT id_usuario FROM cpe_enc.aluno ORDER BY id_usuario LIMIT %s;", (por_vaga,))
+        alunos = [linha[0] for linha in cur.fetchall()]
+        if professor is None or len(alunos) < por_vaga:
+            raise RuntimeError(f"São necessários 1 professor e {por_vaga} alunos no banco.")
+
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.projeto (titulo, dt_inicio, status, id_professor_orientador)
+            VALUES ('Teste de carga de candidaturas', CURRENT_DATE, 'Em Andamento', %s)
+            RETURNING id_projeto;
+            """,
+            professor
+        )
+        id_projeto = cur.fetchone()[0]
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.vaga (id_projeto, descricao_requisitos, numero_posicoes, prazo_inscricao)
+            SELECT %s, 'Vaga do teste de carga', p, CURRENT_TIMESTAMP + INTERVAL '1 day'
+            FROM unnest(%s::int[]) AS p
+            RETURNING id_vaga;
+            """,
+            (id_projeto, [rng.randint(1, posicoes_max) for _ in range(vagas)])
+        )
+        ids_vagas = [linha[0] for linha in cur.fetchall()]
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.candidatura (id_aluno, id_vaga)
+            SELECT a, v FROM unnest(%s::int[]) AS a, unnest(%s::int[]) AS v
+            RETURNING id_candidatura;
+            """,
+            (alunos, ids_vagas)
+        )
+        candidaturas = [linha[0] for linha in cur.fetchall()]
+    conn.commit()
+    return id_projeto, candidaturas
+
+
+def conferir(conn, id_projeto):
+    """Retorna a lista de (id_vaga, posições, preenchidas, aprovadas, candidaturas) do cenário."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT v.id_vaga, v.numero_posicoes, v.posicoes_preenchidas,
+                   COUNT(*) FILTER (WHERE c.status = 'Aprovada'), COUNT(c.id_candidatura)
+            FROM cpe_enc.vaga AS v
+            LEFT JOIN cpe_enc.candidatura AS c ON c.id_vaga = v.id_vaga
+            WHERE v.id_projeto = %s
+            GROUP BY v.id_vaga, v.numero_posicoes, v.posicoes_preenchidas
+            ORDER BY v.id_vaga;
+            """,
+            (id_projeto,)
+        )
+        vagas = cur.fetchall()
+    conn.rollback()
+    return vagas
+
+
+async def aprovar_em_paralelo(candidaturas, aprovadores):
+    """Roda os aprovadores até esvaziar a fila. Retorna (latências, contagem por resultado, duração)."""
+    fila = asyncio.Queue()
+    for id_candidatura in candidaturas:
+        fila.put_nowait(id_candidatura)
+    latencias = []
+    resultados = Counter()
+
+    async def aprovador():
+        while True:
+            try:
+                id_candidatura = fila.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            inicio = time.perf_counter()
+            resultado = await candidatura_crud.aprovar_candidatura(id_candidatura)
+            latencias.append(time.perf_counter() - inicio)
+            resultados["aprovada" if resultado["ok"] else resultado["erro"]] += 1
+
+    pool = await get_async_pool()
+    await pool.wait()
+    try:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(aprovador() for _ in range(aprovadores)))
+        return latencias, resultados, time.perf_counter() - inicio
+    finally:
+        await close_async_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aprovações simultâneas de candidaturas: vazão e overbooking.")
+    parser.add_argument("--aprovadores", type=int, default=300)
+    parser.add_argument("--conexoes", type=int, default=50, help="tamanho do pool assíncrono")
+    parser.add_argument("--vagas", type=int, default=50)
+    parser.add_argument("--por-vaga", type=int, default=40, help="candidaturas por vaga")
+    parser.add_argument("--posicoes-max", type=int, default=5)
+    parser.add_argument("--tentativas", type=int, default=2, help="aprovações disparadas por candidatura")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    # Lido por db_config ao criar o pool assíncrono
+    os.environ["DB_POOL_MIN_SIZE"] = os.environ["DB_POOL_MAX_SIZE"] = str(args.conexoes)
+
+    conn = get_db_connection()
+    if not conn:
+        return
+    id_projeto = None
+    try:
+        id_projeto, candidaturas = criar_cenario(conn, args.vagas, args.por_vaga, args.posicoes_max, args.semente)
+        tentativas = candidaturas * args.tentativas
+        random.Random(args.semente).shuffle(tentativas)
+        print(f"{len(candidaturas)} candidaturas em {args.vagas} vagas; {len(tentativas)} tentativas de aprovação "
+              f"com {args.aprovadores} aprovadores e {args.conexoes} conexões")
+
+        latencias, resultados, duracao = asyncio.run(aprovar_em_paralelo(tentativas, args.aprovadores))
+        ms = [t * 1000 for t in latencias]
+        print(f"vazão: {len(tentativas) / duracao:.0f} tentativas/s ({duracao:.2f}s)  "
+              f"p50={_percentil(ms, 50):.2f} ms  p95={_percentil(ms, 95):.2f} ms  p99={_percentil(ms, 99):.2f} ms")
+        print("resultados: " + ", ".join(f"{nome}={total}" for nome, total in sorted(resultados.items())))
+
+        vagas = conferir(conn, id_projeto)
+        acima = [v for v in vagas if v[3] > v[1]]
+        incompletas = [v for v in vagas if v[3] < min(v[1], v[4])]
+        contador_errado = [v for v in vagas if v[2] != v[3]]
+        print(f"posições: {sum(v[1] for v in vagas)}, aprovadas: {sum(v[3] for v in vagas)}")
+        print(f"vagas com overbooking: {len(acima)}  vagas com posição livre sobrando: {len(incompletas)}  "
+              f"contador divergente: {len(contador_errado)}")
+        if acima or incompletas or contador_errado or resultados["aprovada"] != sum(v[3] for v in vagas):
+            print("FALHA na conferência das vagas.")
+            raise SystemExit(1)
+        print("OK: nenhuma vaga ultrapassou numero_posicoes.")
+    finally:
+        if id_projeto is not None:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM cpe_enc.projeto WHERE id_projeto = %s;", (id_projeto,))
+            conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Mede o tempo de importação de main.py (o caminho até o menu CRUD) com
+'python -X importtime' e falha se passar do orçamento ou se algum módulo
+pesado (pandas, matplotlib, seaborn, google.generativeai) for carregado.
+
+Uso (a partir de aplicacao/backend):
+    python -m benchmarks.bench_importtime --orcamento-ms 400
+Retorna código de saída 1 quando o orçamento é estourado.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+MODULOS_PESADOS = ("pandas", "matplotlib", "seaborn", "google.generativeai", "numpy")
+
+# Linhas no formato: "import time:  self [us] | cumulative | imported package"
+_LINHA = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def medir_importacao(modulo="main"):
+    """Retorna (tempo cumulativo em ms, conjunto de módulos importados)."""
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True, cwd=os.getcwd(), check=True
+    )
+    total_us = 0
+    importados = set()
+    for linha in processo.stderr.splitlines():
+        m = _LINHA.match(linha)
+        if not m:
+            continue
+        importados.add(m.group(4))
+        if m.group(4) == modulo:
+            total_us = int(m.group(2))
+    return total_us / 1000, importados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Orçamento de tempo de importação do menu principal.")
+    parser.add_argument("--orcamento-ms", type=float,
+                        default=float(os.getenv("ORCAMENTO_IMPORTACAO_MS", "400")))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    medicoes = []
+    importados = set()
+    for _ in range(args.repeticoes):
+        tempo, importados = medir_importacao()
+        medicoes.append(tempo)
+    melhor = min(medicoes)
+
+    pesados = sorted(m for m in importados
+                     if any(m == p or m.startswith(p + ".") for p in MODULOS_PESADOS))
+    print(f"Importação de main: melhor de {args.repeticoes} = {melhor:.1f} ms "
+          f"(orçamento: {args.orcamento_ms:.0f} ms)")
+
+    falhou = False
+    if pesados:
+        print(f"FALHA: módulos pesados carregados na inicialização: {', '.join(pesados)}")
+        falhou = True
+    if melhor > args.orcamento_ms:
+        print("FALHA: tempo de importação acima do orçamento.")
+        falhou = True
+
+    if falhou:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
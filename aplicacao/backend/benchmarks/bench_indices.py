@@ -0,0 +1,129 @@
+"""
+Mede, com EXPLAIN (ANALYZE, BUFFERS), as consultas afetadas pela migração
+migrations/001_indices.sql antes e depois de aplicá-la.
+
+Uso (a partir de aplicacao/backend, com o esquema já criado):
+    python -m benchmarks.bench_indices --escala 100000 --repeticoes 5
+Sem --escala, usa os dados que já estão no banco.
+"""
+import argparse
+import re
+import statistics
+
+from db_config import get_db_connection
+from benchmarks.dados import popular_escala
+
+MIGRACAO = "migrations/001_indices.sql"
+
+# Cópias das consultas dos relatórios, do assistente e do CRUD tocadas pelos índices
+CONSULTAS = {
+    "relatorio 1 (areas)": ("""
+        SELECT ai.nome_area, COUNT(DISTINCT ap.id_aluno) AS numero_de_alunos_unicos
+        FROM cpe_enc.area_de_interesse AS ai
+        JOIN cpe_enc.projeto_area AS pa ON ai.id_area = pa.id_area
+        JOIN cpe_enc.aluno_projeto AS ap ON pa.id_projeto = ap.id_projeto
+        GROUP BY ai.nome_area
+        ORDER BY numero_de_alunos_unicos DESC
+    """, None),
+    "relatorio 2 (professores)": ("""
+        SELECT u.nome_completo AS nome_professor, COUNT(p.id_projeto) AS numero_de_projetos
+        FROM cpe_enc.professor AS prof
+        JOIN cpe_enc.usuario AS u ON prof.id_usuario = u.id_usuario
+        JOIN cpe_enc.projeto AS p ON prof.id_usuario = p.id_professor_orientador
+        WHERE p.status IN ('Em Andamento', 'Proposto')
+        GROUP BY u.nome_completo
+        ORDER BY numero_de_projetos ASC
+    """, None),
+    "relatorio 3 (vagas abertas)": ("""
+        SELECT p.titulo AS titulo_projeto, u.nome_completo AS professor_orientador,
+               SUM(v.numero_posicoes) AS total_de_vagas_abertas
+        FROM cpe_enc.vaga AS v
+        JOIN cpe_enc.projeto AS p ON v.id_projeto = p.id_projeto
+        JOIN cpe_enc.professor AS prof ON p.id_professor_orientador = prof.id_usuario
+        JOIN cpe_enc.usuario AS u ON prof.id_usuario = u.id_usuario
+        WHERE v.prazo_inscricao > CURRENT_TIMESTAMP
+        GROUP BY p.titulo, u.nome_completo
+        ORDER BY total_de_vagas_abertas DESC
+    """, None),
+    "interesses do professor": ("""
+        SELECT DISTINCT ai.nome_area
+        FROM cpe_enc.projeto p
+        JOIN cpe_enc.projeto_area pa ON p.id_projeto = pa.id_projeto
+        JOIN cpe_enc.area_de_interesse ai ON pa.id_area = ai.id_area
+        WHERE p.id_professor_orientador = %s
+    """, (1,)),
+    "projetos por professor": ("""
+        SELECT p.id_projeto, p.titulo FROM cpe_enc.projeto AS p
+        WHERE p.id_professor_orientador = %s ORDER BY p.titulo
+    """, (1,)),
+    "pagina de projetos (keyset)": ("""
+        SELECT p.id_projeto, p.titulo FROM cpe_enc.projeto AS p
+        WHERE (p.titulo, p.id_projeto) > (%s, %s) ORDER BY p.titulo, p.id_projeto LIMIT 50
+    """, ("Projeto 5", 5)),
+    "delete_projeto (cascata)": ("""
+        DELETE FROM cpe_enc.projeto WHERE id_projeto = %s
+    """, (1,)),
+}
+
+
+def _nomes_dos_indices():
+    with open(MIGRACAO, encoding="utf-8") as f:
+        return re.findall(r"CREATE INDEX IF NOT EXISTS (\w+)", f.read())
+
+
+def _explain(conn, sql, params):
+    """Retorna (tempo de planejamento, tempo de execução) em ms. Alterações são desfeitas."""
+    with conn.cursor() as cur:
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql, params)
+        plano = cur.fetchone()[0][0]
+    conn.rollback()
+    return plano["Planning Time"], plano["Execution Time"]
+
+
+def _medir(conn, repeticoes):
+    resultados = {}
+    for nome, (sql, params) in CONSULTAS.items():
+        tempos = [_explain(conn, sql, params)[1] for _ in range(repeticoes)]
+        resultados[nome] = statistics.median(tempos)
+    return resultados
+
+
+def _executar(conn, sql):
+    with conn.cursor() as cur:
+        cur.execute(sql)
+        cur.execute("ANALYZE;")
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE antes/depois da migração de índices.")
+    parser.add_argument("--escala", type=int, help="número de usuários a gerar antes de medir")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if not conn:
+        return
+
+    try:
+        if args.escala:
+            popular_escala(conn, args.escala)
+
+        indices = _nomes_dos_indices()
+        _executar(conn, "; ".join(f"DROP INDEX IF EXISTS cpe_enc.{nome}" for nome in indices))
+        antes = _medir(conn, args.repeticoes)
+
+        with open(MIGRACAO, encoding="utf-8") as f:
+            _executar(conn, f.read())
+        depois = _medir(conn, args.repeticoes)
+
+        print(f"\n{'consulta':<30} {'antes (ms)':>12} {'depois (ms)':>12} {'ganho':>8}")
+        for nome in CONSULTAS:
+            ganho = antes[nome] / depois[nome] if depois[nome] else float("inf")
+            print(f"{nome:<30} {antes[nome]:>12.3f} {depois[nome]:>12.3f} {ganho:>7.1f}x")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compara pd.read_sql com leitura_colunar.ler_dataframe (COPY em CSV lido pelo leitor em C do pandas).
+
+Mede uma consulta de 'linhas' linhas gerada no servidor (inteiros, numeric, texto
+e data, com alguns NULLs) e as consultas dos relatórios gerenciais.
+Cada leitor roda 'repeticoes' vezes na mesma conexão; é informada a mediana.
+
+Uso (a partir de aplicacao/backend):
+    python -m benchmarks.bench_leitura --linhas 1000000 --repeticoes 5
+"""
+import argparse
+import statistics
+import time
+import warnings
+
+import pandas as pd
+from db_config import get_db_connection
+from report_views import CONSULTAS_RELATORIOS
+from leitura_colunar import ler_dataframe
+
+SQL_SINTETICA = """
+    SELECT g AS id,
+           (g % 1000)::int AS grupo,
+           CASE WHEN g % 97 = 0 THEN NULL ELSE g * 2 END AS dobro,
+           (g % 10000)::numeric / 7 AS razao,
+           md5(g::text) AS texto,
+           DATE '2020-01-01' + (g % 2000) AS dia
+    FROM generate_series(1, {linhas}) AS g
+"""
+
+
+def _read_sql(conn, sql):
+    # Conexão psycopg sem SQLAlchemy: o pandas avisa que usa o caminho genérico de DBAPI
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return pd.read_sql(sql, conn)
+
+
+def medir(conn, ler, sql, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        df = ler(conn, sql)
+        tempos.append(time.perf_counter() - inicio)
+        conn.rollback()
+    return statistics.median(tempos), df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pd.read_sql x COPY em CSV lido direto para colunas.")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if not conn:
+        return
+
+    consultas = {f"sintética ({args.linhas} linhas)": SQL_SINTETICA.format(linhas=args.linhas)}
+    consultas.update({f"relatório {i}": sql for i, sql in CONSULTAS_RELATORIOS.items()})
+
+    try:
+        for nome, sql in consultas.items():
+            t_pandas, df_pandas = medir(conn, _read_sql, sql, args.repeticoes)
+            t_colunar, df_colunar = medir(conn, ler_dataframe, sql, args.repeticoes)
+            print(f"\n{nome}: {len(df_colunar)} linhas")
+            print(f"  pd.read_sql    {t_pandas * 1000:10.1f} ms  "
+                  f"memória={df_pandas.memory_usage(deep=True).sum() / 2**20:8.1f} MiB")
+            print(f"  ler_dataframe  {t_colunar * 1000:10.1f} ms  "
+                  f"memória={df_colunar.memory_usage(deep=True).sum() / 2**20:8.1f} MiB  "
+                  f"({t_pandas / t_colunar:.2f}x)")
+            print("  dtypes: " + ", ".join(f"{c}={t}" for c, t in df_colunar.dtypes.items()))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
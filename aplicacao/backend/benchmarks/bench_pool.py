@@ -0,0 +1,70 @@
+"""
+Compara a latência por chamada de uma consulta simples usando
+conexões avulsas (psycopg.connect a cada chamada) e o pool de db_config.
+
+Uso (a partir de aplicacao/backend):
+    python -m benchmarks.bench_pool --chamadas 500
+"""
+import argparse
+import statistics
+import time
+
+from db_config import get_db_connection, get_connection, get_pool
+
+SQL = "SELECT u.id_usuario, u.nome_completo FROM cpe_enc.usuario AS u WHERE u.id_usuario = %s;"
+
+
+def _percentil(amostras, p):
+    ordenadas = sorted(amostras)
+    indice = min(len(ordenadas) - 1, int(round(p / 100 * (len(ordenadas) - 1))))
+    return ordenadas[indice]
+
+
+def _resumo(nome, amostras):
+    ms = [a * 1000 for a in amostras]
+    print(f"{nome:<12} média={statistics.mean(ms):8.3f} ms  "
+          f"p50={_percentil(ms, 50):8.3f} ms  p95={_percentil(ms, 95):8.3f} ms  "
+          f"p99={_percentil(ms, 99):8.3f} ms")
+
+
+def medir_sem_pool(chamadas):
+    amostras = []
+    for i in range(chamadas):
+        inicio = time.perf_counter()
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(SQL, (i % 10 + 1,))
+                cur.fetchone()
+        finally:
+            conn.close()
+        amostras.append(time.perf_counter() - inicio)
+    return amostras
+
+
+def medir_com_pool(chamadas):
+    # Aquece o pool para não contar a abertura inicial das conexões
+    get_pool().wait()
+    amostras = []
+    for i in range(chamadas):
+        inicio = time.perf_counter()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(SQL, (i % 10 + 1,))
+                cur.fetchone()
+        amostras.append(time.perf_counter() - inicio)
+    return amostras
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência por chamada com e sem pool de conexões.")
+    parser.add_argument("--chamadas", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"Executando {args.chamadas} chamadas em cada modo...")
+    _resumo("sem pool", medir_sem_pool(args.chamadas))
+    _resumo("com pool", medir_com_pool(args.chamadas))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Mede o ganho dos comandos preparados (crud.consultas) nas buscas mais frequentes,
+get_projeto_by_id e get_professor_by_id:
+
+- tempo de planejamento informado pelo EXPLAIN (ANALYZE, SUMMARY), para a consulta
+  avulsa e para o EXECUTE de um comando preparado (já no plano genérico);
+- latência por chamada na mesma conexão, com prepare=False e prepare=True.
+
+Uso (a partir de aplicacao/backend, com dados no banco):
+    python -m benchmarks.bench_preparadas --chamadas 2000
+"""
+import argparse
+import re
+import statistics
+import time
+
+import psycopg
+from db_config import get_db_connection
+from crud.consultas import CONSULTAS
+from benchmarks.bench_pool import _percentil
+
+CONSULTAS_MEDIDAS = {
+    "get_projeto_by_id": ("projeto_por_id", "SELECT id_projeto FROM cpe_enc.projeto"),
+    "get_professor_by_id": ("professor_por_id", "SELECT id_usuario FROM cpe_enc.professor"),
+}
+
+_PLANEJAMENTO = re.compile(r"Planning Time: ([\d.]+) ms")
+
+
+def _para_posicional(sql):
+    """Troca os %s do psycopg por $1, $2... para uso em PREPARE."""
+    contador = iter(range(1, sql.count("%s") + 1))
+    return re.sub(r"%s", lambda _: f"${next(contador)}", sql).strip().rstrip(";")
+
+
+def _planejamento(cur, sql, params):
+    cur.execute(f"EXPLAIN (ANALYZE, SUMMARY) {sql}", params)
+    plano = "\n".join(linha[0] for linha in cur.fetchall())
+    return float(_PLANEJAMENTO.search(plano).group(1))
+
+
+def medir_planejamento(conn, nome, ids, repeticoes):
+    """Retorna (mediana avulsa, mediana preparada) do tempo de planejamento em ms."""
+    sql = CONSULTAS[nome]
+    # ClientCursor interpola os parâmetros no texto: EXPLAIN/EXECUTE não aceitam parâmetros do protocolo
+    with psycopg.ClientCursor(conn) as cur:
+        avulsa = [_planejamento(cur, sql.strip().rstrip(";"), (ids[i % len(ids)],)) for i in range(repeticoes)]
+
+        cur.execute(f"PREPARE bench_{nome} AS {_para_posicional(sql)}")
+        # Após 5 execuções o servidor passa a considerar o plano genérico, sem replanejar
+        for i in range(6):
+            cur.execute(f"EXECUTE bench_{nome}(%s)", (ids[i % len(ids)],))
+            cur.fetchall()
+        preparada = [_planejamento(cur, f"EXECUTE bench_{nome}(%s)", (ids[i % len(ids)],))
+                     for i in range(repeticoes)]
+        cur.execute(f"DEALLOCATE bench_{nome}")
+    conn.rollback()
+    return statistics.median(avulsa), statistics.median(preparada)
+
+
+def medir_latencia(conn, nome, ids, chamadas, preparar):
+    sql = CONSULTAS[nome]
+    amostras = []
+    with conn.cursor() as cur:
+        for i in range(chamadas):
+            inicio = time.perf_counter()
+            cur.execute(sql, (ids[i % len(ids)],), prepare=preparar)
+            cur.fetchone()
+            amostras.append((time.perf_counter() - inicio) * 1000)
+    conn.rollback()
+    return amostras
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Planejamento e latência com e sem comandos preparados.")
+    parser.add_argument("--chamadas", type=int, default=1000)
+    parser.add_argument("--repeticoes-explain", type=int, default=50)
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if not conn:
+        return
+    try:
+        for funcao, (nome, sql_ids) in CONSULTAS_MEDIDAS.items():
+            with conn.cursor() as cur:
+                cur.execute(f"{sql_ids} ORDER BY random() LIMIT 1000;")
+                ids = [linha[0] for linha in cur.fetchall()]
+            conn.rollback()
+            if not ids:
+                print(f"{funcao}: sem dados para medir.")
+                continue
+
+            avulsa, preparada = medir_planejamento(conn, nome, ids, args.repeticoes_explain)
+            print(f"\n{funcao} ({nome})")
+            print(f"  planejamento (mediana): avulsa={avulsa:.3f} ms  preparada={preparada:.3f} ms  "
+                  f"economia={avulsa - preparada:.3f} ms por chamada")
+
+            for rotulo, preparar in (("prepare=False", False), ("prepare=True", True)):
+                ms = medir_latencia(conn, nome, ids, args.chamadas, preparar)
+                print(f"  {rotulo:<14} média={statistics.mean(ms):7.3f} ms  p50={_percentil(ms, 50):7.3f} ms  "
+                      f"p95={_percentil(ms, 95):7.3f} ms  p99={_percentil(ms, 99):7.3f} ms")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
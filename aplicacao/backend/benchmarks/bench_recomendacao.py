@@ -0,0 +1,57 @@
+"""
+Mede a recomendação de vagas (recomendacao_vagas) em lote contra uma chamada por aluno.
+
+- lote: calcular(k) para todos os alunos de uma vez (consultas + pontuação NumPy);
+- por aluno: calcular(k, [id]) para uma amostra de 'amostra' alunos, com o tempo
+  extrapolado para todos os alunos com perfil.
+
+Também confere que o lote devolve, para os alunos da amostra, as mesmas
+pontuações da chamada individual.
+
+Uso (a partir de aplicacao/backend, com as migrations aplicadas e dados no banco):
+    python -m benchmarks.bench_recomendacao --k 10 --amostra 200
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import recomendacao_vagas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recomendação de vagas: lote x uma chamada por aluno.")
+    parser.add_argument("--k", type=int, default=recomendacao_vagas.K_PADRAO)
+    parser.add_argument("--amostra", type=int, default=200)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    lote = recomendacao_vagas.calcular(args.k)
+    t_lote = time.perf_counter() - inicio
+    if lote is None:
+        return
+    alunos = np.unique(lote["id_aluno"].to_numpy())
+    print(f"lote: {len(lote)} recomendações para {len(alunos)} aluno(s) em {t_lote:.2f}s")
+    if len(alunos) == 0:
+        return
+
+    amostra = random.Random(args.semente).sample(alunos.tolist(), min(args.amostra, len(alunos)))
+    divergentes = 0
+    inicio = time.perf_counter()
+    for id_aluno in amostra:
+        individual = recomendacao_vagas.calcular(args.k, [id_aluno])
+        esperado = lote.loc[lote["id_aluno"] == id_aluno, "pontuacao"].to_numpy()
+        # Vagas empatadas podem sair em outra ordem (ou trocar na k-ésima posição): compara as pontuações
+        obtido = individual["pontuacao"].to_numpy()
+        divergentes += len(obtido) != len(esperado) or not np.allclose(obtido, esperado, atol=1e-6)
+    t_amostra = time.perf_counter() - inicio
+
+    por_aluno = t_amostra / len(amostra)
+    print(f"por aluno: {por_aluno * 1000:.1f} ms/aluno na amostra de {len(amostra)}, "
+          f"~{por_aluno * len(alunos):.1f}s estimados para todos ({por_aluno * len(alunos) / t_lote:.1f}x o lote)")
+    print(f"amostra com pontuações diferentes entre lote e chamada individual: {divergentes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Mede reports.executar_todas em série (workers=1) e em paralelo (workers=N).
+
+Cada execução usa uma pasta de saída nova, para que o cache de gráficos esteja
+vazio e todos os relatórios sejam consultados e renderizados. Para comparação,
+também é informado o maior tempo de consulta + renderização de um relatório
+isolado (o limite inferior do modo paralelo) e quanto custa só subir um
+processo 'spawn' que importa reports (o custo que um pool de processos pagaria
+a cada chamada antes de renderizar qualquer gráfico).
+
+Uso (a partir de aplicacao/backend, com as migrations aplicadas e dados no banco):
+    python -m benchmarks.bench_relatorios --repeticoes 5
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import reports
+
+
+def _executar(workers):
+    """Roda executar_todas numa pasta vazia; retorna (segundos, maior consulta + renderização em s)."""
+    pasta_original = reports.OUTPUT_DIR
+    with tempfile.TemporaryDirectory() as pasta:
+        reports.OUTPUT_DIR = pasta
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                inicio = time.perf_counter()
+                caminhos = reports.executar_todas(workers=workers)
+                duracao = time.perf_counter() - inicio
+            manifesto = reports._ler_manifesto()
+        finally:
+            reports.OUTPUT_DIR = pasta_original
+    if len(caminhos) != len(reports.RELATORIOS):
+        raise RuntimeError(f"Só {len(caminhos)} de {len(reports.RELATORIOS)} relatórios foram gerados.")
+    maior = max(e["consulta_ms"] + e["render_ms"] for e in manifesto.values()) / 1000
+    return duracao, maior
+
+
+def _importar_reports():
+    import reports  # noqa: F401  (o custo medido é o da importação no processo novo)
+
+
+def custo_spawn():
+    """Segundos para subir um processo 'spawn' e importar reports nele."""
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        executor.submit(_importar_reports).result()
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatórios em série x em paralelo (threads).")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=len(reports.RELATORIOS))
+    args = parser.parse_args()
+
+    _executar(1)  # aquece o pool de conexões e as importações preguiçosas do matplotlib
+    resultados = {}
+    for nome, workers in (("série", 1), (f"paralelo ({args.workers} threads)", args.workers)):
+        medidas = [_executar(workers) for _ in range(args.repeticoes)]
+        resultados[nome] = statistics.median(d for d, _ in medidas)
+        print(f"{nome:24s} {resultados[nome] * 1000:10.1f} ms  "
+              f"(relatório mais lento: {statistics.median(m for _, m in medidas) * 1000:.1f} ms)")
+
+    serie, paralelo = resultados.values()
+    print(f"ganho do paralelo: {serie / paralelo:.2f}x")
+    print(f"subir um processo 'spawn' com reports: {custo_spawn() * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
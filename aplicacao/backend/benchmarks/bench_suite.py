@@ -0,0 +1,406 @@
+"""
+Suíte de benchmarks em escala: gera um conjunto de dados para cada escala
+pedida (db_setup.seed_scaled) e mede a latência de:
+
+- todas as funções públicas do pacote crud (síncronas, assíncronas e importação);
+- consulta e renderização de cada relatório de reports (separadamente);
+- ai_assistant._get_interests_by_user para alunos e professores.
+
+O resultado é gravado em JSON com p50/p95/p99 por função e escala, junto com o
+commit atual, para comparar execuções entre commits no mesmo Postgres local.
+
+Uso (a partir de aplicacao/backend, com as migrations aplicadas):
+    python -m benchmarks.bench_suite --escalas 10000,100000,1000000 --saida bench.json
+    python -m benchmarks.bench_suite --escalas 10000 --filtro projeto_crud
+
+ATENÇÃO: apaga e recria os dados do esquema cpe_enc.
+"""
+import argparse
+import asyncio
+import builtins
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime
+
+from db_config import get_connection, get_pool, close_async_pool
+from crud import aluno_crud, professor_crud, projeto_crud, importacao
+from crud.aio import aluno_crud as aio_aluno, professor_crud as aio_professor, projeto_crud as aio_projeto
+from benchmarks.bench_pool import _percentil
+import db_setup
+import report_views
+
+PREFIXO_EMAIL = "bench-"
+
+
+def _resumo(amostras):
+    ms = [a * 1000 for a in amostras]
+    return {
+        "n": len(ms),
+        "media_ms": round(statistics.mean(ms), 3),
+        "p50_ms": round(_percentil(ms, 50), 3),
+        "p95_ms": round(_percentil(ms, 95), 3),
+        "p99_ms": round(_percentil(ms, 99), 3),
+        "max_ms": round(max(ms), 3),
+    }
+
+
+def _responder(respostas):
+    """Substitui input() pelas respostas cujo início do prompt casa; '' para os demais."""
+    def _input(prompt=""):
+        texto = prompt.strip()
+        for inicio, resposta in respostas.items():
+            if texto.startswith(inicio):
+                return resposta() if callable(resposta) else resposta
+        return ""
+    return _input
+
+
+@contextlib.contextmanager
+def _silencioso(respostas=None):
+    """Descarta os prints do CRUD e, opcionalmente, responde aos input() das funções interativas."""
+    input_original = builtins.input
+    if respostas is not None:
+        builtins.input = _responder(respostas)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = input_original
+
+
+def medir(funcao, repeticoes, respostas=None):
+    """Chama funcao(i) 'repeticoes' vezes e retorna o resumo das latências."""
+    amostras = []
+    with _silencioso(respostas):
+        for i in range(repeticoes):
+            inicio = time.perf_counter()
+            resultado = funcao(i)
+            if hasattr(resultado, "__next__"):
+                for _ in resultado:
+                    pass
+            amostras.append(time.perf_counter() - inicio)
+    return _resumo(amostras)
+
+
+async def medir_async(funcao, repeticoes):
+    amostras = []
+    with _silencioso():
+        for i in range(repeticoes):
+            inicio = time.perf_counter()
+            await funcao(i)
+            amostras.append(time.perf_counter() - inicio)
+    return _resumo(amostras)
+
+
+def _amostrar_ids(cur, sql, quantidade, semente):
+    cur.execute("SELECT setseed(%s);", (semente,))
+    cur.execute(f"{sql} ORDER BY random() LIMIT %s;", (quantidade,))
+    return [linha[0] for linha in cur.fetchall()]
+
+
+def _ids_por_email(emails):
+    with get_connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT email, id_usuario FROM cpe_enc.usuario WHERE email = ANY(%s);", (list(emails),))
+        por_email = dict(cur.fetchall())
+    return [por_email.get(e) for e in emails]
+
+
+def _limpar_criados():
+    with get_connection() as conn, conn.cursor() as cur:
+        cur.execute("DELETE FROM cpe_enc.usuario WHERE email LIKE %s;", (PREFIXO_EMAIL + "%",))
+        conn.commit()
+
+
+class _Contexto:
+    """Ids de amostra e geradores de valores únicos para uma escala."""
+
+    def __init__(self, amostra, semente):
+        self.rng = random.Random(semente)
+        self.marca = format(int(time.time()) % 0xFFFFFF, "06x")
+        with get_connection() as conn, conn.cursor() as cur:
+            self.alunos = _amostrar_ids(cur, "SELECT id_usuario FROM cpe_enc.aluno", amostra, 0.1)
+            self.professores = _amostrar_ids(cur, "SELECT id_usuario FROM cpe_enc.professor", amostra, 0.2)
+            self.projetos = _amostrar_ids(cur, "SELECT id_projeto FROM cpe_enc.projeto", amostra, 0.3)
+            cur.execute("SELECT nome_completo, id_usuario FROM cpe_enc.usuario ORDER BY random() LIMIT %s;",
+                        (amostra,))
+            self.cursores_usuario = cur.fetchall()
+            cur.execute("SELECT titulo, id_projeto FROM cpe_enc.projeto ORDER BY random() LIMIT %s;", (amostra,))
+            self.cursores_projeto = cur.fetchall()
+
+    def escolher(self, lista):
+        return self.rng.choice(lista)
+
+    def email(self, tipo, i):
+        return f"{PREFIXO_EMAIL}{tipo}-{self.marca}-{i}@bench.ufsc.br"
+
+    def codigo(self, letra, i):
+        return f"B{letra}{self.marca}{i}"
+
+
+def _casos_crud(ctx, r, rp):
+    """Lista de (nome, função(i), repetições, respostas de input)."""
+    professores_criados = []
+    projetos_criados = []
+    alunos_criados = []
+
+    def criar_professor(i):
+        professores_criados.append(professor_crud.create_professor(
+            f"Professor Bench {i}", ctx.email("prof", i), "senha", ctx.codigo("P", i), "Sala B"))
+
+    def criar_projeto(i):
+        projetos_criados.append(projeto_crud.create_projeto(
+            f"Projeto Bench {i}", "Descrição", date(2024, 1, 1), date(2025, 1, 1), "Proposto",
+            ctx.escolher(ctx.professores)))
+
+    def criar_aluno(i):
+        aluno_crud.create_aluno(None, f"Aluno Bench {i}", ctx.email("aluno", i), "senha", ctx.codigo("A", i), 3)
+
+    def carregar_alunos_criados(_i):
+        if not alunos_criados:
+            alunos_criados.extend(_ids_por_email([ctx.email("aluno", i) for i in range(r)]))
+
+    indice_aluno = iter(range(r))
+
+    return [
+        ("professor_crud.create_professor", criar_professor, r, None),
+        ("professor_crud.get_professor_by_id",
+         lambda i: professor_crud.get_professor_by_id(ctx.escolher(ctx.professores)), r, None),
+        ("professor_crud.get_professores_page",
+         lambda i: professor_crud.get_professores_page(50, ctx.escolher(ctx.cursores_usuario)), r, None),
+        ("professor_crud.get_all_professores", lambda i: professor_crud.get_all_professores(), rp, None),
+        ("professor_crud.iter_professores", lambda i: professor_crud.iter_professores(), rp, None),
+        ("professor_crud.update_professor",
+         lambda i: professor_crud.update_professor(professores_criados[i], sala=f"Sala {i}"), r, None),
+
+        ("projeto_crud.create_projeto", criar_projeto, r, None),
+        ("projeto_crud.get_projeto_by_id",
+         lambda i: projeto_crud.get_projeto_by_id(ctx.escolher(ctx.projetos)), r, None),
+        ("projeto_crud.get_projetos_page",
+         lambda i: projeto_crud.get_projetos_page(50, ctx.escolher(ctx.cursores_projeto)), r, None),
+        ("projeto_crud.get_projetos_by_professor",
+         lambda i: projeto_crud.get_projetos_by_professor(ctx.escolher(ctx.professores)), r, None),
+        ("projeto_crud.get_all_projetos", lambda i: projeto_crud.get_all_projetos(), rp, None),
+        ("projeto_crud.iter_projetos", lambda i: projeto_crud.iter_projetos(), rp, None),
+        ("projeto_crud.get_professor_projetos_summary",
+         lambda i: projeto_crud.get_professor_projetos_summary(), rp, None),
+        ("projeto_crud.update_projeto",
+         lambda i: projeto_crud.update_projeto(projetos_criados[i], status="Em Andamento"), r, None),
+        ("projeto_crud.delete_projeto", lambda i: projeto_crud.delete_projeto(projetos_criados[i]), r, None),
+        ("professor_crud.delete_professor",
+         lambda i: professor_crud.delete_professor(professores_criados[i]), r, None),
+
+        ("aluno_crud.create_aluno", criar_aluno, r, None),
+        ("aluno_crud.get_alunos_page",
+         lambda i: aluno_crud.get_alunos_page(50, ctx.escolher(ctx.cursores_usuario)), r, None),
+        ("aluno_crud.iter_alunos", lambda i: aluno_crud.iter_alunos(), rp, None),
+        ("aluno_crud.read_alunos", lambda i: aluno_crud.read_alunos(), r, {"Enter para a próxima": "q"}),
+        # As funções interativas recebem as respostas por input(); o id é o do aluno criado acima
+        ("aluno_crud.update_aluno", lambda i: (carregar_alunos_criados(i), aluno_crud.update_aluno()), r,
+         {"Enter para a próxima": "q", "Digite o ID": lambda: str(alunos_criados[next(indice_aluno)]),
+          "Nome completo": "Aluno Bench Atualizado"}),
+        ("aluno_crud.delete_aluno", lambda i: aluno_crud.delete_aluno(), r,
+         {"Enter para a próxima": "q", "Digite o ID": lambda: str(alunos_criados.pop()), "Tem certeza": "s"}),
+    ]
+
+
+def _casos_importacao(ctx, r, tamanho_lote):
+    def lote(tipo, i):
+        if tipo == "aluno":
+            return [(f"Importado {i}-{j}", ctx.email(f"imp-a{i}", j), None, ctx.codigo(f"I{i}x", j), 2)
+                    for j in range(tamanho_lote)]
+        return [(f"Importado {i}-{j}", ctx.email(f"imp-p{i}", j), None, ctx.codigo(f"J{i}x", j), "Sala")
+                for j in range(tamanho_lote)]
+
+    return [
+        (f"importacao.importar_alunos[{tamanho_lote}]",
+         lambda i: importacao.importar_alunos(lote("aluno", i)), r, None),
+        (f"importacao.importar_professores[{tamanho_lote}]",
+         lambda i: importacao.importar_professores(lote("professor", i)), r, None),
+    ]
+
+
+async def _medir_aio(ctx, r, rp, filtro):
+    """Mede o crud assíncrono num único event loop (o pool assíncrono fica preso ao loop)."""
+    resultados = {}
+    criados = {"professor": [], "projeto": [], "aluno": []}
+
+    async def criar(tipo, coro):
+        resultado = await coro
+        criados[tipo].append(resultado["dados"])
+
+    casos = [
+        ("aio.professor_crud.create_professor", lambda i: criar("professor", aio_professor.create_professor(
+            f"Professor Aio {i}", ctx.email("aprof", i), "senha", ctx.codigo("Q", i))), r),
+        ("aio.professor_crud.get_professor_by_id",
+         lambda i: aio_professor.get_professor_by_id(ctx.escolher(ctx.professores)), r),
+        ("aio.professor_crud.get_all_professores", lambda i: aio_professor.get_all_professores(), rp),
+        ("aio.professor_crud.update_professor",
+         lambda i: aio_professor.update_professor(criados["professor"][i], sala="Sala Aio"), r),
+        ("aio.projeto_crud.create_projeto", lambda i: criar("projeto", aio_projeto.create_projeto(
+            f"Projeto Aio {i}", "Descrição", date(2024, 1, 1), date(2025, 1, 1), "Proposto",
+            ctx.escolher(ctx.professores))), r),
+        ("aio.projeto_crud.get_projeto_by_id",
+         lambda i: aio_projeto.get_projeto_by_id(ctx.escolher(ctx.projetos)), r),
+        ("aio.projeto_crud.get_all_projetos", lambda i: aio_projeto.get_all_projetos(), rp),
+        ("aio.projeto_crud.get_projetos_by_professor",
+         lambda i: aio_projeto.get_projetos_by_professor(ctx.escolher(ctx.professores)), r),
+        ("aio.projeto_crud.update_projeto",
+         lambda i: aio_projeto.update_projeto(criados["projeto"][i], status="Em Andamento"), r),
+        ("aio.projeto_crud.delete_projeto", lambda i: aio_projeto.delete_projeto(criados["projeto"][i]), r),
+        ("aio.professor_crud.delete_professor",
+         lambda i: aio_professor.delete_professor(criados["professor"][i]), r),
+        ("aio.aluno_crud.create_aluno", lambda i: criar("aluno", aio_aluno.create_aluno(
+            f"Aluno Aio {i}", ctx.email("aaluno", i), "senha", ctx.codigo("R", i), 4)), r),
+        ("aio.aluno_crud.get_aluno_by_id", lambda i: aio_aluno.get_aluno_by_id(ctx.escolher(ctx.alunos)), r),
+        ("aio.aluno_crud.get_all_alunos", lambda i: aio_aluno.get_all_alunos(), rp),
+        ("aio.aluno_crud.update_aluno", lambda i: aio_aluno.update_aluno(criados["aluno"][i], semestre=5), r),
+        ("aio.aluno_crud.delete_aluno", lambda i: aio_aluno.delete_aluno(criados["aluno"][i]), r),
+    ]
+    try:
+        for nome, funcao, repeticoes in casos:
+            if filtro and filtro not in nome:
+                continue
+            print(f"  {nome}...")
+            try:
+                resultados[nome] = await medir_async(funcao, repeticoes)
+            except Exception as e:
+                resultados[nome] = {"erro": str(e)}
+    finally:
+        await close_async_pool()
+    return resultados
+
+
+def _medir_relatorios(r, filtro):
+    import reports
+
+    resultados = {}
+    reports.OUTPUT_DIR = tempfile.mkdtemp(prefix="bench_relatorios_")
+    report_views.atualizar_views(concurrently=False)
+
+    for id_relatorio, (consultar, renderizar) in reports.RELATORIOS.items():
+        nome = f"reports.gerar_grafico_consulta{id_relatorio}"
+        if filtro and filtro not in nome:
+            continue
+        print(f"  {nome}...")
+        with get_connection() as conn:
+            try:
+                resultados[f"{nome}.consulta"] = medir(lambda i: consultar(conn), r)
+                with _silencioso():
+                    df = consultar(conn)
+                resultados[f"{nome}.renderizacao"] = medir(lambda i: renderizar(df), r)
+            except Exception as e:
+                resultados[nome] = {"erro": str(e)}
+    return resultados
+
+
+def _medir_interesses(ctx, r, filtro):
+    import ai_assistant
+
+    resultados = {}
+    for tipo, ids in (("aluno", ctx.alunos), ("professor", ctx.professores)):
+        nome = f"ai_assistant._get_interests_by_user[{tipo}]"
+        if filtro and filtro not in nome:
+            continue
+        print(f"  {nome}...")
+        resultados[nome] = medir(lambda i: ai_assistant._get_interests_by_user(ctx.escolher(ids), tipo), r)
+    return resultados
+
+
+def executar_escala(n_usuarios, args):
+    geracao = None
+    if not args.manter_dados:
+        inicio = time.perf_counter()
+        if db_setup.seed_scaled(n_usuarios, semente=args.semente) is None:
+            raise RuntimeError(f"Falha ao gerar os dados da escala {n_usuarios}.")
+        geracao = time.perf_counter() - inicio
+
+    get_pool().wait()
+    ctx = _Contexto(args.amostra, args.semente)
+    r, rp = args.repeticoes, args.repeticoes_pesadas
+    resultados = {}
+
+    try:
+        casos = _casos_crud(ctx, r, rp) + _casos_importacao(ctx, max(1, r // 10), args.lote_importacao)
+        for nome, funcao, repeticoes, respostas in casos:
+            if args.filtro and args.filtro not in nome:
+                continue
+            print(f"  {nome}...")
+            try:
+                resultados[nome] = medir(funcao, repeticoes, respostas)
+            except Exception as e:
+                resultados[nome] = {"erro": str(e)}
+
+        resultados.update(asyncio.run(_medir_aio(ctx, r, rp, args.filtro)))
+        resultados.update(_medir_relatorios(max(1, r // 10), args.filtro))
+        resultados.update(_medir_interesses(ctx, r, args.filtro))
+    finally:
+        _limpar_criados()
+
+    return {"geracao_dados_s": round(geracao, 2) if geracao is not None else None, "resultados": resultados}
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _imprimir(escala, dados):
+    print(f"\n=== {escala} usuários ===")
+    if dados["geracao_dados_s"] is not None:
+        print(f"Geração dos dados: {dados['geracao_dados_s']:.1f}s")
+    for nome, r in dados["resultados"].items():
+        if "erro" in r:
+            print(f"{nome:<58} ERRO: {r['erro']}")
+        else:
+            print(f"{nome:<58} p50={r['p50_ms']:9.3f}  p95={r['p95_ms']:9.3f}  p99={r['p99_ms']:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do CRUD, relatórios e assistente em várias escalas.")
+    parser.add_argument("--escalas", default="10000,100000,1000000",
+                        help="Número de usuários de cada escala, separados por vírgula.")
+    parser.add_argument("--repeticoes", type=int, default=200, help="Chamadas por função.")
+    parser.add_argument("--repeticoes-pesadas", type=int, default=3,
+                        help="Chamadas para funções que leem a tabela inteira (get_all_*, iter_*).")
+    parser.add_argument("--lote-importacao", type=int, default=1000)
+    parser.add_argument("--amostra", type=int, default=1000, help="Ids sorteados para as buscas.")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--filtro", help="Mede só as funções cujo nome contém este texto.")
+    parser.add_argument("--manter-dados", action="store_true",
+                        help="Não gera dados; usa o que já está no banco (uma única escala).")
+    parser.add_argument("--saida", default=f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    args = parser.parse_args()
+
+    escalas = [int(e) for e in args.escalas.split(",")]
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_atual(),
+        "python": platform.python_version(),
+        "parametros": {k: v for k, v in vars(args).items() if k != "saida"},
+        "escalas": {},
+    }
+
+    for escala in escalas:
+        print(f"\nEscala: {escala} usuários")
+        relatorio["escalas"][str(escala)] = executar_escala(escala, args)
+        _imprimir(escala, relatorio["escalas"][str(escala)])
+        # Grava a cada escala para não perder as anteriores se uma escala maior falhar
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+    print(f"\nResultados gravados em {os.path.abspath(args.saida)}")
+
+
+if __name__ == "__main__":
+    main()
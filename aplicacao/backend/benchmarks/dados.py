@@ -0,0 +1,132 @@
+"""
+Gera um conjunto de dados em escala diretamente no servidor (generate_series),
+para os benchmarks. Apaga os dados existentes no esquema cpe_enc.
+
+As proporções seguem o seed.sql: ~10% professores, 3 projetos por professor,
+2 áreas e 1 vaga por projeto, 1 a 2 projetos e 2 candidaturas por aluno.
+"""
+N_AREAS = 30
+
+
+def popular_escala(conn, n_usuarios, semente=0.42):
+    n_professores = max(1, n_usuarios // 10)
+    n_alunos = n_usuarios - n_professores
+    n_projetos = n_professores * 3
+
+    print(f"Gerando {n_usuarios} usuários ({n_professores} professores, {n_alunos} alunos) "
+          f"e {n_projetos} projetos...")
+
+    with conn.cursor() as cur:
+        cur.execute("TRUNCATE cpe_enc.usuario, cpe_enc.area_de_interesse RESTART IDENTITY CASCADE;")
+        # setseed torna random() determinístico dentro desta sessão
+        cur.execute("SELECT setseed(%s);", (semente,))
+
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.usuario (nome_completo, email, senha_hash)
+            SELECT 'Usuario ' || g, 'usuario' || g || '@bench.ufsc.br', 'senha_hash_123'
+            FROM generate_series(1, %s) AS g;
+            """,
+            (n_usuarios,)
+        )
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.professor (id_usuario, siape, sala)
+            SELECT g, 'S' || g, 'Sala ' || (g %% 200)
+            FROM generate_series(1, %s) AS g;
+            """,
+            (n_professores,)
+        )
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.aluno (id_usuario, matricula, semestre)
+            SELECT g, 'M' || g, 1 + (g %% 10)
+            FROM generate_series(%s, %s) AS g;
+            """,
+            (n_professores + 1, n_usuarios)
+        )
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.area_de_interesse (nome_area)
+            SELECT 'Area ' || g FROM generate_series(1, %s) AS g;
+            """,
+            (N_AREAS,)
+        )
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.projeto (titulo, descricao, dt_inicio, dt_fim_prevista, status, id_professor_orientador)
+            SELECT 'Projeto ' || g, 'Descrição do projeto ' || g, inicio, inicio + 30 + (random() * 700)::int,
+                   (ARRAY['Proposto', 'Em Andamento', 'Concluido', 'Cancelado'])[1 + floor(random() * 4)::int],
+                   1 + floor(random() * %s)::int
+            FROM (
+                SELECT g, DATE '2020-01-01' + (random() * 1500)::int AS inicio
+                FROM generate_series(1, %s) AS g
+            ) AS s;
+            """,
+            (n_professores, n_projetos)
+        )
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.projeto_area (id_projeto, id_area)
+            SELECT g, 1 + (g %% %s) FROM generate_series(1, %s) AS g
+            UNION
+            SELECT g, 1 + ((g * 7 + 3) %% %s) FROM generate_series(1, %s) AS g;
+            """,
+            (N_AREAS, n_projetos, N_AREAS, n_projetos)
+        )
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.aluno_projeto (id_aluno, id_projeto, data_ingresso)
+            SELECT a.id_usuario, 1 + floor(random() * %s)::int, DATE '2022-01-01' + (random() * 900)::int
+            FROM cpe_enc.aluno AS a, generate_series(1, 1 + (a.id_usuario %% 2))
+            ON CONFLICT DO NOTHING;
+            """,
+            (n_projetos,)
+        )
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.vaga (id_projeto, descricao_requisitos, numero_posicoes, prazo_inscricao)
+            SELECT g, 'Requisitos da vaga ' || g, 1 + floor(random() * 4)::int,
+                   CURRENT_TIMESTAMP + (random() * 120 - 60) * INTERVAL '1 day'
+            FROM generate_series(1, %s) AS g;
+            """,
+            (n_projetos,)
+        )
+        # As candidaturas sorteadas podem aprovar mais alunos que as posições da vaga: os gatilhos
+        # de migrations/003 e 005 ficam inertes na carga e os derivados são recalculados em seguida
+        cur.execute("SET LOCAL cpe_enc.rollup_desativada = on;")
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.candidatura (id_aluno, id_vaga, dt_candidatura, status)
+            SELECT a.id_usuario, 1 + floor(random() * %s)::int,
+                   CURRENT_TIMESTAMP - random() * INTERVAL '365 days',
+                   (ARRAY['Enviada', 'Em Analise', 'Aprovada', 'Rejeitada'])[1 + floor(random() * 4)::int]
+            FROM cpe_enc.aluno AS a, generate_series(1, 2)
+            ON CONFLICT DO NOTHING;
+            """,
+            (n_projetos,)
+        )
+        cur.execute("SET LOCAL cpe_enc.rollup_desativada = off;")
+        for funcao in ("recalcular_candidatura_diaria", "recalcular_posicoes_preenchidas"):
+            cur.execute("SELECT to_regprocedure(%s) IS NOT NULL;", (f"cpe_enc.{funcao}()",))
+            if cur.fetchone()[0]:
+                cur.execute(f"SELECT cpe_enc.{funcao}();")
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.marco_calendario (id_projeto, titulo_marco, data_marco, descricao)
+            SELECT p, 'Marco ' || m, DATE '2020-01-01' + (random() * 2000)::int, NULL
+            FROM generate_series(1, %s) AS p, generate_series(1, 3) AS m;
+            """,
+            (n_projetos,)
+        )
+        cur.execute(
+            """
+            INSERT INTO cpe_enc.publicacao (id_projeto, titulo_publicacao, ano_publicacao, referencia)
+            SELECT g, 'Publicação do projeto ' || g, 2015 + floor(random() * 10)::int, NULL
+            FROM generate_series(1, %s) AS g;
+            """,
+            (n_projetos,)
+        )
+        cur.execute("ANALYZE;")
+    conn.commit()
+    print("Dados gerados.")
@@ -0,0 +1,128 @@
+"""
+Cache LRU em memória (read-through) das buscas por id do CRUD:
+get_aluno_by_id, get_professor_by_id e get_projeto_by_id, nas versões
+síncrona e assíncrona.
+
+Cada tipo tem no máximo CACHE_ENTIDADES_MAX registros (0 desativa o cache);
+ao passar do limite, o usado há mais tempo é descartado. A invalidação é
+por registro, a partir dos eventos que o CRUD publica após update_*/delete_*:
+
+- no mesmo processo, via eventos.publicar(tipo, id);
+- em outros processos, via NOTIFY (eventos.notificar) e a thread de
+  eventos.escutar_banco(), iniciada na primeira leitura quando
+  CACHE_ENTIDADES_LISTEN=1.
+
+Alterar um professor também descarta os projetos que ele orienta, pois
+projeto_por_id traz o nome do orientador. Se a escuta do banco reconectar,
+o cache inteiro é descartado (notificações podem ter sido perdidas).
+Registros não encontrados (None) não são guardados.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import eventos
+
+CACHE_MAX = int(os.getenv("CACHE_ENTIDADES_MAX", "1000"))
+ESCUTAR_BANCO = os.getenv("CACHE_ENTIDADES_LISTEN", "1") == "1"
+TIPOS = ("aluno", "professor", "projeto")
+
+_lock = threading.Lock()
+_entradas = {tipo: OrderedDict() for tipo in TIPOS}
+# Incrementada a cada invalidação: uma leitura que começou antes dela não pode
+# guardar o valor (possivelmente antigo) que trouxe do banco
+_geracao = dict.fromkeys(TIPOS, 0)
+_contadores = {tipo: {"hits": 0, "misses": 0, "despejos": 0, "invalidacoes": 0} for tipo in TIPOS}
+
+
+def consultar(tipo, chave):
+    """
+    Retorna (encontrado, valor, geracao). Em caso de falta, passe 'geracao'
+    para guardar() depois de buscar no banco.
+    """
+    if CACHE_MAX <= 0:
+        return False, None, None
+    if ESCUTAR_BANCO:
+        eventos.escutar_banco()
+    with _lock:
+        entradas = _entradas[tipo]
+        if chave in entradas:
+            entradas.move_to_end(chave)
+            _contadores[tipo]["hits"] += 1
+            return True, dict(entradas[chave]), None
+        _contadores[tipo]["misses"] += 1
+        return False, None, _geracao[tipo]
+
+
+def guardar(tipo, chave, valor, geracao):
+    if CACHE_MAX <= 0 or valor is None:
+        return
+    with _lock:
+        if geracao != _geracao[tipo]:
+            return
+        entradas = _entradas[tipo]
+        entradas[chave] = dict(valor)
+        entradas.move_to_end(chave)
+        while len(entradas) > CACHE_MAX:
+            entradas.popitem(last=False)
+            _contadores[tipo]["despejos"] += 1
+
+
+def obter(tipo, chave, carregar):
+    """Retorna o registro do cache ou, na falta, carregar(chave), guardando o resultado."""
+    encontrado, valor, geracao = consultar(tipo, chave)
+    if encontrado:
+        return valor
+    valor = carregar(chave)
+    guardar(tipo, chave, valor, geracao)
+    return dict(valor) if valor is not None else None
+
+
+def invalidar(tipo, chave=None):
+    """Descarta um registro do tipo ou, com chave=None, todos os registros do tipo."""
+    with _lock:
+        _geracao[tipo] += 1
+        entradas = _entradas[tipo]
+        if chave is None:
+            _contadores[tipo]["invalidacoes"] += len(entradas)
+            entradas.clear()
+        elif entradas.pop(chave, None) is not None:
+            _contadores[tipo]["invalidacoes"] += 1
+
+
+def _invalidar_professor(id_professor):
+    invalidar("professor", id_professor)
+    with _lock:
+        _geracao["projeto"] += 1
+        entradas = _entradas["projeto"]
+        orientados = [k for k, p in entradas.items() if p.get("id_professor_orientador") == id_professor]
+        for chave in orientados:
+            del entradas[chave]
+        _contadores["projeto"]["invalidacoes"] += len(orientados)
+
+
+def limpar(_=None):
+    for tipo in TIPOS:
+        invalidar(tipo)
+
+
+eventos.assinar("aluno", lambda chave: invalidar("aluno", chave))
+eventos.assinar("professor", _invalidar_professor)
+eventos.assinar("projeto", lambda chave: invalidar("projeto", chave))
+eventos.assinar(eventos.RECONECTADO, limpar)
+
+
+def estatisticas():
+    """Tamanho, hits, misses, taxa de acerto, despejos (LRU) e invalidações por tipo."""
+    with _lock:
+        resultado = {}
+        for tipo in TIPOS:
+            c = _contadores[tipo]
+            consultas = c["hits"] + c["misses"]
+            resultado[tipo] = {
+                "tamanho": len(_entradas[tipo]),
+                "capacidade": CACHE_MAX,
+                **c,
+                "taxa_acerto": c["hits"] / consultas if consultas else 0.0,
+            }
+        return resultado
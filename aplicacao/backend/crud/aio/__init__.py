@@ -0,0 +1,9 @@
+"""
+Versões assíncronas (asyncio) das operações do pacote crud.
+
+Cada função é uma corrotina que usa o pool assíncrono de db_config e devolve
+um dicionário de resultado em vez de imprimir mensagens, por exemplo:
+
+    from crud.aio import professor_crud
+    resultados = await asyncio.gather(*(professor_crud.get_professor_by_id(i) for i in ids))
+"""
@@ -0,0 +1,25 @@
+def sucesso(dados=None):
+    """Resultado de uma operação concluída."""
+    return {"ok": True, "dados": dados, "erro": None, "detalhes": None}
+
+
+def falha(erro, detalhes=None):
+    """
+    Resultado de uma operação que não pôde ser concluída.
+    'erro' é um código curto (ex.: 'unique_violation', 'nao_encontrado') e
+    'detalhes' traz a mensagem original, quando houver.
+    """
+    return {"ok": False, "dados": None, "erro": erro, "detalhes": detalhes}
+
+
+SEM_CONEXAO = "sem_conexao"
+NAO_ENCONTRADO = "nao_encontrado"
+SEM_CAMPOS = "sem_campos"
+FOREIGN_KEY = "foreign_key_violation"
+UNIQUE = "unique_violation"
+CHECK = "check_violation"
+ERRO_BANCO = "erro_banco"
+POSSUI_PROJETOS = "possui_projetos"
+VAGA_LOTADA = "vaga_lotada"
+JA_DECIDIDA = "ja_decidida"
+PRAZO_ENCERRADO = "prazo_encerrado"
@@ -0,0 +1,141 @@
+import psycopg
+from psycopg.rows import dict_row
+from db_config import get_async_connection
+from crud import consultas
+import eventos
+import cache_entidades
+from crud.aio._resultado import (sucesso, falha, SEM_CONEXAO, NAO_ENCONTRADO, SEM_CAMPOS,
+                                 UNIQUE, CHECK, ERRO_BANCO)
+
+
+async def create_aluno(nome_completo, email, senha_hash, matricula, semestre):
+    """
+    Cria um novo aluno: primeiro insere em 'usuario' e depois em 'aluno'.
+    Retorna o ID do usuário criado em 'dados'.
+    """
+    if not senha_hash:
+        senha_hash = "senha_padrao_123"
+
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "usuario_inserir", (nome_completo, email, senha_hash))
+                id_usuario = (await cur.fetchone())[0]
+
+                await consultas.executar(cur, "aluno_inserir", (id_usuario, matricula, semestre))
+            await conn.commit()
+            return sucesso(id_usuario)
+        except psycopg.errors.UniqueViolation as e:
+            await conn.rollback()
+            return falha(UNIQUE, f"Email ou matrícula já existem. Detalhes: {e}")
+        except psycopg.errors.CheckViolation as e:
+            await conn.rollback()
+            return falha(CHECK, f"O semestre deve ser um número positivo. Detalhes: {e}")
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
+
+
+async def get_aluno_by_id(id_aluno):
+    encontrado, aluno, geracao = cache_entidades.consultar("aluno", id_aluno)
+    if encontrado:
+        return sucesso(aluno)
+
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await consultas.executar(cur, "aluno_por_id", (id_aluno,))
+                aluno = await cur.fetchone()
+            if aluno is None:
+                return falha(NAO_ENCONTRADO)
+            cache_entidades.guardar("aluno", id_aluno, aluno, geracao)
+            return sucesso(aluno)
+        except psycopg.Error as e:
+            return falha(ERRO_BANCO, str(e))
+
+
+async def get_all_alunos():
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await consultas.executar(cur, "aluno_todos")
+                return sucesso(await cur.fetchall())
+        except psycopg.Error as e:
+            return falha(ERRO_BANCO, str(e))
+
+
+async def update_aluno(id_aluno, nome_completo=None, email=None, senha_hash=None, matricula=None, semestre=None):
+    """
+    Atualiza os dados de um aluno.
+    Campos não fornecidos (None) não serão atualizados.
+    """
+    user_update = consultas.montar_update("usuario", "id_usuario", id_aluno, {
+        "nome_completo": nome_completo,
+        "email": email,
+        "senha_hash": senha_hash,
+    })
+    aluno_update = consultas.montar_update("aluno", "id_usuario", id_aluno, {
+        "matricula": matricula,
+        "semestre": semestre,
+    })
+
+    if not user_update and not aluno_update:
+        return falha(SEM_CAMPOS)
+
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "aluno_existe", (id_aluno,))
+                if await cur.fetchone() is None:
+                    return falha(NAO_ENCONTRADO)
+
+                for update in (user_update, aluno_update):
+                    if update:
+                        sql, params = update
+                        await cur.execute(sql, params, prepare=True)
+                await eventos.notificar(cur, "aluno", id_aluno)
+            await conn.commit()
+            eventos.publicar("aluno", id_aluno)
+            return sucesso(id_aluno)
+        except psycopg.errors.UniqueViolation as e:
+            await conn.rollback()
+            return falha(UNIQUE, f"Email ou matrícula já existem. Detalhes: {e}")
+        except psycopg.errors.CheckViolation as e:
+            await conn.rollback()
+            return falha(CHECK, f"O semestre deve ser um número positivo. Detalhes: {e}")
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
+
+
+async def delete_aluno(id_aluno):
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "aluno_excluir", (id_aluno,))
+                removidos = cur.rowcount
+                if removidos > 0:
+                    await eventos.notificar(cur, "aluno", id_aluno)
+            await conn.commit()
+            if removidos > 0:
+                eventos.publicar("aluno", id_aluno)
+                return sucesso(id_aluno)
+            return falha(NAO_ENCONTRADO)
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
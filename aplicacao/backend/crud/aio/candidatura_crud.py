@@ -0,0 +1,142 @@
+import psycopg
+from psycopg.rows import dict_row
+from db_config import get_async_connection
+from crud import consultas
+from crud.candidatura_crud import STATUS_CANDIDATURA, vaga_lotada
+from crud.aio._resultado import (sucesso, falha, SEM_CONEXAO, NAO_ENCONTRADO, UNIQUE, FOREIGN_KEY,
+                                 CHECK, ERRO_BANCO, VAGA_LOTADA, JA_DECIDIDA, PRAZO_ENCERRADO)
+
+
+async def create_candidatura(id_aluno, id_vaga):
+    """
+    Registra a candidatura de um aluno a uma vaga com inscrições abertas.
+    Retorna o ID da candidatura em 'dados'.
+    """
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "candidatura_inserir", (id_aluno, id_vaga))
+                linha = await cur.fetchone()
+                if linha is None:
+                    await consultas.executar(cur, "vaga_posicoes", (id_vaga,))
+                    vaga = await cur.fetchone()
+                    await conn.rollback()
+                    return falha(NAO_ENCONTRADO) if vaga is None else falha(PRAZO_ENCERRADO, str(vaga[3]))
+            await conn.commit()
+            return sucesso(linha[0])
+        except psycopg.errors.UniqueViolation as e:
+            await conn.rollback()
+            return falha(UNIQUE, f"O aluno já se candidatou a esta vaga. Detalhes: {e}")
+        except psycopg.errors.ForeignKeyViolation as e:
+            await conn.rollback()
+            return falha(FOREIGN_KEY, f"O aluno com ID {id_aluno} não existe. Detalhes: {e}")
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
+
+
+async def get_candidatura_by_id(id_candidatura):
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await consultas.executar(cur, "candidatura_por_id", (id_candidatura,))
+                candidatura = await cur.fetchone()
+            if candidatura is None:
+                return falha(NAO_ENCONTRADO)
+            return sucesso(candidatura)
+        except psycopg.Error as e:
+            return falha(ERRO_BANCO, str(e))
+
+
+async def _listar(nome, chave):
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await consultas.executar(cur, nome, (chave,))
+                return sucesso(await cur.fetchall())
+        except psycopg.Error as e:
+            return falha(ERRO_BANCO, str(e))
+
+
+async def get_candidaturas_by_vaga(id_vaga):
+    return await _listar("candidatura_por_vaga", id_vaga)
+
+
+async def get_candidaturas_by_aluno(id_aluno):
+    return await _listar("candidatura_por_aluno", id_aluno)
+
+
+async def aprovar_candidatura(id_candidatura):
+    """
+    Aprova uma candidatura 'Enviada' ou 'Em Analise' (ver crud.candidatura_crud).
+    Retorna o ID da vaga em 'dados', ou falha com 'vaga_lotada', 'ja_decidida'
+    (status atual em 'detalhes') ou 'nao_encontrado'.
+    """
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "candidatura_aprovar", (id_candidatura,))
+                linha = await cur.fetchone()
+                if linha is None:
+                    await consultas.executar(cur, "candidatura_status", (id_candidatura,))
+                    atual = await cur.fetchone()
+                    await conn.rollback()
+                    return falha(NAO_ENCONTRADO) if atual is None else falha(JA_DECIDIDA, atual[0])
+            await conn.commit()
+            return sucesso(linha[0])
+        except psycopg.errors.CheckViolation as e:
+            await conn.rollback()
+            return falha(VAGA_LOTADA if vaga_lotada(e) else CHECK, str(e))
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
+
+
+async def update_status_candidatura(id_candidatura, status):
+    """Altera o status; 'Aprovada' passa por aprovar_candidatura."""
+    if status == "Aprovada":
+        return await aprovar_candidatura(id_candidatura)
+    if status not in STATUS_CANDIDATURA:
+        return falha(CHECK, f"Status inválido: {status}.")
+
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "candidatura_atualizar_status", (status, id_candidatura))
+                linha = await cur.fetchone()
+            await conn.commit()
+            return sucesso(id_candidatura) if linha else falha(NAO_ENCONTRADO)
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
+
+
+async def delete_candidatura(id_candidatura):
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "candidatura_excluir", (id_candidatura,))
+                removidos = cur.rowcount
+            await conn.commit()
+            return sucesso(id_candidatura) if removidos > 0 else falha(NAO_ENCONTRADO)
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
@@ -0,0 +1,131 @@
+import psycopg
+from psycopg.rows import dict_row
+from db_config import get_async_connection
+from crud import consultas
+import eventos
+import cache_entidades
+from crud.aio._resultado import (sucesso, falha, SEM_CONEXAO, NAO_ENCONTRADO, SEM_CAMPOS,
+                                 UNIQUE, POSSUI_PROJETOS, ERRO_BANCO)
+
+
+async def create_professor(nome_completo, email, senha_hash, siape, sala=None):
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "usuario_inserir", (nome_completo, email, senha_hash))
+                id_usuario = (await cur.fetchone())[0]
+
+                await consultas.executar(cur, "professor_inserir", (id_usuario, siape, sala))
+            await conn.commit()
+            return sucesso(id_usuario)
+        except psycopg.errors.UniqueViolation as e:
+            await conn.rollback()
+            return falha(UNIQUE, f"Email ou SIAPE já existem. Detalhes: {e}")
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
+
+
+async def get_professor_by_id(id_usuario):
+    encontrado, professor, geracao = cache_entidades.consultar("professor", id_usuario)
+    if encontrado:
+        return sucesso(professor)
+
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await consultas.executar(cur, "professor_por_id", (id_usuario,))
+                professor = await cur.fetchone()
+            if professor is None:
+                return falha(NAO_ENCONTRADO)
+            cache_entidades.guardar("professor", id_usuario, professor, geracao)
+            return sucesso(professor)
+        except psycopg.Error as e:
+            return falha(ERRO_BANCO, str(e))
+
+
+async def get_all_professores():
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await consultas.executar(cur, "professor_todos")
+                return sucesso(await cur.fetchall())
+        except psycopg.Error as e:
+            return falha(ERRO_BANCO, str(e))
+
+
+async def update_professor(id_usuario, nome_completo=None, email=None, senha_hash=None, siape=None, sala=None):
+    user_update = consultas.montar_update("usuario", "id_usuario", id_usuario, {
+        "nome_completo": nome_completo,
+        "email": email,
+        "senha_hash": senha_hash,
+    })
+    prof_update = consultas.montar_update("professor", "id_usuario", id_usuario, {
+        "siape": siape,
+        "sala": sala,
+    })
+
+    if not user_update and not prof_update:
+        return falha(SEM_CAMPOS)
+
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "professor_existe", (id_usuario,))
+                if await cur.fetchone() is None:
+                    return falha(NAO_ENCONTRADO)
+
+                for update in (user_update, prof_update):
+                    if update:
+                        sql, params = update
+                        await cur.execute(sql, params, prepare=True)
+                await eventos.notificar(cur, "professor", id_usuario)
+            await conn.commit()
+            eventos.publicar("professor", id_usuario)
+            return sucesso(id_usuario)
+        except psycopg.errors.UniqueViolation as e:
+            await conn.rollback()
+            return falha(UNIQUE, f"Email ou SIAPE já existem. Detalhes: {e}")
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
+
+
+async def delete_professor(id_usuario):
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "professor_total_projetos", (id_usuario,))
+                num_projetos = (await cur.fetchone())[0]
+
+                if num_projetos > 0:
+                    return falha(POSSUI_PROJETOS,
+                                 f"Professor (ID: {id_usuario}) está orientando {num_projetos} projeto(s).")
+
+                await consultas.executar(cur, "professor_excluir", (id_usuario,))
+                removidos = cur.rowcount
+                if removidos > 0:
+                    await eventos.notificar(cur, "professor", id_usuario)
+            await conn.commit()
+            if removidos > 0:
+                eventos.publicar("professor", id_usuario)
+                return sucesso(id_usuario)
+            return falha(NAO_ENCONTRADO)
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
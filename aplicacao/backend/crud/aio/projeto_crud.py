@@ -0,0 +1,217 @@
+import psycopg
+from psycopg.rows import dict_row
+from db_config import get_async_connection
+from crud import consultas
+import eventos
+import cache_entidades
+from crud.aio._resultado import (sucesso, falha, SEM_CONEXAO, NAO_ENCONTRADO, SEM_CAMPOS,
+                                 FOREIGN_KEY, CHECK, ERRO_BANCO)
+
+
+async def create_projeto(titulo, descricao, dt_inicio, dt_fim_prevista, status, id_professor_orientador):
+    """
+    Cria um novo projeto no sistema.
+    Retorna o ID do projeto em 'dados' quando a operação é bem-sucedida.
+    """
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "projeto_inserir", (titulo, descricao, dt_inicio, dt_fim_prevista, status, id_professor_orientador))
+                id_projeto = (await cur.fetchone())[0]
+                await eventos.notificar(cur, "projeto", id_projeto)
+            await conn.commit()
+            eventos.publicar("projeto", id_projeto)
+            return sucesso(id_projeto)
+        except psycopg.errors.ForeignKeyViolation as e:
+            await conn.rollback()
+            return falha(FOREIGN_KEY,
+                         f"O professor orientador com ID {id_professor_orientador} não existe. Detalhes: {e}")
+        except psycopg.errors.CheckViolation as e:
+            await conn.rollback()
+            return falha(CHECK, f"Verifique o status ou as datas do projeto. Detalhes: {e}")
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
+
+
+async def get_projeto_by_id(id_projeto):
+    """
+    Busca os detalhes de um projeto pelo seu ID.
+    """
+    encontrado, projeto, geracao = cache_entidades.consultar("projeto", id_projeto)
+    if encontrado:
+        return sucesso(projeto)
+
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await consultas.executar(cur, "projeto_por_id", (id_projeto,))
+                projeto = await cur.fetchone()
+            if projeto is None:
+                return falha(NAO_ENCONTRADO)
+            cache_entidades.guardar("projeto", id_projeto, projeto, geracao)
+            return sucesso(projeto)
+        except psycopg.Error as e:
+            return falha(ERRO_BANCO, str(e))
+
+
+async def get_all_projetos():
+    """
+    Retorna uma lista com todos os projetos cadastrados no sistema.
+    """
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await consultas.executar(cur, "projeto_todos")
+                return sucesso(await cur.fetchall())
+        except psycopg.Error as e:
+            return falha(ERRO_BANCO, str(e))
+
+
+async def update_projeto(id_projeto, titulo=None, descricao=None, dt_inicio=None, dt_fim_prevista=None, status=None, id_professor_orientador=None):
+    """
+    Atualiza os dados de um projeto.
+    Campos não fornecidos (None) não serão atualizados.
+    """
+    update = consultas.montar_update("projeto", "id_projeto", id_projeto, {
+        "titulo": titulo,
+        "descricao": descricao,
+        "dt_inicio": dt_inicio,
+        "dt_fim_prevista": dt_fim_prevista,
+        "status": status,
+        "id_professor_orientador": id_professor_orientador,
+    })
+    if update is None:
+        return falha(SEM_CAMPOS)
+
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            sql, params = update
+            async with conn.cursor() as cur:
+                await cur.execute(sql, params, prepare=True)
+                atualizados = cur.rowcount
+                if atualizados > 0:
+                    await eventos.notificar(cur, "projeto", id_projeto)
+            await conn.commit()
+            if atualizados > 0:
+                eventos.publicar("projeto", id_projeto)
+                return sucesso(id_projeto)
+            return falha(NAO_ENCONTRADO)
+        except psycopg.errors.ForeignKeyViolation as e:
+            await conn.rollback()
+            return falha(FOREIGN_KEY,
+                         f"O novo professor orientador com ID {id_professor_orientador} não existe. Detalhes: {e}")
+        except psycopg.errors.CheckViolation as e:
+            await conn.rollback()
+            return falha(CHECK, f"Verifique o status ou as datas do projeto. Detalhes: {e}")
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
+
+
+async def _atualizar_um_a_um(conn, cur, alteracoes):
+    """Aplica cada alteração num savepoint próprio, registrando a restrição violada ou o valor rejeitado."""
+    resultados = {}
+    for id_projeto, campos in alteracoes.items():
+        sql, params = consultas.montar_update("projeto", "id_projeto", id_projeto, campos)
+        try:
+            async with conn.transaction():
+                await cur.execute(sql, params, prepare=True)
+            resultados[id_projeto] = None if cur.rowcount > 0 else "nao_encontrado"
+        except (psycopg.errors.CheckViolation, psycopg.errors.ForeignKeyViolation) as e:
+            resultados[id_projeto] = e.diag.constraint_name
+        except psycopg.errors.DataError:
+            # Valor que o banco não aceita na coluna (data inexistente, texto longo demais)
+            resultados[id_projeto] = consultas.DADO_INVALIDO
+    return resultados
+
+
+async def update_projetos_bulk(alteracoes):
+    """
+    Atualiza vários projetos com um único comando, numa única transação
+    (ver crud.projeto_crud.update_projetos_bulk). 'dados' traz a lista de
+    {"id_projeto", "ok", "erro"} na ordem dos ids.
+    """
+    resultados, validas = consultas.separar_projetos_lote(alteracoes)
+    atualizados = []
+
+    if validas:
+        async with get_async_connection() as conn:
+            if not conn:
+                return falha(SEM_CONEXAO)
+
+            try:
+                async with conn.transaction(), conn.cursor() as cur:
+                    try:
+                        async with conn.transaction():
+                            await consultas.executar(cur, "projeto_atualizar_lote",
+                                                     consultas.params_projetos_lote(validas))
+                            resultados.update(await cur.fetchall())
+                    except (psycopg.errors.CheckViolation, psycopg.errors.ForeignKeyViolation,
+                            psycopg.errors.DataError):
+                        # Alguma restrição disparou mesmo assim (ex.: o professor foi excluído por
+                        # outra transação depois da validação) ou algum valor não coube na coluna:
+                        # aplica um a um para isolar a linha
+                        resultados.update(await _atualizar_um_a_um(conn, cur, validas))
+
+                    atualizados = [i for i in validas if resultados[i] is None]
+                    if atualizados:
+                        await eventos.notificar_varios(cur, "projeto", atualizados)
+            except psycopg.Error as e:
+                return falha(ERRO_BANCO, str(e))
+
+    for id_projeto in atualizados:
+        eventos.publicar("projeto", id_projeto)
+    return sucesso([{"id_projeto": i, "ok": erro is None, "erro": erro} for i, erro in resultados.items()])
+
+
+async def delete_projeto(id_projeto):
+    """
+    Deleta um projeto do sistema (com ON DELETE CASCADE nas tabelas dependentes).
+    """
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor() as cur:
+                await consultas.executar(cur, "projeto_excluir", (id_projeto,))
+                removidos = cur.rowcount
+                if removidos > 0:
+                    await eventos.notificar(cur, "projeto", id_projeto)
+            await conn.commit()
+            if removidos > 0:
+                eventos.publicar("projeto", id_projeto)
+                return sucesso(id_projeto)
+            return falha(NAO_ENCONTRADO)
+        except psycopg.Error as e:
+            await conn.rollback()
+            return falha(ERRO_BANCO, str(e))
+
+
+async def get_projetos_by_professor(id_professor):
+    """
+    Retorna uma lista de projetos orientados por um professor específico.
+    """
+    async with get_async_connection() as conn:
+        if not conn:
+            return falha(SEM_CONEXAO)
+
+        try:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await consultas.executar(cur, "projeto_por_professor", (id_professor,))
+                return sucesso(await cur.fetchall())
+        except psycopg.Error as e:
+            return falha(ERRO_BANCO, str(e))
@@ -1,5 +1,8 @@
 import psycopg
-from backend.db_config import get_db_connection
+from db_config import get_connection
+from crud import consultas
+import eventos
+import cache_entidades
 from tabulate import tabulate
 
 
@@ -8,187 +11,233 @@ def create_aluno(self, nome_completo, email, senha_hash, matricula, semestre):
     Cria um novo aluno no banco de dados usando os dados fornecidos.
     Primeiro insere na tabela 'usuario' e depois na tabela 'aluno'.
     """
-    conn = get_db_connection()
-    if not conn:
-        return
+    with get_connection() as conn:
+        if not conn:
+            return
+
+        try:
+            # A senha pode ser padronizada aqui se não for passada como argumento
+            if not senha_hash:
+                senha_hash = "senha_padrao_123"
+
+            with conn.cursor() as cur:
+                # Etapa 1: Inserir na tabela 'usuario'
+                consultas.executar(cur, "usuario_inserir", (nome_completo, email, senha_hash))
+                # Pega o ID do usuário que acabou de ser criado
+                id_usuario = cur.fetchone()[0]
+
+                # Etapa 2: Inserir na tabela 'aluno' com o ID obtido
+                consultas.executar(cur, "aluno_inserir", (id_usuario, matricula, semestre))
+
+            # Se tudo deu certo, efetiva a transação
+            conn.commit()
+            print(f"\nAluno '{nome_completo}' criado com sucesso!")
+
+        except psycopg.Error as e:
+            # Se qualquer erro ocorrer, desfaz a transação inteira
+            if conn:
+                conn.rollback()
+            print(f"Erro ao criar aluno: {e}")
+
+
+def get_aluno_by_id(id_aluno):
+    """Busca um aluno pelo ID (com cache, ver cache_entidades)."""
+    return cache_entidades.obter("aluno", id_aluno, _buscar_aluno)
+
+
+def _buscar_aluno(id_aluno):
+    with get_connection() as conn:
+        if not conn:
+            return None
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                consultas.executar(cur, "aluno_por_id", (id_aluno,))
+                return cur.fetchone()
+
+        except psycopg.Error as e:
+            print(f"Erro ao buscar aluno por ID: {e}")
+            return None
+
 
-    try:
-        # A senha pode ser padronizada aqui se não for passada como argumento
-        if not senha_hash:
-            senha_hash = "senha_padrao_123"
-
-        with conn.cursor() as cur:
-            # Etapa 1: Inserir na tabela 'usuario'
-            cur.execute(
-                "INSERT INTO cpe_enc.usuario (nome_completo, email, senha_hash) VALUES (%s, %s, %s) RETURNING id_usuario",
-                (nome_completo, email, senha_hash)
-            )
-            # Pega o ID do usuário que acabou de ser criado
-            id_usuario = cur.fetchone()[0]
-
-            # Etapa 2: Inserir na tabela 'aluno' com o ID obtido
-            cur.execute(
-                "INSERT INTO cpe_enc.aluno (id_usuario, matricula, semestre) VALUES (%s, %s, %s)",
-                (id_usuario, matricula, semestre)
-            )
-
-        # Se tudo deu certo, efetiva a transação
-        conn.commit()
-        print(f"\nAluno '{nome_completo}' criado com sucesso!")
-
-    except psycopg.Error as e:
-        # Se qualquer erro ocorrer, desfaz a transação inteira
-        if conn:
-            conn.rollback()
-        print(f"Erro ao criar aluno: {e}")
-    finally:
-        # Fecha a conexão independentemente do resultado
-        if conn:
-            conn.close()
-
-
-def read_alunos():
-    conn = get_db_connection()
-    if not conn:
-        return False  # Retorna False para indicar que a operação não pôde ser concluída
-
-    try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                        SELECT u.id_usuario, u.nome_completo, u.email, a.matricula, a.semestre
-                        FROM cpe_enc.usuario u
-                                 JOIN cpe_enc.aluno a ON u.id_usuario = a.id_usuario
-                        ORDER BY u.nome_completo;
-                        """)
-            alunos = cur.fetchall()
-
-            if not alunos:
-                print("\nNenhum aluno encontrado.")
-                return False
-
-            headers = [desc[0] for desc in cur.description]
+def get_alunos_page(limite=50, apos=None):
+    """
+    Retorna uma página de alunos usando paginação por chave (keyset).
+    'apos' é a tupla (nome_completo, id_usuario) do último aluno da página
+    anterior; use None para a primeira página.
+    """
+    with get_connection() as conn:
+        if not conn:
+            return []
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                if apos:
+                    consultas.executar(cur, "aluno_pagina_apos", (*apos, limite))
+                else:
+                    consultas.executar(cur, "aluno_pagina", (limite,))
+                return cur.fetchall()
+
+        except psycopg.Error as e:
+            print(f"Erro ao ler alunos: {e}")
+            return []
+
+
+def iter_alunos(itersize=1000):
+    """
+    Percorre todos os alunos com um cursor nomeado (server-side),
+    trazendo 'itersize' linhas por vez.
+    """
+    with get_connection() as conn:
+        if not conn:
+            return
+
+        try:
+            with conn.cursor(name="iter_alunos", row_factory=psycopg.rows.dict_row) as cur:
+                cur.itersize = itersize
+                cur.execute("""
+                            SELECT u.id_usuario, u.nome_completo, u.email, a.matricula, a.semestre
+                            FROM cpe_enc.usuario u
+                                     JOIN cpe_enc.aluno a ON u.id_usuario = a.id_usuario
+                            ORDER BY u.nome_completo, u.id_usuario;
+                            """)
+                yield from cur
+
+        except psycopg.Error as e:
+            print(f"Erro ao ler alunos: {e}")
+
+
+def read_alunos(tamanho_pagina=50):
+    """Lista os alunos página por página. Retorna False se nenhum aluno foi exibido."""
+    apos = None
+    exibiu_algum = False
+
+    while True:
+        alunos = get_alunos_page(tamanho_pagina, apos)
+        if not alunos:
+            break
+
+        if not exibiu_algum:
             print("\n--- Lista de Alunos ---")
-            print(tabulate(alunos, headers=headers, tablefmt="grid"))
-            return True
+            exibiu_algum = True
+        print(tabulate(alunos, headers="keys", tablefmt="grid"))
+
+        if len(alunos) < tamanho_pagina:
+            break
+        if input("Enter para a próxima página ou 'q' para parar: ").lower() == 'q':
+            break
+        apos = (alunos[-1]['nome_completo'], alunos[-1]['id_usuario'])
 
-    except psycopg.Error as e:
-        print(f"Erro ao ler alunos: {e}")
-        return False
-    finally:
-        if conn:
-            conn.close()
+    if not exibiu_algum:
+        print("\nNenhum aluno encontrado.")
+    return exibiu_algum
 
 
 def update_aluno():
     if not read_alunos():
         return
 
-    conn = get_db_connection()
-    if not conn:
-        return
-
-    try:
-        id_aluno_str = input("\nDigite o ID do aluno que deseja atualizar: ")
-        id_aluno = int(id_aluno_str)
-
-        with conn.cursor() as cur:
-            # Busca os dados atuais do aluno
-            cur.execute("""
-                        SELECT u.nome_completo, u.email, a.matricula, a.semestre
-                        FROM cpe_enc.usuario u
-                                 JOIN cpe_enc.aluno a ON u.id_usuario = a.id_usuario
-                        WHERE u.id_usuario = %s;
-                        """, (id_aluno,))
-            aluno_atual = cur.fetchone()
-
-            if not aluno_atual:
-                print(f"Erro: Aluno com ID {id_aluno} não encontrado.")
-                return
-
-            nome_atual, email_atual, matricula_atual, semestre_atual = aluno_atual
-            print("\nDigite os novos dados (pressione Enter para manter o valor atual):")
-
-            novo_nome = input(f"Nome completo [{nome_atual}]: ") or nome_atual
-            novo_email = input(f"Email [{email_atual}]: ") or email_atual
-            nova_matricula = input(f"Matrícula [{matricula_atual}]: ") or matricula_atual
-
-            while True:
-                try:
-                    novo_semestre_str = input(f"Semestre [{semestre_atual}]: ")
-                    novo_semestre = int(novo_semestre_str) if novo_semestre_str else semestre_atual
-                    if novo_semestre <= 0:
-                        print("O semestre deve ser um número positivo.")
-                        continue
-                    break
-                except ValueError:
-                    print("Entrada inválida. Por favor, insira um número.")
-
-            cur.execute(
-                "UPDATE cpe_enc.usuario SET nome_completo = %s, email = %s WHERE id_usuario = %s",
-                (novo_nome, novo_email, id_aluno)
-            )
-            # Atualiza a tabela 'aluno'
-            cur.execute(
-                "UPDATE cpe_enc.aluno SET matricula = %s, semestre = %s WHERE id_usuario = %s",
-                (nova_matricula, novo_semestre, id_aluno)
-            )
-
-        conn.commit()
-        print(f"\nDados do aluno ID {id_aluno} atualizados com sucesso!")
-
-    except (ValueError, psycopg.Error) as e:
-        if conn:
-            conn.rollback()
-        if isinstance(e, ValueError):
-            print("Erro: ID inválido. Por favor, digite um número.")
-        else:
-            print(f"Erro ao atualizar aluno: {e}")
-    finally:
-        if conn:
-            conn.close()
+    with get_connection() as conn:
+        if not conn:
+            return
+
+        try:
+            id_aluno_str = input("\nDigite o ID do aluno que deseja atualizar: ")
+            id_aluno = int(id_aluno_str)
+
+            with conn.cursor() as cur:
+                # Busca os dados atuais do aluno
+                consultas.executar(cur, "aluno_por_id", (id_aluno,))
+                aluno_atual = cur.fetchone()
+
+                if not aluno_atual:
+                    print(f"Erro: Aluno com ID {id_aluno} não encontrado.")
+                    return
+
+                _, nome_atual, email_atual, matricula_atual, semestre_atual = aluno_atual
+                print("\nDigite os novos dados (pressione Enter para manter o valor atual):")
+
+                novo_nome = input(f"Nome completo [{nome_atual}]: ") or nome_atual
+                novo_email = input(f"Email [{email_atual}]: ") or email_atual
+                nova_matricula = input(f"Matrícula [{matricula_atual}]: ") or matricula_atual
+
+                while True:
+                    try:
+                        novo_semestre_str = input(f"Semestre [{semestre_atual}]: ")
+                        novo_semestre = int(novo_semestre_str) if novo_semestre_str else semestre_atual
+                        if novo_semestre <= 0:
+                            print("O semestre deve ser um número positivo.")
+                            continue
+                        break
+                    except ValueError:
+                        print("Entrada inválida. Por favor, insira um número.")
+
+                sql, params = consultas.montar_update("usuario", "id_usuario", id_aluno, {
+                    "nome_completo": novo_nome,
+                    "email": novo_email,
+                })
+                cur.execute(sql, params, prepare=True)
+                # Atualiza a tabela 'aluno'
+                sql, params = consultas.montar_update("aluno", "id_usuario", id_aluno, {
+                    "matricula": nova_matricula,
+                    "semestre": novo_semestre,
+                })
+                cur.execute(sql, params, prepare=True)
+                eventos.notificar(cur, "aluno", id_aluno)
+
+            conn.commit()
+            eventos.publicar("aluno", id_aluno)
+            print(f"\nDados do aluno ID {id_aluno} atualizados com sucesso!")
+
+        except (ValueError, psycopg.Error) as e:
+            if conn:
+                conn.rollback()
+            if isinstance(e, ValueError):
+                print("Erro: ID inválido. Por favor, digite um número.")
+            else:
+                print(f"Erro ao atualizar aluno: {e}")
 
 
 def delete_aluno():
     if not read_alunos():
         return
 
-    conn = get_db_connection()
-    if not conn:
-        return
-
-    try:
-        id_aluno_str = input("\nDigite o ID do aluno que deseja deletar: ")
-        id_aluno = int(id_aluno_str)
-
-        with conn.cursor() as cur:
-            cur.execute("SELECT nome_completo FROM cpe_enc.usuario WHERE id_usuario = %s", (id_aluno,))
-            aluno = cur.fetchone()
-
-            if not aluno:
-                print(f"Erro: Aluno com ID {id_aluno} não encontrado.")
-                return
-
-            nome_aluno = aluno[0]
-            confirmacao = input(
-                f"Tem certeza que deseja deletar o aluno '{nome_aluno}' (ID: {id_aluno})? "
-                f"Esta ação é irreversível. (s/n): ")
-
-            if confirmacao.lower() != 's':
-                print("Operação cancelada.")
-                return
-
-            cur.execute("DELETE FROM cpe_enc.usuario WHERE id_usuario = %s", (id_aluno,))
-
-        conn.commit()
-        print(f"\nAluno '{nome_aluno}' deletado com sucesso.")
-
-    except (ValueError, psycopg.Error) as e:
-        if conn:
-            conn.rollback()
-        if isinstance(e, ValueError):
-            print("Erro: ID inválido. Por favor, digite um número.")
-        else:
-            print(f"Erro ao deletar aluno: {e}")
-    finally:
-        if conn:
-            conn.close()
\ No newline at end of file
+    with get_connection() as conn:
+        if not conn:
+            return
+
+        try:
+            id_aluno_str = input("\nDigite o ID do aluno que deseja deletar: ")
+            id_aluno = int(id_aluno_str)
+
+            with conn.cursor() as cur:
+                consultas.executar(cur, "usuario_nome", (id_aluno,))
+                aluno = cur.fetchone()
+
+                if not aluno:
+                    print(f"Erro: Aluno com ID {id_aluno} não encontrado.")
+                    return
+
+                nome_aluno = aluno[0]
+                confirmacao = input(
+                    f"Tem certeza que deseja deletar o aluno '{nome_aluno}' (ID: {id_aluno})? "
+                    f"Esta ação é irreversível. (s/n): ")
+
+                if confirmacao.lower() != 's':
+                    print("Operação cancelada.")
+                    return
+
+                consultas.executar(cur, "aluno_excluir", (id_aluno,))
+                eventos.notificar(cur, "aluno", id_aluno)
+
+            conn.commit()
+            eventos.publicar("aluno", id_aluno)
+            print(f"\nAluno '{nome_aluno}' deletado com sucesso.")
+
+        except (ValueError, psycopg.Error) as e:
+            if conn:
+                conn.rollback()
+            if isinstance(e, ValueError):
+                print("Erro: ID inválido. Por favor, digite um número.")
+            else:
+                print(f"Erro ao deletar aluno: {e}")
\ No newline at end of file
@@ -0,0 +1,197 @@
+# candidatura_crud.py
+"""
+Candidaturas de alunos às vagas.
+
+A aprovação não confere posições livres no Python: o UPDATE que muda o status
+para 'Aprovada' dispara o gatilho de migrations/005, que ocupa uma posição em
+vaga.posicoes_preenchidas com um UPDATE condicional (travando só a linha
+daquela vaga até o COMMIT) ou aborta com check_violation em 'chk_vaga_posicoes'
+quando a vaga está cheia. Assim aprovações simultâneas nunca ultrapassam
+numero_posicoes, e as de vagas diferentes não esperam umas pelas outras.
+"""
+import psycopg
+from db_config import get_connection
+from crud import consultas
+
+STATUS_CANDIDATURA = ("Enviada", "Em Analise", "Aprovada", "Rejeitada")
+RESTRICAO_POSICOES = "chk_vaga_posicoes"
+
+
+def vaga_lotada(erro):
+    """True se o erro veio do gatilho de posições (vaga sem posição livre)."""
+    return isinstance(erro, psycopg.errors.CheckViolation) and erro.diag.constraint_name == RESTRICAO_POSICOES
+
+
+def create_candidatura(id_aluno, id_vaga):
+    """
+    Registra a candidatura de um aluno a uma vaga com inscrições abertas.
+    Retorna o ID da candidatura ou None.
+    """
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+
+        try:
+            with conn.cursor() as cur:
+                consultas.executar(cur, "candidatura_inserir", (id_aluno, id_vaga))
+                linha = cur.fetchone()
+                if linha is None:
+                    consultas.executar(cur, "vaga_posicoes", (id_vaga,))
+                    vaga = cur.fetchone()
+                    conn.rollback()
+                    if vaga is None:
+                        print(f"Erro: A vaga com ID {id_vaga} não existe.")
+                    else:
+                        print(f"Erro: As inscrições da vaga {id_vaga} encerraram em {vaga[3]}.")
+                    return None
+                conn.commit()
+                print(f"Candidatura (ID: {linha[0]}) registrada com sucesso.")
+                return linha[0]
+        except psycopg.errors.UniqueViolation as e:
+            conn.rollback()
+            print(f"Erro: O aluno {id_aluno} já se candidatou à vaga {id_vaga}. Detalhes: {e}")
+            return None
+        except psycopg.errors.ForeignKeyViolation as e:
+            conn.rollback()
+            print(f"Erro: O aluno com ID {id_aluno} não existe. Detalhes: {e}")
+            return None
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao registrar candidatura: {e}")
+            return None
+
+
+def get_candidatura_by_id(id_candidatura):
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                consultas.executar(cur, "candidatura_por_id", (id_candidatura,))
+                return cur.fetchone()
+        except Exception as e:
+            print(f"Erro ao buscar candidatura por ID: {e}")
+            return None
+
+
+def _listar(nome, chave):
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return []
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                consultas.executar(cur, nome, (chave,))
+                return cur.fetchall()
+        except Exception as e:
+            print(f"Erro ao listar candidaturas: {e}")
+            return []
+
+
+def get_candidaturas_by_vaga(id_vaga):
+    """Candidaturas de uma vaga, da mais antiga para a mais recente."""
+    return _listar("candidatura_por_vaga", id_vaga)
+
+
+def get_candidaturas_by_aluno(id_aluno):
+    """Candidaturas de um aluno, da mais recente para a mais antiga."""
+    return _listar("candidatura_por_aluno", id_aluno)
+
+
+def aprovar_candidatura(id_candidatura):
+    """
+    Aprova uma candidatura 'Enviada' ou 'Em Analise', ocupando uma posição da vaga.
+    Retorna True se aprovada; False se a vaga estiver cheia, se a candidatura não
+    existir ou se já tiver sido aprovada/rejeitada (inclusive por outra sessão).
+    """
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return False
+
+        try:
+            with conn.cursor() as cur:
+                consultas.executar(cur, "candidatura_aprovar", (id_candidatura,))
+                linha = cur.fetchone()
+                if linha is None:
+                    consultas.executar(cur, "candidatura_status", (id_candidatura,))
+                    atual = cur.fetchone()
+                    conn.rollback()
+                    if atual is None:
+                        print(f"Candidatura (ID: {id_candidatura}) não encontrada.")
+                    else:
+                        print(f"A candidatura (ID: {id_candidatura}) já está '{atual[0]}'.")
+                    return False
+                conn.commit()
+                print(f"Candidatura (ID: {id_candidatura}) aprovada na vaga {linha[0]}.")
+                return True
+        except psycopg.errors.CheckViolation as e:
+            conn.rollback()
+            if vaga_lotada(e):
+                print(f"Não há posições livres na vaga desta candidatura (ID: {id_candidatura}).")
+            else:
+                print(f"Erro de validação ao aprovar candidatura: {e}")
+            return False
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao aprovar candidatura: {e}")
+            return False
+
+
+def update_status_candidatura(id_candidatura, status):
+    """
+    Altera o status de uma candidatura. 'Aprovada' passa por aprovar_candidatura;
+    tirar uma candidatura de 'Aprovada' libera a posição na vaga.
+    """
+    if status == "Aprovada":
+        return aprovar_candidatura(id_candidatura)
+    if status not in STATUS_CANDIDATURA:
+        print(f"Status inválido. Use um de: {', '.join(STATUS_CANDIDATURA)}.")
+        return False
+
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return False
+
+        try:
+            with conn.cursor() as cur:
+                consultas.executar(cur, "candidatura_atualizar_status", (status, id_candidatura))
+                encontrada = cur.fetchone() is not None
+                conn.commit()
+                if encontrada:
+                    print(f"Candidatura (ID: {id_candidatura}) atualizada para '{status}'.")
+                else:
+                    print(f"Candidatura (ID: {id_candidatura}) não encontrada.")
+                return encontrada
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao atualizar candidatura: {e}")
+            return False
+
+
+def delete_candidatura(id_candidatura):
+    """Exclui uma candidatura; se estava aprovada, a posição da vaga é liberada."""
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return False
+
+        try:
+            with conn.cursor() as cur:
+                consultas.executar(cur, "candidatura_excluir", (id_candidatura,))
+                removidos = cur.rowcount
+                conn.commit()
+                if removidos > 0:
+                    print(f"Candidatura (ID: {id_candidatura}) excluída com sucesso.")
+                    return True
+                print(f"Candidatura (ID: {id_candidatura}) não encontrada.")
+                return False
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao deletar candidatura: {e}")
+            return False
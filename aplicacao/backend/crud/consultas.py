@@ -0,0 +1,264 @@
+"""
+Registro central das consultas do pacote crud.
+
+Cada consulta tem um nome e é executada com prepare=True, então o psycopg a
+prepara (PREPARE no servidor) na primeira vez em cada conexão do pool e as
+chamadas seguintes naquela conexão só enviam os parâmetros, sem novo parse e
+planejamento. Os UPDATEs dinâmicos (só das colunas informadas) têm o texto
+gerado uma vez por conjunto de colunas, para que cada formato também seja
+preparado uma única vez por conexão.
+
+O mesmo registro serve às versões síncrona (crud) e assíncrona (crud.aio):
+executar() devolve o resultado de cur.execute, que é aguardável no cursor assíncrono.
+"""
+from functools import lru_cache
+
+_USUARIO_PROFESSOR = """
+    SELECT u.id_usuario, u.nome_completo, u.email, p.siape, p.sala
+    FROM cpe_enc.usuario AS u
+    JOIN cpe_enc.professor AS p ON u.id_usuario = p.id_usuario
+"""
+_USUARIO_ALUNO = """
+    SELECT u.id_usuario, u.nome_completo, u.email, a.matricula, a.semestre
+    FROM cpe_enc.usuario u
+    JOIN cpe_enc.aluno a ON u.id_usuario = a.id_usuario
+"""
+_PROJETO_ORIENTADOR = """
+    SELECT p.id_projeto, p.titulo, p.descricao, p.dt_inicio, p.dt_fim_prevista, p.status,
+           p.id_professor_orientador, u.nome_completo AS professor_orientador
+    FROM cpe_enc.projeto AS p
+    JOIN cpe_enc.professor AS prof ON p.id_professor_orientador = prof.id_usuario
+    JOIN cpe_enc.usuario AS u ON prof.id_usuario = u.id_usuario
+"""
+_CANDIDATURA = """
+    SELECT c.id_candidatura, c.id_aluno, u.nome_completo AS aluno, c.id_vaga, p.titulo AS projeto,
+           c.dt_candidatura, c.status
+    FROM cpe_enc.candidatura AS c
+    JOIN cpe_enc.usuario AS u ON u.id_usuario = c.id_aluno
+    JOIN cpe_enc.vaga AS v ON v.id_vaga = c.id_vaga
+    JOIN cpe_enc.projeto AS p ON p.id_projeto = v.id_projeto
+"""
+
+CONSULTAS = {
+    # usuario
+    "usuario_inserir": """
+        INSERT INTO cpe_enc.usuario (nome_completo, email, senha_hash)
+        VALUES (%s, %s, %s)
+        RETURNING id_usuario;
+    """,
+    "usuario_nome": "SELECT nome_completo FROM cpe_enc.usuario WHERE id_usuario = %s;",
+
+    # professor
+    "professor_inserir": "INSERT INTO cpe_enc.professor (id_usuario, siape, sala) VALUES (%s, %s, %s);",
+    "professor_existe": "SELECT 1 FROM cpe_enc.professor WHERE id_usuario = %s;",
+    "professor_por_id": _USUARIO_PROFESSOR + "WHERE u.id_usuario = %s;",
+    "professor_todos": _USUARIO_PROFESSOR + "ORDER BY u.nome_completo;",
+    "professor_pagina": _USUARIO_PROFESSOR + "ORDER BY u.nome_completo, u.id_usuario LIMIT %s;",
+    "professor_pagina_apos": _USUARIO_PROFESSOR + """
+        WHERE (u.nome_completo, u.id_usuario) > (%s, %s)
+        ORDER BY u.nome_completo, u.id_usuario
+        LIMIT %s;
+    """,
+    "professor_total_projetos": "SELECT COUNT(*) FROM cpe_enc.projeto WHERE id_professor_orientador = %s;",
+    # Só exclui se o id for de um professor (ver crud.exclusao)
+    "professor_excluir": """
+        DELETE FROM cpe_enc.usuario AS u
+        USING cpe_enc.professor AS prof
+        WHERE prof.id_usuario = u.id_usuario AND u.id_usuario = %s;
+    """,
+
+    # aluno
+    "aluno_inserir": "INSERT INTO cpe_enc.aluno (id_usuario, matricula, semestre) VALUES (%s, %s, %s);",
+    "aluno_existe": "SELECT 1 FROM cpe_enc.aluno WHERE id_usuario = %s;",
+    # Só exclui se o id for de um aluno (ver crud.exclusao)
+    "aluno_excluir": """
+        DELETE FROM cpe_enc.usuario AS u
+        USING cpe_enc.aluno AS a
+        WHERE a.id_usuario = u.id_usuario AND u.id_usuario = %s;
+    """,
+    "aluno_por_id": _USUARIO_ALUNO + "WHERE u.id_usuario = %s;",
+    "aluno_todos": _USUARIO_ALUNO + "ORDER BY u.nome_completo;",
+    "aluno_pagina": _USUARIO_ALUNO + "ORDER BY u.nome_completo, u.id_usuario LIMIT %s;",
+    "aluno_pagina_apos": _USUARIO_ALUNO + """
+        WHERE (u.nome_completo, u.id_usuario) > (%s, %s)
+        ORDER BY u.nome_completo, u.id_usuario
+        LIMIT %s;
+    """,
+
+    # projeto
+    "projeto_inserir": """
+        INSERT INTO cpe_enc.projeto (titulo, descricao, dt_inicio, dt_fim_prevista, status, id_professor_orientador)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING id_projeto;
+    """,
+    "projeto_por_id": _PROJETO_ORIENTADOR + "WHERE p.id_projeto = %s;",
+    "projeto_todos": _PROJETO_ORIENTADOR + "ORDER BY p.titulo;",
+    "projeto_pagina": _PROJETO_ORIENTADOR + "ORDER BY p.titulo, p.id_projeto LIMIT %s;",
+    "projeto_pagina_apos": _PROJETO_ORIENTADOR + """
+        WHERE (p.titulo, p.id_projeto) > (%s, %s)
+        ORDER BY p.titulo, p.id_projeto
+        LIMIT %s;
+    """,
+    "projeto_excluir": "DELETE FROM cpe_enc.projeto WHERE id_projeto = %s;",
+    # Atualização em lote: um elemento por projeto em cada array; NULL mantém o valor atual.
+    # Os projetos são travados antes de tudo (FOR NO KEY UPDATE, que não bloqueia quem só os
+    # referencia), então as regras de chk_status_projeto, chk_datas_validas e
+    # fk_projeto_professor são avaliadas sobre a versão mais recente de cada linha, para que
+    # uma linha inválida não derrube o lote inteiro. O UPDATE combina os valores novos com a
+    # própria linha travada, sem sobrescrever colunas que o lote não altera.
+    "projeto_atualizar_lote": """
+        WITH v AS (
+            SELECT *
+            FROM unnest(%s::int[], %s::varchar[], %s::text[], %s::date[], %s::date[], %s::varchar[], %s::int[])
+                AS v(id_projeto, titulo, descricao, dt_inicio, dt_fim_prevista, status, id_professor_orientador)
+        ),
+        travados AS (
+            SELECT p.*
+            FROM cpe_enc.projeto AS p
+            JOIN v ON v.id_projeto = p.id_projeto
+            FOR NO KEY UPDATE OF p
+        ),
+        avaliado AS (
+            SELECT v.id_projeto,
+                   CASE
+                       WHEN t.id_projeto IS NULL THEN 'nao_encontrado'
+                       WHEN COALESCE(v.status, t.status) NOT IN ('Proposto', 'Em Andamento', 'Concluido', 'Cancelado')
+                           THEN 'chk_status_projeto'
+                       WHEN COALESCE(v.dt_fim_prevista, t.dt_fim_prevista) <= COALESCE(v.dt_inicio, t.dt_inicio)
+                           THEN 'chk_datas_validas'
+                       WHEN NOT EXISTS (SELECT 1 FROM cpe_enc.professor AS prof
+                                        WHERE prof.id_usuario = COALESCE(v.id_professor_orientador,
+                                                                         t.id_professor_orientador))
+                           THEN 'fk_projeto_professor'
+                   END AS erro
+            FROM v
+            LEFT JOIN travados AS t ON t.id_projeto = v.id_projeto
+        ),
+        atualizados AS (
+            UPDATE cpe_enc.projeto AS p
+            SET titulo = COALESCE(v.titulo, p.titulo),
+                descricao = COALESCE(v.descricao, p.descricao),
+                dt_inicio = COALESCE(v.dt_inicio, p.dt_inicio),
+                dt_fim_prevista = COALESCE(v.dt_fim_prevista, p.dt_fim_prevista),
+                status = COALESCE(v.status, p.status),
+                id_professor_orientador = COALESCE(v.id_professor_orientador, p.id_professor_orientador)
+            FROM v
+            JOIN avaliado AS a ON a.id_projeto = v.id_projeto
+            WHERE p.id_projeto = v.id_projeto AND a.erro IS NULL
+            RETURNING p.id_projeto
+        )
+        SELECT a.id_projeto, COALESCE(a.erro, CASE WHEN u.id_projeto IS NULL THEN 'nao_encontrado' END)
+        FROM avaliado AS a
+        LEFT JOIN atualizados AS u ON u.id_projeto = a.id_projeto;
+    """,
+    "projeto_por_professor": """
+        SELECT p.id_projeto, p.titulo, p.descricao, p.dt_inicio, p.dt_fim_prevista, p.status
+        FROM cpe_enc.projeto AS p
+        WHERE p.id_professor_orientador = %s
+        ORDER BY p.titulo;
+    """,
+    "projeto_resumo_professores": """
+        SELECT u.nome_completo AS professor, COUNT(p.id_projeto) AS total_projetos
+        FROM cpe_enc.usuario AS u
+        JOIN cpe_enc.professor AS prof ON u.id_usuario = prof.id_usuario
+        LEFT JOIN cpe_enc.projeto AS p ON prof.id_usuario = p.id_professor_orientador
+        GROUP BY u.nome_completo
+        ORDER BY total_projetos DESC, u.nome_completo;
+    """,
+
+    # candidatura
+    # Só aceita a candidatura enquanto a vaga está com inscrições abertas
+    "candidatura_inserir": """
+        INSERT INTO cpe_enc.candidatura (id_aluno, id_vaga)
+        SELECT %s, v.id_vaga
+        FROM cpe_enc.vaga AS v
+        WHERE v.id_vaga = %s AND v.prazo_inscricao > CURRENT_TIMESTAMP
+        RETURNING id_candidatura;
+    """,
+    "candidatura_por_id": _CANDIDATURA + "WHERE c.id_candidatura = %s;",
+    "candidatura_por_vaga": _CANDIDATURA + "WHERE c.id_vaga = %s ORDER BY c.dt_candidatura, c.id_candidatura;",
+    "candidatura_por_aluno": _CANDIDATURA + "WHERE c.id_aluno = %s ORDER BY c.dt_candidatura DESC;",
+    "candidatura_status": "SELECT status FROM cpe_enc.candidatura WHERE id_candidatura = %s;",
+    # Aprovação: o gatilho de migrations/005 ocupa uma posição da vaga (ou aborta se não houver)
+    "candidatura_aprovar": """
+        UPDATE cpe_enc.candidatura
+        SET status = 'Aprovada'
+        WHERE id_candidatura = %s AND status IN ('Enviada', 'Em Analise')
+        RETURNING id_vaga;
+    """,
+    "candidatura_atualizar_status": """
+        UPDATE cpe_enc.candidatura SET status = %s WHERE id_candidatura = %s RETURNING id_vaga;
+    """,
+    "candidatura_excluir": "DELETE FROM cpe_enc.candidatura WHERE id_candidatura = %s;",
+    "vaga_posicoes": """
+        SELECT id_vaga, numero_posicoes, posicoes_preenchidas, prazo_inscricao
+        FROM cpe_enc.vaga
+        WHERE id_vaga = %s;
+    """,
+}
+
+
+# Erro por linha de update_projetos_bulk quando o banco rejeita um valor (DataError)
+DADO_INVALIDO = "dado_invalido"
+CAMPOS_PROJETO = ("titulo", "descricao", "dt_inicio", "dt_fim_prevista", "status", "id_professor_orientador")
+
+
+def separar_projetos_lote(alteracoes):
+    """
+    Normaliza os pares (id_projeto, {campo: valor}) de update_projetos_bulk.
+    Retorna (resultados, validas): 'resultados' tem um item por id, na ordem em
+    que aparecem, já preenchido com o erro dos inválidos ('campo_invalido' ou
+    'sem_campos') e None nos demais; 'validas' é {id_projeto: campos} só com os
+    valores diferentes de None, combinando ids repetidos (o último vence).
+    """
+    resultados, validas, invalidos = {}, {}, set()
+    for id_projeto, campos in alteracoes:
+        resultados.setdefault(id_projeto, None)
+        if set(campos) - set(CAMPOS_PROJETO):
+            invalidos.add(id_projeto)
+            continue
+        validas.setdefault(id_projeto, {}).update({c: v for c, v in campos.items() if v is not None})
+
+    for id_projeto in invalidos:
+        resultados[id_projeto] = "campo_invalido"
+        validas.pop(id_projeto, None)
+    for id_projeto in [i for i, campos in validas.items() if not campos]:
+        resultados[id_projeto] = "sem_campos"
+        del validas[id_projeto]
+    return resultados, validas
+
+
+def params_projetos_lote(alteracoes):
+    """
+    Converte {id_projeto: {campo: valor}} nos arrays (um por coluna) de
+    projeto_atualizar_lote. Datas são enviadas como texto ISO, para que cada
+    array tenha um único tipo mesmo misturando str e date.
+    """
+    ids = list(alteracoes)
+    colunas = [[alteracoes[i].get(campo) for i in ids] for campo in CAMPOS_PROJETO]
+    for datas in (colunas[2], colunas[3]):
+        datas[:] = [None if d is None else str(d) for d in datas]
+    return [ids, *colunas]
+
+
+def executar(cur, nome, params=None):
+    """Executa a consulta registrada 'nome', preparada uma vez por conexão."""
+    return cur.execute(CONSULTAS[nome], params, prepare=True)
+
+
+@lru_cache(maxsize=256)
+def sql_update(tabela, colunas, chave):
+    """Texto do UPDATE para uma tupla de colunas; gerado uma vez por formato."""
+    return f"UPDATE cpe_enc.{tabela} SET {', '.join(f'{c} = %s' for c in colunas)} WHERE {chave} = %s;"
+
+
+def montar_update(tabela, chave, id_registro, campos):
+    """
+    Monta (sql, params) para atualizar só os campos diferentes de None,
+    na ordem em que aparecem em 'campos'. Retorna None se não houver o que atualizar.
+    Execute com cur.execute(sql, params, prepare=True).
+    """
+    alterados = {coluna: valor for coluna, valor in campos.items() if valor is not None}
+    if not alterados:
+        return None
+    return sql_update(tabela, tuple(alterados), chave), [*alterados.values(), id_registro]
@@ -0,0 +1,180 @@
+"""
+Exclusão em lote de projetos e alunos.
+
+delete_projeto/delete_aluno apagam em cascata (ON DELETE CASCADE) as linhas
+de projeto_area, aluno_projeto, vaga, candidatura, marco_calendario e
+publicacao. Aqui a exclusão é feita em duas etapas:
+
+- previa_*: conta, sem excluir nada, quantas linhas dependentes cada alvo
+  levaria junto;
+- excluir_*: usa essa contagem para formar lotes de no máximo 'limite_linhas'
+  linhas (alvos + dependentes) e exclui cada lote na sua própria transação
+  curta, com lock_timeout. Um lote que não obtém os locks a tempo é repetido
+  após uma pausa, em vez de ficar na fila bloqueando quem vem atrás.
+"""
+import time
+import psycopg
+from db_config import get_connection
+import eventos
+
+LIMITE_LINHAS = 5000
+LOCK_TIMEOUT = "2s"
+TENTATIVAS = 5
+
+_TIPOS = {
+    "projeto": {
+        "dependentes": ("projeto_area", "aluno_projeto", "vaga", "candidatura", "marco_calendario", "publicacao"),
+        "previa": """
+            SELECT p.id_projeto AS id, p.titulo AS nome,
+                   (SELECT COUNT(*) FROM cpe_enc.projeto_area AS pa WHERE pa.id_projeto = p.id_projeto) AS projeto_area,
+                   (SELECT COUNT(*) FROM cpe_enc.aluno_projeto AS ap WHERE ap.id_projeto = p.id_projeto) AS aluno_projeto,
+                   (SELECT COUNT(*) FROM cpe_enc.vaga AS v WHERE v.id_projeto = p.id_projeto) AS vaga,
+                   (SELECT COUNT(*) FROM cpe_enc.vaga AS v
+                    JOIN cpe_enc.candidatura AS c ON c.id_vaga = v.id_vaga
+                    WHERE v.id_projeto = p.id_projeto) AS candidatura,
+                   (SELECT COUNT(*) FROM cpe_enc.marco_calendario AS m WHERE m.id_projeto = p.id_projeto) AS marco_calendario,
+                   (SELECT COUNT(*) FROM cpe_enc.publicacao AS pub WHERE pub.id_projeto = p.id_projeto) AS publicacao
+            FROM cpe_enc.projeto AS p
+            WHERE p.id_projeto = ANY(%s)
+            ORDER BY p.id_projeto;
+        """,
+        "excluir": "DELETE FROM cpe_enc.projeto WHERE id_projeto = ANY(%s) RETURNING id_projeto;",
+    },
+    "aluno": {
+        "dependentes": ("aluno_projeto", "candidatura"),
+        "previa": """
+            SELECT u.id_usuario AS id, u.nome_completo AS nome,
+                   (SELECT COUNT(*) FROM cpe_enc.aluno_projeto AS ap WHERE ap.id_aluno = a.id_usuario) AS aluno_projeto,
+                   (SELECT COUNT(*) FROM cpe_enc.candidatura AS c WHERE c.id_aluno = a.id_usuario) AS candidatura
+            FROM cpe_enc.aluno AS a
+            JOIN cpe_enc.usuario AS u ON u.id_usuario = a.id_usuario
+            WHERE a.id_usuario = ANY(%s)
+            ORDER BY u.id_usuario;
+        """,
+        # Só usuários que são alunos: um id de professor na lista não é excluído
+        "excluir": """
+            DELETE FROM cpe_enc.usuario AS u
+            USING cpe_enc.aluno AS a
+            WHERE a.id_usuario = u.id_usuario AND u.id_usuario = ANY(%s)
+            RETURNING u.id_usuario;
+        """,
+    },
+}
+
+
+def _previa(tipo, ids):
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                cur.execute(_TIPOS[tipo]["previa"], (list(ids),))
+                return cur.fetchall()
+        except psycopg.Error as e:
+            print(f"Erro ao calcular a prévia da exclusão: {e}")
+            return None
+
+
+def _lotes(previa, dependentes, limite_linhas):
+    """Agrupa os alvos em lotes de até 'limite_linhas' linhas; um alvo maior que o limite fica sozinho."""
+    lote, linhas = [], 0
+    for alvo in previa:
+        custo = 1 + sum(alvo[t] for t in dependentes)
+        if lote and linhas + custo > limite_linhas:
+            yield lote
+            lote, linhas = [], 0
+        lote.append(alvo["id"])
+        linhas += custo
+    if lote:
+        yield lote
+
+
+def _excluir_lote(conn, tipo, ids, pausa):
+    """Exclui um lote numa transação curta; repete se não conseguir os locks dentro de LOCK_TIMEOUT."""
+    for tentativa in range(1, TENTATIVAS + 1):
+        try:
+            with conn.transaction(), conn.cursor() as cur:
+                cur.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}';")
+                cur.execute(_TIPOS[tipo]["excluir"], (ids,))
+                excluidos = [linha[0] for linha in cur.fetchall()]
+                if excluidos:
+                    eventos.notificar_varios(cur, tipo, excluidos)
+            return excluidos
+        except psycopg.errors.LockNotAvailable:
+            if tentativa == TENTATIVAS:
+                raise
+            time.sleep(max(pausa, 0.5) * tentativa)
+
+
+def _mostrar_progresso(excluidos, total):
+    print(f"\rExcluídos {excluidos}/{total}...", end="" if excluidos < total else "\n", flush=True)
+
+
+def _excluir(tipo, ids, limite_linhas, pausa, progresso):
+    dependentes = _TIPOS[tipo]["dependentes"]
+    previa = _previa(tipo, ids)
+    if previa is None:
+        return None
+
+    resultado = {
+        "excluidos": 0,
+        "nao_encontrados": sorted(set(ids) - {alvo["id"] for alvo in previa}),
+        "dependentes": {t: sum(alvo[t] for alvo in previa) for t in dependentes},
+        "lotes": 0,
+        "falhas": [],
+    }
+    progresso = progresso or _mostrar_progresso
+
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+
+        for lote in _lotes(previa, dependentes, limite_linhas):
+            try:
+                excluidos = _excluir_lote(conn, tipo, lote, pausa)
+            except psycopg.Error as e:
+                # Os lotes já confirmados continuam excluídos; este é registrado e o restante segue
+                resultado["falhas"].append({"ids": lote, "erro": str(e)})
+                print(f"Erro ao excluir lote de {len(lote)} {tipo}(s): {e}")
+                continue
+
+            resultado["lotes"] += 1
+            resultado["excluidos"] += len(excluidos)
+            for chave in excluidos:
+                eventos.publicar(tipo, chave)
+            progresso(resultado["excluidos"], len(previa))
+            if pausa:
+                time.sleep(pausa)
+
+    return resultado
+
+
+def previa_exclusao_projetos(ids):
+    """
+    Lista, sem excluir nada, cada projeto encontrado em 'ids' com o número de linhas
+    de cada tabela dependente que seriam apagadas em cascata.
+    """
+    return _previa("projeto", ids)
+
+
+def previa_exclusao_alunos(ids):
+    """Como previa_exclusao_projetos, para alunos (aluno_projeto e candidatura)."""
+    return _previa("aluno", ids)
+
+
+def excluir_projetos(ids, limite_linhas=LIMITE_LINHAS, pausa=0.0, progresso=None):
+    """
+    Exclui os projetos em lotes de até 'limite_linhas' linhas afetadas (projetos +
+    dependentes), cada lote em uma transação curta, com 'pausa' segundos entre eles.
+    progresso(excluidos, total) é chamado após cada lote (padrão: imprime na tela).
+    Retorna {"excluidos", "nao_encontrados", "dependentes", "lotes", "falhas"} ou None.
+    """
+    return _excluir("projeto", list(ids), limite_linhas, pausa, progresso)
+
+
+def excluir_alunos(ids, limite_linhas=LIMITE_LINHAS, pausa=0.0, progresso=None):
+    """Como excluir_projetos, para alunos (exclui o usuário; aluno e dependentes vão em cascata)."""
+    return _excluir("aluno", list(ids), limite_linhas, pausa, progresso)
@@ -0,0 +1,229 @@
+"""
+Importação em lote de alunos e professores.
+
+Os registros são enviados com COPY para uma tabela temporária de staging e
+depois distribuídos em 'usuario' + 'aluno'/'professor' com poucos comandos
+set-based, numa única transação. Linhas que violariam as restrições de
+unicidade (email, matrícula, SIAPE) ou de validação são separadas antes e
+devolvidas no resultado, sem abortar o restante do lote.
+"""
+import csv
+import psycopg
+from db_config import get_connection
+
+SENHA_PADRAO = "senha_padrao_123"
+
+COLUNAS_ALUNO = ("nome_completo", "email", "senha_hash", "matricula", "semestre")
+COLUNAS_PROFESSOR = ("nome_completo", "email", "senha_hash", "siape", "sala")
+
+# Tamanho máximo das colunas VARCHAR de 'usuario' (DDL.sql)
+_LIMITES_USUARIO = {"nome_completo": 255, "email": 255, "senha_hash": 255}
+
+# Para cada tipo: colunas da tabela de especialização, chave única, tamanhos máximos e validações extras.
+_ESPECIALIZACOES = {
+    "aluno": {
+        "tabela": "cpe_enc.aluno",
+        "colunas": COLUNAS_ALUNO,
+        "chave": "matricula",
+        "limites": {"matricula": 20},
+        "insert": """
+            INSERT INTO cpe_enc.aluno (id_usuario, matricula, semestre)
+            SELECT n.id_usuario, s.matricula, NULLIF(trim(s.semestre), '')::integer
+            FROM stg_novos AS n
+            JOIN stg_importacao AS s ON s.email = n.email
+            WHERE NOT EXISTS (SELECT 1 FROM stg_rejeitado AS r WHERE r.linha = s.linha);
+        """,
+        "validacoes": """
+            WHEN s.semestre IS NOT NULL AND trim(s.semestre) <> ''
+                 AND (trim(s.semestre) !~ '^[0-9]{1,9}$' OR trim(s.semestre)::integer <= 0) THEN 'semestre_invalido'
+        """,
+    },
+    "professor": {
+        "tabela": "cpe_enc.professor",
+        "colunas": COLUNAS_PROFESSOR,
+        "chave": "siape",
+        "limites": {"siape": 20, "sala": 50},
+        "insert": """
+            INSERT INTO cpe_enc.professor (id_usuario, siape, sala)
+            SELECT n.id_usuario, s.siape, NULLIF(trim(s.sala), '')
+            FROM stg_novos AS n
+            JOIN stg_importacao AS s ON s.email = n.email
+            WHERE NOT EXISTS (SELECT 1 FROM stg_rejeitado AS r WHERE r.linha = s.linha);
+        """,
+        "validacoes": "",
+    },
+}
+
+
+def _ler_origem(origem, colunas):
+    """
+    Gera tuplas (linha, valores...) a partir de um caminho de CSV (com cabeçalho)
+    ou de um iterável de dicionários/sequências, sem carregar tudo em memória.
+    """
+    if isinstance(origem, str):
+        with open(origem, newline='', encoding='utf-8') as f:
+            for linha, registro in enumerate(csv.DictReader(f), start=1):
+                yield (linha,) + tuple(registro.get(c) or None for c in colunas)
+        return
+
+    for linha, registro in enumerate(origem, start=1):
+        if isinstance(registro, dict):
+            valores = tuple(registro.get(c) for c in colunas)
+        else:
+            valores = (tuple(registro) + (None,) * len(colunas))[:len(colunas)]
+        yield (linha,) + tuple(None if v is None or v == '' else str(v) for v in valores)
+
+
+def _importar(tipo, origem):
+    config = _ESPECIALIZACOES[tipo]
+    colunas = config["colunas"]
+    chave = config["chave"]
+    resultado = {"inseridos": 0, "rejeitados": []}
+
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+
+        try:
+            with conn.cursor() as cur:
+                # Staging só com colunas texto: valores malformados viram rejeições, não erros de COPY
+                cur.execute(
+                    f"""
+                    CREATE TEMP TABLE stg_importacao (
+                        linha INTEGER PRIMARY KEY,
+                        {', '.join(f'{c} TEXT' for c in colunas)}
+                    ) ON COMMIT DROP;
+                    CREATE TEMP TABLE stg_rejeitado (linha INTEGER PRIMARY KEY, motivo TEXT) ON COMMIT DROP;
+                    CREATE TEMP TABLE stg_novos (id_usuario INTEGER, email TEXT) ON COMMIT DROP;
+                    """
+                )
+
+                with cur.copy(f"COPY stg_importacao (linha, {', '.join(colunas)}) FROM STDIN") as copy:
+                    for registro in _ler_origem(origem, colunas):
+                        copy.write_row(registro)
+
+                cur.execute("ANALYZE stg_importacao;")
+
+                # Etapa 1: separa as linhas que falhariam nas restrições do esquema
+                limites = "".join(
+                    f"WHEN length(s.{coluna}) > {tamanho} THEN '{coluna}_muito_longo'\n"
+                    for coluna, tamanho in {**_LIMITES_USUARIO, **config["limites"]}.items()
+                )
+                cur.execute(
+                    f"""
+                    INSERT INTO stg_rejeitado (linha, motivo)
+                    SELECT linha, motivo FROM (
+                        SELECT s.linha,
+                               CASE
+                                   WHEN s.nome_completo IS NULL OR s.email IS NULL OR s.{chave} IS NULL
+                                       THEN 'campo_obrigatorio'
+                                   {limites}
+                                   {config["validacoes"]}
+                                   WHEN u.id_usuario IS NOT NULL THEN 'email_existente'
+                                   WHEN e.id_usuario IS NOT NULL THEN '{chave}_existente'
+                               END AS motivo
+                        FROM stg_importacao AS s
+                        LEFT JOIN cpe_enc.usuario AS u ON u.email = s.email
+                        LEFT JOIN {config["tabela"]} AS e ON e.{chave} = s.{chave}
+                    ) AS t
+                    WHERE motivo IS NOT NULL;
+                    """
+                )
+                # Duplicatas dentro do lote, só entre as linhas ainda válidas: a primeira
+                # ocorrência válida é mantida mesmo que uma anterior tenha sido rejeitada
+                cur.execute(
+                    f"""
+                    INSERT INTO stg_rejeitado (linha, motivo)
+                    SELECT linha, motivo FROM (
+                        SELECT s.linha,
+                               CASE
+                                   WHEN row_number() OVER (PARTITION BY s.email ORDER BY s.linha) > 1
+                                       THEN 'email_duplicado_no_lote'
+                                   WHEN row_number() OVER (PARTITION BY s.{chave} ORDER BY s.linha) > 1
+                                       THEN '{chave}_duplicado_no_lote'
+                               END AS motivo
+                        FROM stg_importacao AS s
+                        WHERE NOT EXISTS (SELECT 1 FROM stg_rejeitado AS r WHERE r.linha = s.linha)
+                    ) AS t
+                    WHERE motivo IS NOT NULL;
+                    """
+                )
+
+                # Etapa 2: cria os usuários válidos; ON CONFLICT cobre emails inseridos
+                # por outra sessão depois da verificação acima
+                cur.execute(
+                    """
+                    WITH novos AS (
+                        INSERT INTO cpe_enc.usuario (nome_completo, email, senha_hash)
+                        SELECT s.nome_completo, s.email, COALESCE(s.senha_hash, %s)
+                        FROM stg_importacao AS s
+                        WHERE NOT EXISTS (SELECT 1 FROM stg_rejeitado AS r WHERE r.linha = s.linha)
+                        ORDER BY s.linha
+                        ON CONFLICT (email) DO NOTHING
+                        RETURNING id_usuario, email
+                    )
+                    INSERT INTO stg_novos (id_usuario, email)
+                    SELECT id_usuario, email FROM novos;
+                    """,
+                    (SENHA_PADRAO,)
+                )
+                cur.execute(
+                    """
+                    INSERT INTO stg_rejeitado (linha, motivo)
+                    SELECT s.linha, 'email_existente'
+                    FROM stg_importacao AS s
+                    WHERE NOT EXISTS (SELECT 1 FROM stg_rejeitado AS r WHERE r.linha = s.linha)
+                      AND NOT EXISTS (SELECT 1 FROM stg_novos AS n WHERE n.email = s.email);
+                    """
+                )
+
+                # Etapa 3: especializa os usuários recém-criados
+                cur.execute(config["insert"])
+                resultado["inseridos"] = cur.rowcount
+
+                cur.execute(
+                    f"""
+                    SELECT r.linha, r.motivo, s.email, s.{chave}
+                    FROM stg_rejeitado AS r
+                    JOIN stg_importacao AS s ON s.linha = r.linha
+                    ORDER BY r.linha;
+                    """
+                )
+                resultado["rejeitados"] = [
+                    {"linha": linha, "motivo": motivo, "email": email, chave: valor_chave}
+                    for linha, motivo, email, valor_chave in cur.fetchall()
+                ]
+
+            conn.commit()
+            print(f"Importação de {tipo}s concluída: {resultado['inseridos']} inserido(s), "
+                  f"{len(resultado['rejeitados'])} rejeitado(s).")
+            return resultado
+        except psycopg.errors.UniqueViolation as e:
+            conn.rollback()
+            print(f"Erro: conflito de unicidade concorrente durante a importação; nada foi gravado. Detalhes: {e}")
+            return None
+        except (OSError, psycopg.Error) as e:
+            conn.rollback()
+            print(f"Erro ao importar {tipo}s: {e}")
+            return None
+
+
+def importar_alunos(origem):
+    """
+    Importa alunos em lote.
+    'origem' é o caminho de um CSV com cabeçalho (nome_completo, email, senha_hash,
+    matricula, semestre) ou um iterável de dicionários/tuplas nessa ordem.
+    Retorna {'inseridos': n, 'rejeitados': [{'linha', 'motivo', 'email', 'matricula'}, ...]}.
+    """
+    return _importar("aluno", origem)
+
+
+def importar_professores(origem):
+    """
+    Importa professores em lote.
+    'origem' é o caminho de um CSV com cabeçalho (nome_completo, email, senha_hash,
+    siape, sala) ou um iterável de dicionários/tuplas nessa ordem.
+    Retorna {'inseridos': n, 'rejeitados': [{'linha', 'motivo', 'email', 'siape'}, ...]}.
+    """
+    return _importar("professor", origem)
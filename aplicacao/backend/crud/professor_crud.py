@@ -1,200 +1,187 @@
 import os
 import psycopg
-from backend.db_config import get_db_connection
+from db_config import get_connection
+from crud import consultas
+import eventos
+import cache_entidades
 
 def create_professor(nome_completo, email, senha_hash, siape, sala=None):
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return None
-
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO cpe_enc.usuario (nome_completo, email, senha_hash)
-                VALUES (%s, %s, %s)
-                RETURNING id_usuario;
-                """,
-                (nome_completo, email, senha_hash)
-            )
-            id_usuario = cur.fetchone()[0]
-
-            cur.execute(
-                """
-                INSERT INTO cpe_enc.professor (id_usuario, siape, sala)
-                VALUES (%s, %s, %s);
-                """,
-                (id_usuario, siape, sala)
-            )
-            conn.commit()
-            print(f"Professor '{nome_completo}' (ID: {id_usuario}) criado com sucesso.")
-            return id_usuario
-    except psycopg.errors.UniqueViolation as e:
-        conn.rollback()
-        print(f"Erro: Email ou SIAPE já existem. Detalhes: {e}")
-        return None
-    except Exception as e:
-        conn.rollback()
-        print(f"Erro ao criar professor: {e}")
-        return None
-    finally:
-        if conn:
-            conn.close()
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+
+        try:
+            with conn.cursor() as cur:
+                consultas.executar(cur, "usuario_inserir", (nome_completo, email, senha_hash))
+                id_usuario = cur.fetchone()[0]
+
+                consultas.executar(cur, "professor_inserir", (id_usuario, siape, sala))
+                conn.commit()
+                print(f"Professor '{nome_completo}' (ID: {id_usuario}) criado com sucesso.")
+                return id_usuario
+        except psycopg.errors.UniqueViolation as e:
+            conn.rollback()
+            print(f"Erro: Email ou SIAPE já existem. Detalhes: {e}")
+            return None
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao criar professor: {e}")
+            return None
 
 def get_professor_by_id(id_usuario):
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return None
-
-    try:
-        with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
-            cur.execute(
-                """
-                SELECT u.id_usuario, u.nome_completo, u.email, p.siape, p.sala
-                FROM cpe_enc.usuario AS u
-                JOIN cpe_enc.professor AS p ON u.id_usuario = p.id_usuario
-                WHERE u.id_usuario = %s;
-                """,
-                (id_usuario,)
-            )
-            professor = cur.fetchone()
-            return professor
-    except Exception as e:
-        print(f"Erro ao buscar professor por ID: {e}")
-        return None
-    finally:
-        if conn:
-            conn.close()
+    """Busca um professor pelo ID (com cache, ver cache_entidades)."""
+    return cache_entidades.obter("professor", id_usuario, _buscar_professor)
+
+def _buscar_professor(id_usuario):
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                consultas.executar(cur, "professor_por_id", (id_usuario,))
+                professor = cur.fetchone()
+                return professor
+        except Exception as e:
+            print(f"Erro ao buscar professor por ID: {e}")
+            return None
 
 def get_all_professores():
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return []
-
-    try:
-        with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
-            cur.execute(
-                """
-                SELECT u.id_usuario, u.nome_completo, u.email, p.siape, p.sala
-                FROM cpe_enc.usuario AS u
-                JOIN cpe_enc.professor AS p ON u.id_usuario = p.id_usuario
-                ORDER BY u.nome_completo;
-                """
-            )
-            professores = cur.fetchall()
-            return professores
-    except Exception as e:
-        print(f"Erro ao buscar todos os professores: {e}")
-        return []
-    finally:
-        if conn:
-            conn.close()
-
-def update_professor(id_usuario, nome_completo=None, email=None, senha_hash=None, siape=None, sala=None):
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return False
-
-    try:
-        with conn.cursor() as cur:
-            user_updates = []
-            user_params = []
-            if nome_completo is not None:
-                user_updates.append("nome_completo = %s")
-                user_params.append(nome_completo)
-            if email is not None:
-                user_updates.append("email = %s")
-                user_params.append(email)
-            if senha_hash is not None:
-                user_updates.append("senha_hash = %s")
-                user_params.append(senha_hash)
-
-            if user_updates:
-                user_params.append(id_usuario)
-                cur.execute(
-                    f"UPDATE cpe_enc.usuario SET {', '.join(user_updates)} WHERE id_usuario = %s;",
-                    user_params
-                )
-
-            prof_updates = []
-            prof_params = []
-            if siape is not None:
-                prof_updates.append("siape = %s")
-                prof_params.append(siape)
-            if sala is not None:
-                prof_updates.append("sala = %s")
-                prof_params.append(sala)
-
-            if prof_updates:
-                prof_params.append(id_usuario)
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return []
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                consultas.executar(cur, "professor_todos")
+                professores = cur.fetchall()
+                return professores
+        except Exception as e:
+            print(f"Erro ao buscar todos os professores: {e}")
+            return []
+
+def get_professores_page(limite=50, apos=None):
+    """
+    Retorna uma página de professores usando paginação por chave (keyset).
+    'apos' é a tupla (nome_completo, id_usuario) do último professor da página
+    anterior; use None para a primeira página.
+    """
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return []
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                if apos:
+                    consultas.executar(cur, "professor_pagina_apos", (*apos, limite))
+                else:
+                    consultas.executar(cur, "professor_pagina", (limite,))
+                return cur.fetchall()
+        except Exception as e:
+            print(f"Erro ao buscar página de professores: {e}")
+            return []
+
+def iter_professores(itersize=1000):
+    """
+    Percorre todos os professores com um cursor nomeado (server-side),
+    trazendo 'itersize' linhas por vez.
+    """
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return
+
+        try:
+            with conn.cursor(name="iter_professores", row_factory=psycopg.rows.dict_row) as cur:
+                cur.itersize = itersize
                 cur.execute(
-                    f"UPDATE cpe_enc.professor SET {', '.join(prof_updates)} WHERE id_usuario = %s;",
-                    prof_params
+                    """
+                    SELECT u.id_usuario, u.nome_completo, u.email, p.siape, p.sala
+                    FROM cpe_enc.usuario AS u
+                    JOIN cpe_enc.professor AS p ON u.id_usuario = p.id_usuario
+                    ORDER BY u.nome_completo, u.id_usuario;
+                    """
                 )
+                yield from cur
+        except Exception as e:
+            print(f"Erro ao percorrer os professores: {e}")
 
-            conn.commit()
-            print(f"Professor (ID: {id_usuario}) atualizado com sucesso.")
-            return True
-    except psycopg.errors.UniqueViolation as e:
-        conn.rollback()
-        print(f"Erro: Email ou SIAPE já existem. Detalhes: {e}")
-        return False
-    except Exception as e:
-        conn.rollback()
-        print(f"Erro ao atualizar professor: {e}")
-        return False
-    finally:
-        if conn:
-            conn.close()
+def update_professor(id_usuario, nome_completo=None, email=None, senha_hash=None, siape=None, sala=None):
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return False
+
+        try:
+            with conn.cursor() as cur:
+                user_update = consultas.montar_update("usuario", "id_usuario", id_usuario, {
+                    "nome_completo": nome_completo,
+                    "email": email,
+                    "senha_hash": senha_hash,
+                })
+                if user_update:
+                    sql, params = user_update
+                    cur.execute(sql, params, prepare=True)
+
+                prof_update = consultas.montar_update("professor", "id_usuario", id_usuario, {
+                    "siape": siape,
+                    "sala": sala,
+                })
+                if prof_update:
+                    sql, params = prof_update
+                    cur.execute(sql, params, prepare=True)
+
+                eventos.notificar(cur, "professor", id_usuario)
+                conn.commit()
+                eventos.publicar("professor", id_usuario)
+                print(f"Professor (ID: {id_usuario}) atualizado com sucesso.")
+                return True
+        except psycopg.errors.UniqueViolation as e:
+            conn.rollback()
+            print(f"Erro: Email ou SIAPE já existem. Detalhes: {e}")
+            return False
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao atualizar professor: {e}")
+            return False
 
 def delete_professor(id_usuario):
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return False
-
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT COUNT(*) FROM cpe_enc.projeto
-                WHERE id_professor_orientador = %s;
-                """,
-                (id_usuario,)
-            )
-            num_projetos = cur.fetchone()[0]
-
-            if num_projetos > 0:
-                print(f"Erro: Professor (ID: {id_usuario}) não pode ser excluído. "
-                      f"Ele está orientando {num_projetos} projeto(s). "
-                      "Reatribua ou exclua os projetos primeiro.")
-                return False
-
-            cur.execute(
-                """
-                DELETE FROM cpe_enc.usuario
-                WHERE id_usuario = %s;
-                """,
-                (id_usuario,)
-            )
-            conn.commit()
-            if cur.rowcount > 0:
-                print(f"Professor (ID: {id_usuario}) excluído com sucesso.")
-                return True
-            else:
-                print(f"Professor (ID: {id_usuario}) não encontrado.")
-                return False
-    except Exception as e:
-        conn.rollback()
-        print(f"Erro ao deletar professor: {e}")
-        return False
-    finally:
-        if conn:
-            conn.close()
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return False
+
+        try:
+            with conn.cursor() as cur:
+                consultas.executar(cur, "professor_total_projetos", (id_usuario,))
+                num_projetos = cur.fetchone()[0]
+
+                if num_projetos > 0:
+                    print(f"Erro: Professor (ID: {id_usuario}) não pode ser excluído. "
+                          f"Ele está orientando {num_projetos} projeto(s). "
+                          "Reatribua ou exclua os projetos primeiro.")
+                    return False
+
+                consultas.executar(cur, "professor_excluir", (id_usuario,))
+                removidos = cur.rowcount
+                if removidos > 0:
+                    eventos.notificar(cur, "professor", id_usuario)
+                conn.commit()
+                if removidos > 0:
+                    eventos.publicar("professor", id_usuario)
+                    print(f"Professor (ID: {id_usuario}) excluído com sucesso.")
+                    return True
+                else:
+                    print(f"Professor (ID: {id_usuario}) não encontrado.")
+                    return False
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao deletar professor: {e}")
+            return False
 
 if __name__ == "__main__":
     print("--- Testando CRUD de Professores ---")
@@ -1,7 +1,10 @@
 # profjeto_crud.py
 import os
 import psycopg
-from backend.db_config import get_db_connection
+from db_config import get_connection
+from crud import consultas
+import eventos
+import cache_entidades
 from tabulate import tabulate # Para exibir resultados de forma tabular
 
 def create_projeto(titulo, descricao, dt_inicio, dt_fim_prevista, status, id_professor_orientador):
@@ -10,167 +13,238 @@ def create_projeto(titulo, descricao, dt_inicio, dt_fim_prevista, status, id_pro
     dt_inicio e dt_fim_prevista devem ser strings no formato 'YYYY-MM-DD'.
     status deve ser um dos valores permitidos ('Proposto', 'Em Andamento', 'Concluido', 'Cancelado').
     """
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return None
-
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO cpe_enc.projeto (titulo, descricao, dt_inicio, dt_fim_prevista, status, id_professor_orientador)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                RETURNING id_projeto;
-                """,
-                (titulo, descricao, dt_inicio, dt_fim_prevista, status, id_professor_orientador)
-            )
-            id_projeto = cur.fetchone()[0]
-            conn.commit()
-            print(f"Projeto '{titulo}' (ID: {id_projeto}) criado com sucesso.")
-            return id_projeto
-    except psycopg.errors.ForeignKeyViolation as e:
-        conn.rollback()
-        print(f"Erro: O professor orientador com ID {id_professor_orientador} não existe. Detalhes: {e}")
-        return None
-    except psycopg.errors.CheckViolation as e:
-        conn.rollback()
-        print(f"Erro de validação: Verifique o status ou as datas do projeto. Detalhes: {e}")
-        return None
-    except Exception as e:
-        conn.rollback()
-        print(f"Erro ao criar projeto: {e}")
-        return None
-    finally:
-        if conn:
-            conn.close()
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+
+        try:
+            with conn.cursor() as cur:
+                consultas.executar(
+                    cur, "projeto_inserir",
+                    (titulo, descricao, dt_inicio, dt_fim_prevista, status, id_professor_orientador)
+                )
+                id_projeto = cur.fetchone()[0]
+                eventos.notificar(cur, "projeto", id_projeto)
+                conn.commit()
+                print(f"Projeto '{titulo}' (ID: {id_projeto}) criado com sucesso.")
+                eventos.publicar("projeto", id_projeto)
+                return id_projeto
+        except psycopg.errors.ForeignKeyViolation as e:
+            conn.rollback()
+            print(f"Erro: O professor orientador com ID {id_professor_orientador} não existe. Detalhes: {e}")
+            return None
+        except psycopg.errors.CheckViolation as e:
+            conn.rollback()
+            print(f"Erro de validação: Verifique o status ou as datas do projeto. Detalhes: {e}")
+            return None
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao criar projeto: {e}")
+            return None
 
 def get_projeto_by_id(id_projeto):
     """
-    Busca os detalhes de um projeto pelo seu ID.
+    Busca os detalhes de um projeto pelo seu ID (com cache, ver cache_entidades).
     """
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return None
-
-    try:
-        with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
-            cur.execute(
-                """
-                SELECT p.id_projeto, p.titulo, p.descricao, p.dt_inicio, p.dt_fim_prevista, p.status,
-                       u.nome_completo AS professor_orientador
-                FROM cpe_enc.projeto AS p
-                JOIN cpe_enc.professor AS prof ON p.id_professor_orientador = prof.id_usuario
-                JOIN cpe_enc.usuario AS u ON prof.id_usuario = u.id_usuario
-                WHERE p.id_projeto = %s;
-                """,
-                (id_projeto,)
-            )
-            projeto = cur.fetchone()
-            return projeto
-    except Exception as e:
-        print(f"Erro ao buscar projeto por ID: {e}")
-        return None
-    finally:
-        if conn:
-            conn.close()
+    return cache_entidades.obter("projeto", id_projeto, _buscar_projeto)
+
+def _buscar_projeto(id_projeto):
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                consultas.executar(cur, "projeto_por_id", (id_projeto,))
+                projeto = cur.fetchone()
+                return projeto
+        except Exception as e:
+            print(f"Erro ao buscar projeto por ID: {e}")
+            return None
 
 def get_all_projetos():
     """
     Retorna uma lista com todos os projetos cadastrados no sistema.
     """
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return []
-
-    try:
-        with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
-            cur.execute(
-                """
-                SELECT p.id_projeto, p.titulo, p.descricao, p.dt_inicio, p.dt_fim_prevista, p.status,
-                       u.nome_completo AS professor_orientador
-                FROM cpe_enc.projeto AS p
-                JOIN cpe_enc.professor AS prof ON p.id_professor_orientador = prof.id_usuario
-                JOIN cpe_enc.usuario AS u ON prof.id_usuario = u.id_usuario
-                ORDER BY p.titulo;
-                """
-            )
-            projetos = cur.fetchall()
-            return projetos
-    except Exception as e:
-        print(f"Erro ao buscar todos os projetos: {e}")
-        return []
-    finally:
-        if conn:
-            conn.close()
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return []
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                consultas.executar(cur, "projeto_todos")
+                projetos = cur.fetchall()
+                return projetos
+        except Exception as e:
+            print(f"Erro ao buscar todos os projetos: {e}")
+            return []
+
+def get_projetos_page(limite=50, apos=None):
+    """
+    Retorna uma página de projetos usando paginação por chave (keyset).
+    'apos' é a tupla (titulo, id_projeto) do último projeto da página anterior;
+    use None para a primeira página. A ordem é titulo e, no empate, id_projeto.
+    """
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return []
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                if apos:
+                    consultas.executar(cur, "projeto_pagina_apos", (*apos, limite))
+                else:
+                    consultas.executar(cur, "projeto_pagina", (limite,))
+                return cur.fetchall()
+        except Exception as e:
+            print(f"Erro ao buscar página de projetos: {e}")
+            return []
+
+def iter_projetos(itersize=1000):
+    """
+    Percorre todos os projetos com um cursor nomeado (server-side), trazendo
+    'itersize' linhas por ida ao banco em vez de materializar o resultado inteiro.
+    A conexão fica emprestada do pool até o gerador ser esgotado ou fechado.
+    """
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return
+
+        try:
+            with conn.cursor(name="iter_projetos", row_factory=psycopg.rows.dict_row) as cur:
+                cur.itersize = itersize
+                cur.execute(
+                    """
+                    SELECT p.id_projeto, p.titulo, p.descricao, p.dt_inicio, p.dt_fim_prevista, p.status,
+                           u.nome_completo AS professor_orientador
+                    FROM cpe_enc.projeto AS p
+                    JOIN cpe_enc.professor AS prof ON p.id_professor_orientador = prof.id_usuario
+                    JOIN cpe_enc.usuario AS u ON prof.id_usuario = u.id_usuario
+                    ORDER BY p.titulo, p.id_projeto;
+                    """
+                )
+                yield from cur
+        except Exception as e:
+            print(f"Erro ao percorrer os projetos: {e}")
 
 def update_projeto(id_projeto, titulo=None, descricao=None, dt_inicio=None, dt_fim_prevista=None, status=None, id_professor_orientador=None):
     """
     Atualiza os dados de um projeto.
     Campos não fornecidos (None) não serão atualizados.
     """
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return False
-
-    try:
-        with conn.cursor() as cur:
-            updates = []
-            params = []
-
-            if titulo is not None:
-                updates.append("titulo = %s")
-                params.append(titulo)
-            if descricao is not None:
-                updates.append("descricao = %s")
-                params.append(descricao)
-            if dt_inicio is not None:
-                updates.append("dt_inicio = %s")
-                params.append(dt_inicio)
-            if dt_fim_prevista is not None:
-                updates.append("dt_fim_prevista = %s")
-                params.append(dt_fim_prevista)
-            if status is not None:
-                updates.append("status = %s")
-                params.append(status)
-            if id_professor_orientador is not None:
-                updates.append("id_professor_orientador = %s")
-                params.append(id_professor_orientador)
-
-            if not updates:
-                print("Nenhum campo para atualizar foi fornecido.")
-                return False
-
-            params.append(id_projeto)
-            cur.execute(
-                f"UPDATE cpe_enc.projeto SET {', '.join(updates)} WHERE id_projeto = %s;",
-                params
-            )
-            conn.commit()
-            if cur.rowcount > 0:
-                print(f"Projeto (ID: {id_projeto}) atualizado com sucesso.")
-                return True
-            else:
-                print(f"Projeto (ID: {id_projeto}) não encontrado.")
-                return False
-    except psycopg.errors.ForeignKeyViolation as e:
-        conn.rollback()
-        print(f"Erro: O novo professor orientador com ID {id_professor_orientador} não existe. Detalhes: {e}")
-        return False
-    except psycopg.errors.CheckViolation as e:
-        conn.rollback()
-        print(f"Erro de validação: Verifique o status ou as datas do projeto. Detalhes: {e}")
-        return False
-    except Exception as e:
-        conn.rollback()
-        print(f"Erro ao atualizar projeto: {e}")
-        return False
-    finally:
-        if conn:
-            conn.close()
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return False
+
+        try:
+            with conn.cursor() as cur:
+                update = consultas.montar_update("projeto", "id_projeto", id_projeto, {
+                    "titulo": titulo,
+                    "descricao": descricao,
+                    "dt_inicio": dt_inicio,
+                    "dt_fim_prevista": dt_fim_prevista,
+                    "status": status,
+                    "id_professor_orientador": id_professor_orientador,
+                })
+                if update is None:
+                    print("Nenhum campo para atualizar foi fornecido.")
+                    return False
+
+                sql, params = update
+                cur.execute(sql, params, prepare=True)
+                atualizados = cur.rowcount
+                if atualizados > 0:
+                    eventos.notificar(cur, "projeto", id_projeto)
+                conn.commit()
+                if atualizados > 0:
+                    print(f"Projeto (ID: {id_projeto}) atualizado com sucesso.")
+                    eventos.publicar("projeto", id_projeto)
+                    return True
+                else:
+                    print(f"Projeto (ID: {id_projeto}) não encontrado.")
+                    return False
+        except psycopg.errors.ForeignKeyViolation as e:
+            conn.rollback()
+            print(f"Erro: O novo professor orientador com ID {id_professor_orientador} não existe. Detalhes: {e}")
+            return False
+        except psycopg.errors.CheckViolation as e:
+            conn.rollback()
+            print(f"Erro de validação: Verifique o status ou as datas do projeto. Detalhes: {e}")
+            return False
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao atualizar projeto: {e}")
+            return False
+
+def _atualizar_um_a_um(conn, cur, alteracoes):
+    """Aplica cada alteração num savepoint próprio, registrando a restrição violada ou o valor rejeitado."""
+    resultados = {}
+    for id_projeto, campos in alteracoes.items():
+        sql, params = consultas.montar_update("projeto", "id_projeto", id_projeto, campos)
+        try:
+            with conn.transaction():
+                cur.execute(sql, params, prepare=True)
+            resultados[id_projeto] = None if cur.rowcount > 0 else "nao_encontrado"
+        except (psycopg.errors.CheckViolation, psycopg.errors.ForeignKeyViolation) as e:
+            resultados[id_projeto] = e.diag.constraint_name
+        except psycopg.errors.DataError:
+            # Valor que o banco não aceita na coluna (data inexistente, texto longo demais)
+            resultados[id_projeto] = consultas.DADO_INVALIDO
+    return resultados
+
+
+def update_projetos_bulk(alteracoes):
+    """
+    Atualiza vários projetos com um único comando, numa única transação.
+    'alteracoes' é um iterável de pares (id_projeto, {campo: valor}) com os mesmos
+    campos de update_projeto; valores None não são alterados.
+    Retorna uma lista de {"id_projeto", "ok", "erro"} na ordem dos ids, em que 'erro'
+    é None ou 'nao_encontrado', 'sem_campos', 'campo_invalido', 'chk_status_projeto',
+    'chk_datas_validas', 'fk_projeto_professor' ou 'dado_invalido' (data inexistente,
+    texto maior que a coluna). As linhas com erro são ignoradas e
+    as demais aplicadas. Retorna None se a operação inteira falhar.
+    """
+    resultados, validas = consultas.separar_projetos_lote(alteracoes)
+
+    if validas:
+        with get_connection() as conn:
+            if not conn:
+                print("Erro: Não foi possível conectar ao banco de dados.")
+                return None
+
+            try:
+                with conn.transaction(), conn.cursor() as cur:
+                    try:
+                        with conn.transaction():
+                            consultas.executar(cur, "projeto_atualizar_lote", consultas.params_projetos_lote(validas))
+                            resultados.update(cur.fetchall())
+                    except (psycopg.errors.CheckViolation, psycopg.errors.ForeignKeyViolation,
+                            psycopg.errors.DataError):
+                        # Alguma restrição disparou mesmo assim (ex.: o professor foi excluído por
+                        # outra transação depois da validação) ou algum valor não coube na coluna:
+                        # aplica um a um para isolar a linha
+                        resultados.update(_atualizar_um_a_um(conn, cur, validas))
+
+                    atualizados = [i for i in validas if resultados[i] is None]
+                    if atualizados:
+                        eventos.notificar_varios(cur, "projeto", atualizados)
+            except psycopg.Error as e:
+                print(f"Erro ao atualizar projetos em lote: {e}")
+                return None
+
+        for id_projeto in atualizados:
+            eventos.publicar("projeto", id_projeto)
+
+    falhas = sum(1 for erro in resultados.values() if erro is not None)
+    print(f"{len(resultados) - falhas} projeto(s) atualizado(s), {falhas} com erro.")
+    return [{"id_projeto": i, "ok": erro is None, "erro": erro} for i, erro in resultados.items()]
+
 
 def delete_projeto(id_projeto):
     """
@@ -179,93 +253,65 @@ def delete_projeto(id_projeto):
     'projeto_area', 'aluno_projeto', 'vaga', 'marco_calendario', 'publicacao'
     devido ao ON DELETE CASCADE definido no DDL.
     """
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return False
-
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                DELETE FROM cpe_enc.projeto
-                WHERE id_projeto = %s;
-                """,
-                (id_projeto,)
-            )
-            conn.commit()
-            if cur.rowcount > 0:
-                print(f"Projeto (ID: {id_projeto}) excluído com sucesso.")
-                return True
-            else:
-                print(f"Projeto (ID: {id_projeto}) não encontrado.")
-                return False
-    except Exception as e:
-        conn.rollback()
-        print(f"Erro ao deletar projeto: {e}")
-        return False
-    finally:
-        if conn:
-            conn.close()
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return False
+
+        try:
+            with conn.cursor() as cur:
+                consultas.executar(cur, "projeto_excluir", (id_projeto,))
+                removidos = cur.rowcount
+                if removidos > 0:
+                    eventos.notificar(cur, "projeto", id_projeto)
+                conn.commit()
+                if removidos > 0:
+                    print(f"Projeto (ID: {id_projeto}) excluído com sucesso.")
+                    eventos.publicar("projeto", id_projeto)
+                    return True
+                else:
+                    print(f"Projeto (ID: {id_projeto}) não encontrado.")
+                    return False
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao deletar projeto: {e}")
+            return False
 
 def get_projetos_by_professor(id_professor):
     """
     Retorna uma lista de projetos orientados por um professor específico.
     """
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return []
-
-    try:
-        with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
-            cur.execute(
-                """
-                SELECT p.id_projeto, p.titulo, p.descricao, p.dt_inicio, p.dt_fim_prevista, p.status
-                FROM cpe_enc.projeto AS p
-                WHERE p.id_professor_orientador = %s
-                ORDER BY p.titulo;
-                """,
-                (id_professor,)
-            )
-            projetos = cur.fetchall()
-            return projetos
-    except Exception as e:
-        print(f"Erro ao buscar projetos por professor: {e}")
-        return []
-    finally:
-        if conn:
-            conn.close()
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return []
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                consultas.executar(cur, "projeto_por_professor", (id_professor,))
+                projetos = cur.fetchall()
+                return projetos
+        except Exception as e:
+            print(f"Erro ao buscar projetos por professor: {e}")
+            return []
 
 def get_professor_projetos_summary():
     """
     Retorna um resumo de professores e o número de projetos que cada um orienta.
     """
-    conn = get_db_connection()
-    if not conn:
-        print("Erro: Não foi possível conectar ao banco de dados.")
-        return []
-
-    try:
-        with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
-            cur.execute(
-                """
-                SELECT u.nome_completo AS professor, COUNT(p.id_projeto) AS total_projetos
-                FROM cpe_enc.usuario AS u
-                JOIN cpe_enc.professor AS prof ON u.id_usuario = prof.id_usuario
-                LEFT JOIN cpe_enc.projeto AS p ON prof.id_usuario = p.id_professor_orientador
-                GROUP BY u.nome_completo
-                ORDER BY total_projetos DESC, u.nome_completo;
-                """
-            )
-            summary = cur.fetchall()
-            return summary
-    except Exception as e:
-        print(f"Erro ao buscar resumo de projetos por professor: {e}")
-        return []
-    finally:
-        if conn:
-            conn.close()
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return []
+
+        try:
+            with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+                consultas.executar(cur, "projeto_resumo_professores")
+                summary = cur.fetchall()
+                return summary
+        except Exception as e:
+            print(f"Erro ao buscar resumo de projetos por professor: {e}")
+            return []
 
 if __name__ == "__main__":
     print("--- Testando CRUD de Projetos ---")
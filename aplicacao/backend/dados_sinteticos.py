@@ -0,0 +1,232 @@
+"""
+Geração de dados sintéticos, referencialmente consistentes, para todas as tabelas
+do esquema cpe_enc (usado por db_setup.seed_scaled).
+
+Cada tabela tem um gerador que produz blocos de linhas já no formato texto do
+COPY (campos separados por tab, NULL como \\N), com ids explícitos. Assim nenhum
+bloco precisa ficar em memória depois de enviado e as chaves estrangeiras podem
+ser sorteadas sem consultar o banco. Cada tabela usa seu próprio
+random.Random derivado da semente, então o resultado depende só da semente,
+do plano e da data base, e as tabelas podem ser geradas em paralelo.
+"""
+import random
+import unicodedata
+from datetime import date
+
+SENHA_PADRAO = "senha_padrao_123"
+
+NOMES = ("Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João",
+         "Júlia", "Lucas", "Mariana", "Matheus", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago",
+         "Vitória", "Leonardo", "Beatriz", "Gustavo", "Larissa", "Pedro", "Camila", "Rodrigo", "Letícia", "André")
+SOBRENOMES = ("Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima",
+              "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes",
+              "Vieira", "Barbosa", "Rocha", "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques",
+              "Machado", "Mendes", "Freitas")
+AREAS = ("Inteligência Artificial", "Aprendizado de Máquina", "Visão Computacional", "Robótica",
+         "Sistemas Embarcados", "Internet das Coisas", "Redes de Computadores", "Segurança da Informação",
+         "Banco de Dados", "Engenharia de Software", "Computação Gráfica", "Interação Humano-Computador",
+         "Sistemas Distribuídos", "Computação em Nuvem", "Processamento de Linguagem Natural",
+         "Bioinformática", "Energias Renováveis", "Eletrônica de Potência", "Controle e Automação",
+         "Telecomunicações", "Processamento de Sinais", "Microeletrônica", "Educação em Computação",
+         "Jogos Digitais", "Ciência de Dados", "Otimização", "Teoria da Computação", "Blockchain",
+         "Computação Quântica", "Sustentabilidade")
+TEMAS = ("Plataforma", "Sistema", "Estudo", "Ferramenta", "Laboratório", "Observatório", "Rede", "Programa")
+STATUS_PROJETO = ("Proposto", "Em Andamento", "Em Andamento", "Em Andamento", "Concluido", "Cancelado")
+STATUS_CANDIDATURA = ("Enviada", "Enviada", "Em Analise", "Aprovada", "Rejeitada")
+MARCOS = ("Kick-off", "Entrega parcial", "Relatório intermediário", "Workshop", "Entrega final")
+
+
+def _ascii(texto):
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode().lower().replace(" ", "")
+
+
+def planejar(n_usuarios, proporcao_professores=0.1, projetos_por_professor=3):
+    """Quantidades e faixas de ids de cada entidade (as proporções seguem o seed.sql)."""
+    n_professores = max(1, round(n_usuarios * proporcao_professores))
+    return {
+        "usuarios": n_usuarios,
+        "professores": n_professores,
+        "primeiro_aluno": n_professores + 1,
+        "alunos": n_usuarios - n_professores,
+        "areas": len(AREAS),
+        "projetos": n_professores * projetos_por_professor,
+    }
+
+
+def _rng(semente, tabela):
+    return random.Random(f"{semente}:{tabela}")
+
+
+def _blocos(linhas, tamanho_lote):
+    """Agrupa um iterável de linhas em strings de até tamanho_lote linhas."""
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= tamanho_lote:
+            yield "".join(bloco)
+            bloco = []
+    if bloco:
+        yield "".join(bloco)
+
+
+def _datas(primeiro_ordinal, quantidade):
+    """Datas ISO consecutivas a partir de primeiro_ordinal (formatar cada data na hora custa caro)."""
+    return [date.fromordinal(primeiro_ordinal + d).isoformat() for d in range(quantidade)]
+
+
+def _distintos(rng, k, n):
+    """k valores distintos em [1, n] (k pequeno; sorteio com rejeição)."""
+    escolhidos = set()
+    k = min(k, n)
+    while len(escolhidos) < k:
+        escolhidos.add(1 + int(rng.random() * n))
+    return escolhidos
+
+
+def gerar_usuario(plano, semente, data_base):
+    rng = _rng(semente, "usuario")
+    nomes = [(n, _ascii(n)) for n in NOMES]
+    sobrenomes = [(s, _ascii(s)) for s in SOBRENOMES]
+    for i in range(1, plano["usuarios"] + 1):
+        nome, nome_ascii = rng.choice(nomes)
+        sobrenome, sobrenome_ascii = rng.choice(sobrenomes)
+        yield f"{i}\t{nome} {sobrenome}\t{nome_ascii}.{sobrenome_ascii}{i}@ufsc.br\t{SENHA_PADRAO}\n"
+
+
+def gerar_professor(plano, semente, data_base):
+    rng = _rng(semente, "professor")
+    for i in range(1, plano["professores"] + 1):
+        sala = "\\N" if rng.random() < 0.1 else f"CTC-{rng.choice('ABCDE')}{100 + int(rng.random() * 300)}"
+        yield f"{i}\t{1000000 + i}\t{sala}\n"
+
+
+def gerar_aluno(plano, semente, data_base):
+    rng = _rng(semente, "aluno")
+    for i in range(plano["primeiro_aluno"], plano["usuarios"] + 1):
+        semestre = "\\N" if rng.random() < 0.02 else 1 + int(rng.random() * 10)
+        yield f"{i}\t{20000000 + i}\t{semestre}\n"
+
+
+def gerar_area_de_interesse(plano, semente, data_base):
+    for i, nome in enumerate(AREAS, start=1):
+        yield f"{i}\t{nome}\n"
+
+
+def gerar_projeto(plano, semente, data_base):
+    rng = _rng(semente, "projeto")
+    datas = _datas(data_base.toordinal() - 1500, 1500 + 730)
+    for i in range(1, plano["projetos"] + 1):
+        inicio = int(rng.random() * 1500)
+        fim = "\\N" if rng.random() < 0.1 else datas[inicio + 30 + int(rng.random() * 700)]
+        area = AREAS[int(rng.random() * len(AREAS))]
+        yield (f"{i}\t{rng.choice(TEMAS)} de {area} {i}\tProjeto de extensão em {area}.\t"
+               f"{datas[inicio]}\t{fim}\t{rng.choice(STATUS_PROJETO)}\t"
+               f"{1 + int(rng.random() * plano['professores'])}\n")
+
+
+def gerar_projeto_area(plano, semente, data_base):
+    rng = _rng(semente, "projeto_area")
+    for i in range(1, plano["projetos"] + 1):
+        for id_area in _distintos(rng, 1 + int(rng.random() * 3), plano["areas"]):
+            yield f"{i}\t{id_area}\n"
+
+
+def gerar_aluno_projeto(plano, semente, data_base):
+    rng = _rng(semente, "aluno_projeto")
+    datas = _datas(data_base.toordinal() - 900, 900)
+    for id_aluno in range(plano["primeiro_aluno"], plano["usuarios"] + 1):
+        # ~20% dos alunos não participam de projetos; os demais, de 1 ou 2
+        sorteio = rng.random()
+        quantidade = 0 if sorteio < 0.2 else 1 if sorteio < 0.75 else 2
+        for id_projeto in _distintos(rng, quantidade, plano["projetos"]):
+            yield f"{id_aluno}\t{id_projeto}\t{datas[int(rng.random() * 900)]}\n"
+
+
+def _vagas_por_projeto(plano, semente):
+    """Quantidade de vagas (0 a 2) de cada projeto, num sorteio próprio para que
+    gerar_candidatura conheça o total de vagas sem depender de gerar_vaga."""
+    rng = _rng(semente, "vagas_por_projeto")
+    return (int(rng.random() * 3) for _ in range(plano["projetos"]))
+
+
+def total_vagas(plano, semente):
+    return sum(_vagas_por_projeto(plano, semente))
+
+
+def gerar_vaga(plano, semente, data_base):
+    rng = _rng(semente, "vaga")
+    datas = _datas(data_base.toordinal() - 60, 120)
+    id_vaga = 0
+    for id_projeto, quantidade in enumerate(_vagas_por_projeto(plano, semente), start=1):
+        for _ in range(quantidade):
+            id_vaga += 1
+            prazo = f"{datas[int(rng.random() * 120)]} {int(rng.random() * 24):02d}:00:00"
+            yield (f"{id_vaga}\t{id_projeto}\tConhecimentos em {AREAS[int(rng.random() * len(AREAS))]}\t"
+                   f"{1 + int(rng.random() * 4)}\t{prazo}\n")
+
+
+def gerar_candidatura(plano, semente, data_base):
+    rng = _rng(semente, "candidatura")
+    n_vagas = total_vagas(plano, semente)
+    if not n_vagas:
+        return
+    datas = _datas(data_base.toordinal() - 365, 365)
+    n_status = len(STATUS_CANDIDATURA)
+    id_candidatura = 0
+    for id_aluno in range(plano["primeiro_aluno"], plano["usuarios"] + 1):
+        for id_vaga in _distintos(rng, int(rng.random() * 4), n_vagas):
+            id_candidatura += 1
+            segundo = int(rng.random() * 86400)
+            yield (f"{id_candidatura}\t{id_aluno}\t{id_vaga}\t{datas[int(rng.random() * 365)]} "
+                   f"{segundo // 3600:02d}:{segundo // 60 % 60:02d}:{segundo % 60:02d}\t"
+                   f"{STATUS_CANDIDATURA[int(rng.random() * n_status)]}\n")
+
+
+def gerar_marco_calendario(plano, semente, data_base):
+    rng = _rng(semente, "marco_calendario")
+    datas = _datas(data_base.toordinal() - 700, 1400)
+    id_marco = 0
+    for id_projeto in range(1, plano["projetos"] + 1):
+        for titulo in MARCOS[:2 + int(rng.random() * 3)]:
+            id_marco += 1
+            descricao = "\\N" if rng.random() < 0.5 else f"{titulo} do projeto {id_projeto}"
+            yield (f"{id_marco}\t{id_projeto}\t{titulo}\t"
+                   f"{datas[int(rng.random() * 1400)]}\t{descricao}\n")
+
+
+def gerar_publicacao(plano, semente, data_base):
+    rng = _rng(semente, "publicacao")
+    id_publicacao = 0
+    for id_projeto in range(1, plano["projetos"] + 1):
+        for _ in range(int(rng.random() * 3)):
+            id_publicacao += 1
+            ano = data_base.year - int(rng.random() * 10)
+            yield (f"{id_publicacao}\t{id_projeto}\tResultados do projeto {id_projeto} ({id_publicacao})\t{ano}\t"
+                   f"Anais do Congresso de Extensão, {ano}\n")
+
+
+# Ordem de carga (respeita as chaves estrangeiras): tabela -> (colunas, gerador, coluna serial)
+TABELAS = {
+    "usuario": (("id_usuario", "nome_completo", "email", "senha_hash"), gerar_usuario, "id_usuario"),
+    "professor": (("id_usuario", "siape", "sala"), gerar_professor, None),
+    "aluno": (("id_usuario", "matricula", "semestre"), gerar_aluno, None),
+    "area_de_interesse": (("id_area", "nome_area"), gerar_area_de_interesse, "id_area"),
+    "projeto": (("id_projeto", "titulo", "descricao", "dt_inicio", "dt_fim_prevista", "status",
+                 "id_professor_orientador"), gerar_projeto, "id_projeto"),
+    "projeto_area": (("id_projeto", "id_area"), gerar_projeto_area, None),
+    "aluno_projeto": (("id_aluno", "id_projeto", "data_ingresso"), gerar_aluno_projeto, None),
+    "vaga": (("id_vaga", "id_projeto", "descricao_requisitos", "numero_posicoes", "prazo_inscricao"),
+             gerar_vaga, "id_vaga"),
+    "candidatura": (("id_candidatura", "id_aluno", "id_vaga", "dt_candidatura", "status"),
+                    gerar_candidatura, "id_candidatura"),
+    "marco_calendario": (("id_marco", "id_projeto", "titulo_marco", "data_marco", "descricao"),
+                         gerar_marco_calendario, "id_marco"),
+    "publicacao": (("id_publicacao", "id_projeto", "titulo_publicacao", "ano_publicacao", "referencia"),
+                   gerar_publicacao, "id_publicacao"),
+}
+
+
+def blocos(tabela, plano, semente, data_base, tamanho_lote):
+    """Blocos de texto prontos para COPY da tabela indicada."""
+    _, gerador, _ = TABELAS[tabela]
+    return _blocos(gerador(plano, semente, data_base), tamanho_lote)
@@ -1,19 +1,197 @@
 import os
+import time
+import atexit
+import threading
+from contextlib import contextmanager, asynccontextmanager
+
 import psycopg
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import ConnectionPool, AsyncConnectionPool, PoolTimeout
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Depois do load_dotenv: lê as variáveis INSTR_* ao ser importado
+import instrumentacao  # noqa: E402
+
+_pool = None
+_async_pool = None
+# Protege a criação preguiçosa dos pools quando várias threads chamam get_pool() ao mesmo tempo
+_pool_lock = threading.Lock()
+
+
+def _pool_kwargs():
+    """Parâmetros comuns aos pools síncrono e assíncrono, lidos do .env."""
+    return dict(
+        min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+        max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        max_idle=float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+        timeout=float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    )
+
+
+def _conninfo():
+    """Monta a string de conexão a partir das variáveis do arquivo .env."""
+    return make_conninfo(
+        dbname=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        host=os.getenv("DB_HOST"),
+        port=os.getenv("DB_PORT")
+    )
+
+
+def _configurar_conexao(conn):
+    """
+    Chamado pelo pool para cada conexão nova. crud.consultas executa tudo com
+    prepare=True; prepared_max limita quantos comandos ficam preparados por conexão.
+    """
+    conn.prepared_max = int(os.getenv("DB_PREPARED_MAX", "200"))
+    instrumentacao.configurar(conn)
+
+
+async def _configurar_conexao_async(conn):
+    _configurar_conexao(conn)
+
+
 def get_db_connection():
+    """
+    Abre uma conexão avulsa, fora do pool.
+    Use apenas para scripts longos (ex.: db_setup) ou comparações de desempenho;
+    o restante da aplicação deve usar get_connection().
+    """
     try:
-        conn = psycopg.connect(
-            dbname=os.getenv("DB_NAME"),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            host=os.getenv("DB_HOST"),
-            port=os.getenv("DB_PORT")
-        )
+        conn = psycopg.connect(_conninfo())
         return conn
     except psycopg.OperationalError as e:
         print(f"Erro ao conectar ao banco de dados: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def get_pool():
+    """
+    Retorna o pool de conexões do processo, criando-o na primeira chamada.
+    Tamanhos e tempos são lidos do .env (DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE,
+    DB_POOL_MAX_IDLE, DB_POOL_TIMEOUT).
+    """
+    global _pool
+    pool = _pool
+    if pool is None:
+        with _pool_lock:
+            # Outra thread pode ter criado o pool enquanto esta esperava o lock
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _conninfo(),
+                    **_pool_kwargs(),
+                    # Verifica se a conexão ainda está viva antes de entregá-la
+                    check=ConnectionPool.check_connection,
+                    configure=_configurar_conexao,
+                    name="cpe_enc",
+                    open=True
+                )
+            pool = _pool
+    return pool
+
+
+def close_pool():
+    """Fecha o pool (chamado automaticamente ao final do processo)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(close_pool)
+
+
+@contextmanager
+def get_connection():
+    """
+    Empresta uma conexão do pool dentro de um bloco 'with'.
+    Entrega None se não for possível conectar, no mesmo estilo de get_db_connection().
+    Transações deixadas abertas (ex.: apenas SELECTs) são desfeitas na devolução.
+    """
+    try:
+        pool = get_pool()
+        inicio = time.perf_counter()
+        conn = pool.getconn()
+        instrumentacao.registrar_espera(time.perf_counter() - inicio)
+    except (PoolTimeout, psycopg.OperationalError) as e:
+        print(f"Erro ao conectar ao banco de dados: {e}")
+        yield None
+        return
+
+    try:
+        yield conn
+    finally:
+        try:
+            if not conn.closed and conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+                conn.rollback()
+        except psycopg.Error:
+            # Ex.: conexão caiu no meio da transação; o pool descarta a conexão quebrada
+            pass
+        finally:
+            # Sempre devolve, senão a vaga do pool se perde e as próximas chamadas esgotam o timeout
+            pool.putconn(conn)
+
+
+async def get_async_pool():
+    """
+    Versão assíncrona de get_pool(), usada pelo pacote crud.aio.
+    O pool é aberto no event loop em que for chamado pela primeira vez.
+    """
+    global _async_pool
+    pool = _async_pool
+    if pool is None:
+        # Só a construção fica sob o lock (sem await dentro), cobrindo event loops em threads diferentes
+        with _pool_lock:
+            if _async_pool is None:
+                _async_pool = AsyncConnectionPool(
+                    _conninfo(),
+                    **_pool_kwargs(),
+                    check=AsyncConnectionPool.check_connection,
+                    configure=_configurar_conexao_async,
+                    name="cpe_enc_async",
+                    open=False
+                )
+            pool = _async_pool
+    # open() é idempotente: corrotinas concorrentes aguardam a mesma abertura
+    await pool.open()
+    return pool
+
+
+async def close_async_pool():
+    """Fecha o pool assíncrono; deve ser aguardado antes de encerrar o event loop."""
+    global _async_pool
+    with _pool_lock:
+        pool, _async_pool = _async_pool, None
+    if pool is not None:
+        await pool.close()
+
+
+@asynccontextmanager
+async def get_async_connection():
+    """Equivalente assíncrono de get_connection()."""
+    try:
+        pool = await get_async_pool()
+        inicio = time.perf_counter()
+        conn = await pool.getconn()
+        instrumentacao.registrar_espera(time.perf_counter() - inicio)
+    except (PoolTimeout, psycopg.OperationalError) as e:
+        print(f"Erro ao conectar ao banco de dados: {e}")
+        yield None
+        return
+
+    try:
+        yield conn
+    finally:
+        try:
+            if not conn.closed and conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+                await conn.rollback()
+        except psycopg.Error:
+            # Ex.: conexão caiu no meio da transação; o pool descarta a conexão quebrada
+            pass
+        finally:
+            # Sempre devolve, senão a vaga do pool se perde e as próximas chamadas esgotam o timeout
+            await pool.putconn(conn)
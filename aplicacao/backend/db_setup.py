@@ -1,15 +1,26 @@
 from db_config import get_db_connection
+import area_cache
+import cache_entidades
+import dados_sinteticos
+import report_views
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+MIGRATIONS_DIR = 'migrations'
 
 def execute_sql_from_file(filepath):
+    """Executa um script SQL numa transação. Retorna True se ele foi aplicado."""
     if not os.path.exists(filepath):
         print(f"Arquivo '{filepath}' não encontrado.")
-        return
+        return False
 
     conn = get_db_connection()
     if not conn:
         print("Erro: não foi possível conectar ao banco de dados.")
-        return
+        return False
 
     try:
         with conn.cursor() as cur, open(filepath, 'r', encoding='utf-8') as f:
@@ -17,24 +28,210 @@ def execute_sql_from_file(filepath):
 
             if not sql_script:
                 print(f"O arquivo '{filepath}' está vazio.")
-                return
+                return False
 
             cur.execute(sql_script)
         conn.commit()
         print(f"Script '{filepath}' executado com sucesso.")
+        return True
     except Exception as e:
         print(f" Erro ao executar o script '{filepath}': {e}")
         conn.rollback()
+        return False
     finally:
         conn.close()
 
 def create_tables():
     print("Tentando criar tabelas...")
-    execute_sql_from_file('DDL.sql')
+    # As views dos relatórios e demais objetos derivados vêm das migrações
+    if execute_sql_from_file('DDL.sql'):
+        apply_migrations()
 
 def seed_data():
     print("Tentando popular o banco de dados...")
-    execute_sql_from_file('seed.sql')
+    carregado = execute_sql_from_file('seed.sql')
+    area_cache.invalidar()
+    cache_entidades.limpar()
+    if carregado:
+        # Sem isto os relatórios continuariam lendo as views vazias da criação
+        report_views.atualizar_views(concurrently=False)
+
+def apply_migrations():
+    """Executa, em ordem de nome, os scripts da pasta 'migrations' (todos idempotentes)."""
+    print("Aplicando migrações...")
+    if not os.path.isdir(MIGRATIONS_DIR):
+        print(f"Pasta '{MIGRATIONS_DIR}' não encontrada.")
+        return
+
+    for nome in sorted(os.listdir(MIGRATIONS_DIR)):
+        if nome.endswith('.sql'):
+            execute_sql_from_file(os.path.join(MIGRATIONS_DIR, nome))
+
+def _chaves_estrangeiras(cur):
+    cur.execute(
+        """
+        SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE contype = 'f' AND connamespace = 'cpe_enc'::regnamespace
+        ORDER BY conrelid::regclass::text, conname;
+        """
+    )
+    return cur.fetchall()
+
+
+def _carregar_tabela(tabela, plano, semente, data_base, tamanho_lote):
+    """
+    Gera e envia uma tabela via COPY, bloco a bloco, numa conexão própria
+    (roda num processo do pool). TRUNCATE e COPY na mesma transação permitem o FREEZE.
+    """
+    colunas = dados_sinteticos.TABELAS[tabela][0]
+    conn = get_db_connection()
+    if not conn:
+        # Propaga para seed_scaled, que trata a falha como a de qualquer outra tabela
+        raise RuntimeError("não foi possível conectar ao banco de dados")
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET synchronous_commit = off;")
+            # Os gatilhos de candidatura (rollup e posições das vagas) ficam inertes; seed_scaled recalcula no final
+            cur.execute("SET cpe_enc.rollup_desativada = on;")
+            cur.execute(f"TRUNCATE cpe_enc.{tabela};")
+            linhas = 0
+            with cur.copy(f"COPY cpe_enc.{tabela} ({', '.join(colunas)}) FROM STDIN WITH (FREEZE)") as copy:
+                for bloco in dados_sinteticos.blocos(tabela, plano, semente, data_base, tamanho_lote):
+                    copy.write(bloco)
+                    linhas += bloco.count("\n")
+        conn.commit()
+        return linhas
+    finally:
+        conn.close()
+
+
+def _restaurar_chaves(truncar, chaves):
+    """
+    Recria as chaves estrangeiras removidas por uma carga que falhou, numa conexão
+    e transação novas. As tabelas são esvaziadas antes, pois os dados parciais podem
+    não satisfazer as chaves.
+    """
+    conn = get_db_connection()
+    try:
+        if not conn:
+            raise RuntimeError("não foi possível conectar ao banco de dados")
+        with conn.cursor() as cur:
+            cur.execute(f"TRUNCATE {truncar};")
+            for tabela, nome, definicao in chaves:
+                cur.execute(f'ALTER TABLE {tabela} ADD CONSTRAINT "{nome}" {definicao};')
+        conn.commit()
+        print("Chaves estrangeiras recriadas; as tabelas carregadas foram esvaziadas.")
+    except Exception as e:
+        print(f"Erro ao recriar as chaves estrangeiras: {e}. Recrie-as manualmente com:")
+        for tabela, nome, definicao in chaves:
+            print(f'  ALTER TABLE {tabela} ADD CONSTRAINT "{nome}" {definicao};')
+    finally:
+        if conn:
+            conn.close()
+
+
+def seed_scaled(n_users, semente=42, tamanho_lote=50_000, proporcao_professores=0.1,
+                projetos_por_professor=3, data_base=None, processos=None):
+    """
+    Substitui os dados do esquema cpe_enc por dados sintéticos para n_users usuários
+    (ver dados_sinteticos). Mesma semente e data_base geram exatamente os mesmos dados.
+
+    As chaves estrangeiras são removidas durante a carga e recriadas no final (o que
+    valida todas de uma vez), e cada tabela é carregada por COPY num processo próprio.
+    Retorna {tabela: linhas inseridas}, ou None em caso de erro.
+    """
+    data_base = data_base or date.today()
+    plano = dados_sinteticos.planejar(n_users, proporcao_professores, projetos_por_professor)
+    tabelas = list(dados_sinteticos.TABELAS)
+    processos = processos or min(len(tabelas), os.cpu_count() or 1)
+    print(f"Gerando {plano['usuarios']} usuários ({plano['professores']} professores, "
+          f"{plano['alunos']} alunos) e {plano['projetos']} projetos...")
+
+    conn = get_db_connection()
+    if not conn:
+        print("Erro: não foi possível conectar ao banco de dados.")
+        return None
+
+    inicio = time.perf_counter()
+    linhas = {}
+    chaves_removidas = False
+    try:
+        with conn.cursor() as cur:
+            chaves = _chaves_estrangeiras(cur)
+            cur.execute("SELECT to_regclass('cpe_enc.candidatura_diaria') IS NOT NULL, "
+                        "to_regprocedure('cpe_enc.recalcular_posicoes_preenchidas()') IS NOT NULL;")
+            com_rollup, com_contador = cur.fetchone()
+            # CASCADE esvazia também as tabelas derivadas das migrations (rollup de
+            # candidaturas, recomendações), que referenciam as tabelas carregadas
+            truncar = f"{', '.join('cpe_enc.' + t for t in tabelas)} CASCADE"
+            cur.execute(f"TRUNCATE {truncar};")
+            for tabela, nome, _ in chaves:
+                cur.execute(f'ALTER TABLE {tabela} DROP CONSTRAINT "{nome}";')
+        conn.commit()
+        chaves_removidas = True
+
+        erro = None
+        contexto = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as executor:
+            futuros = {executor.submit(_carregar_tabela, t, plano, semente, data_base, tamanho_lote): t
+                       for t in tabelas}
+            for futuro in as_completed(futuros):
+                tabela = futuros[futuro]
+                try:
+                    linhas[tabela] = futuro.result()
+                    print(f"  {tabela}: {linhas[tabela]} linhas ({time.perf_counter() - inicio:.1f}s)")
+                except Exception as e:
+                    erro = erro or e
+                    print(f"Erro ao carregar '{tabela}': {e}")
+
+        with conn.cursor() as cur:
+            if erro:
+                # Não deixa o esquema com dados parciais
+                cur.execute(f"TRUNCATE {truncar};")
+            else:
+                # Derivados mantidos por gatilhos, desligados durante a carga (migrations/003 e 005)
+                if com_rollup:
+                    cur.execute("SELECT cpe_enc.recalcular_candidatura_diaria();")
+                if com_contador:
+                    cur.execute("SELECT cpe_enc.recalcular_posicoes_preenchidas();")
+            for tabela, nome, definicao in chaves:
+                cur.execute(f'ALTER TABLE {tabela} ADD CONSTRAINT "{nome}" {definicao};')
+            for tabela, (_, _, serial) in dados_sinteticos.TABELAS.items():
+                if serial:
+                    cur.execute(
+                        f"SELECT setval(pg_get_serial_sequence('cpe_enc.{tabela}', '{serial}'), "
+                        f"COALESCE((SELECT MAX({serial}) FROM cpe_enc.{tabela}), 0) + 1, false);"
+                    )
+        conn.commit()
+        chaves_removidas = False
+        if erro:
+            return None
+
+        # ANALYZE fora da transação, para o planejador enxergar os novos volumes
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            for tabela in tabelas + (["candidatura_diaria"] if com_rollup else []):
+                cur.execute(f"ANALYZE cpe_enc.{tabela};")
+            cur.execute("SELECT to_regclass('cpe_enc.mv_popularidade_areas') IS NOT NULL;")
+            views_existem = cur.fetchone()[0]
+    except Exception as e:
+        print(f"Erro ao gerar os dados sintéticos: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+        if chaves_removidas:
+            # Uma falha depois do DROP não pode deixar o esquema sem as chaves estrangeiras
+            _restaurar_chaves(truncar, chaves)
+
+    area_cache.invalidar()
+    cache_entidades.limpar()
+    if views_existem:
+        report_views.atualizar_views(concurrently=False)
+    print(f"Dados sintéticos gerados em {time.perf_counter() - inicio:.1f}s.")
+    return linhas
+
 
 def drop_all_tables():
     print("ATENÇÃO: Esta ação irá apagar todos os dados permanentemente.")
@@ -51,6 +248,8 @@ def drop_all_tables():
                 cur.execute("DROP SCHEMA IF EXISTS cpe_enc CASCADE;")
             conn.commit()
             print("Todas as tabelas foram apagadas com sucesso.")
+            area_cache.invalidar()
+            cache_entidades.limpar()
         except Exception as e:
             print(f"Erro ao apagar as tabelas: {e}")
             conn.rollback()
@@ -0,0 +1,111 @@
+"""
+Notificação simples, dentro do processo, de alterações feitas pelo CRUD.
+
+Módulos que mantêm dados derivados em memória (ex.: similaridade) assinam um
+tópico e são avisados com a chave do registro alterado, sem que o CRUD precise
+conhecê-los.
+
+Para alcançar outros processos, o CRUD também chama notificar(cur, topico, chave)
+dentro da transação da escrita: o Postgres só entrega o NOTIFY após o commit.
+escutar_banco() inicia uma thread que faz LISTEN no canal e republica aqui os
+eventos vindos de outros processos (os do próprio processo são ignorados, pois
+já foram publicados localmente). Ao (re)conectar, publica RECONECTADO, já que
+notificações podem ter sido perdidas enquanto a escuta estava fora do ar.
+"""
+import os
+import time
+import uuid
+import threading
+from collections import defaultdict
+
+import psycopg
+from psycopg import sql
+
+CANAL = os.getenv("EVENTOS_CANAL", "cpe_enc_eventos")
+RECONECTADO = "_reconectado"
+
+_assinantes = defaultdict(list)
+_lock = threading.Lock()
+_origem = uuid.uuid4().hex[:12]
+_escuta = None
+
+
+def assinar(topico, callback):
+    """Registra callback(chave) para ser chamado a cada publicar(topico, chave)."""
+    with _lock:
+        if callback not in _assinantes[topico]:
+            _assinantes[topico].append(callback)
+
+
+def cancelar(topico, callback):
+    with _lock:
+        if callback in _assinantes[topico]:
+            _assinantes[topico].remove(callback)
+
+
+def publicar(topico, chave):
+    """Avisa os assinantes de que o registro 'chave' do tópico foi criado, alterado ou removido."""
+    with _lock:
+        callbacks = list(_assinantes[topico])
+    for callback in callbacks:
+        try:
+            callback(chave)
+        except Exception as e:
+            print(f"Erro ao processar evento '{topico}' ({chave}): {e}")
+
+
+def notificar(cur, topico, chave):
+    """
+    Envia o evento aos outros processos via NOTIFY, na transação de 'cur'.
+    Devolve o resultado de cur.execute, então também funciona com cursores assíncronos.
+    """
+    return cur.execute("SELECT pg_notify(%s, %s);", (CANAL, f"{_origem}:{topico}:{chave}"), prepare=True)
+
+
+def notificar_varios(cur, topico, chaves):
+    """Como notificar(), para várias chaves num único comando."""
+    return cur.execute(
+        "SELECT pg_notify(%s, %s || ':' || chave) FROM unnest(%s::text[]) AS chave;",
+        (CANAL, f"{_origem}:{topico}", [str(c) for c in chaves]), prepare=True
+    )
+
+
+def _receber(payload):
+    origem, topico, chave = payload.split(":", 2)
+    if origem == _origem:
+        return
+    publicar(topico, int(chave) if chave.isdigit() else chave)
+
+
+def _escutar():
+    # Import tardio: db_config carrega o pool e o .env, desnecessários para quem só publica
+    from db_config import get_db_connection
+
+    while True:
+        conn = get_db_connection()
+        if not conn:
+            time.sleep(5)
+            continue
+        try:
+            conn.autocommit = True
+            conn.execute(sql.SQL("LISTEN {};").format(sql.Identifier(CANAL)))
+            publicar(RECONECTADO, None)
+            for notificacao in conn.notifies():
+                try:
+                    _receber(notificacao.payload)
+                except ValueError:
+                    print(f"Evento mal formado ignorado: {notificacao.payload!r}")
+        except psycopg.Error as e:
+            print(f"Escuta de eventos do banco interrompida, reconectando: {e}")
+            time.sleep(1)
+        finally:
+            conn.close()
+
+
+def escutar_banco():
+    """Inicia (uma única vez por processo) a thread que recebe os eventos de outros processos."""
+    global _escuta
+    with _lock:
+        if _escuta is None:
+            _escuta = threading.Thread(target=_escutar, name="eventos-listen", daemon=True)
+            _escuta.start()
@@ -0,0 +1,140 @@
+"""
+Exportação dos dados dos relatórios gerenciais em Parquet, Arrow IPC ou CSV.
+
+Cada consulta de report_views.CONSULTAS_RELATORIOS é lida com um cursor
+nomeado (server-side) e gravada em lotes de 'tamanho_lote' linhas: cada lote
+vira um RecordBatch (Parquet/Arrow) ou um bloco de linhas (CSV), sem montar um
+DataFrame com o resultado inteiro. Os arquivos ficam ao lado dos gráficos
+(consultaN.parquet, consultaN.arrow, consultaN.csv).
+
+O formato Arrow IPC é gravado sem compressão, para que possa ser lido com
+memory mapping, por exemplo:
+    pyarrow.ipc.open_file(pyarrow.memory_map("imagens/consulta1.arrow")).read_all()
+
+pyarrow só é necessário para Parquet e Arrow; CSV usa apenas a biblioteca padrão.
+Este módulo não importa pandas/matplotlib.
+"""
+import os
+import csv
+import time
+import psycopg
+from psycopg import postgres
+from db_config import get_connection
+from report_views import CONSULTAS_RELATORIOS
+
+PASTA = "imagens"  # a mesma de reports.OUTPUT_DIR
+FORMATOS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+TAMANHO_LOTE = 50_000
+
+
+def _tipo_arrow(pa, type_code):
+    """Tipo Arrow e conversor de valores para o tipo Postgres de uma coluna."""
+    info = postgres.types.get(type_code)
+    nome = info.name if info else None
+    tipos = {
+        "int2": pa.int16(), "int4": pa.int32(), "int8": pa.int64(),
+        "float4": pa.float32(), "float8": pa.float64(), "bool": pa.bool_(),
+        "date": pa.date32(), "timestamp": pa.timestamp("us"), "timestamptz": pa.timestamp("us", tz="UTC"),
+        "text": pa.string(), "varchar": pa.string(), "bpchar": pa.string(), "name": pa.string(),
+    }
+    if nome in tipos:
+        return tipos[nome], None
+    if nome == "numeric":
+        return pa.float64(), float
+    return pa.string(), str
+
+
+def _escrever_arrow(cur, caminho, formato, tamanho_lote):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("pyarrow não está instalado (necessário para Parquet e Arrow).")
+
+    campos = [(d.name, *_tipo_arrow(pa, d.type_code)) for d in cur.description]
+    schema = pa.schema([(nome, tipo) for nome, tipo, _ in campos])
+    if formato == "parquet":
+        escritor = pq.ParquetWriter(caminho, schema, compression="zstd")
+
+        def gravar(lote):
+            escritor.write_table(pa.Table.from_batches([lote]))
+    else:
+        escritor = pa.ipc.new_file(caminho, schema)
+        gravar = escritor.write_batch
+
+    linhas = 0
+    try:
+        while registros := cur.fetchmany(tamanho_lote):
+            colunas = []
+            for valores, (_, tipo, converter) in zip(zip(*registros), campos):
+                if converter:
+                    valores = [None if v is None else converter(v) for v in valores]
+                colunas.append(pa.array(valores, type=tipo))
+            gravar(pa.RecordBatch.from_arrays(colunas, schema=schema))
+            linhas += len(registros)
+    finally:
+        escritor.close()
+    return linhas
+
+
+def _escrever_csv(cur, caminho, tamanho_lote):
+    linhas = 0
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(d.name for d in cur.description)
+        while registros := cur.fetchmany(tamanho_lote):
+            escritor.writerows(registros)
+            linhas += len(registros)
+    return linhas
+
+
+def exportar(id_relatorio, formato="parquet", pasta=PASTA, tamanho_lote=TAMANHO_LOTE):
+    """
+    Grava os dados do relatório 'id_relatorio' em pasta/consultaN.<formato> e
+    retorna o caminho (ou None em caso de erro). O arquivo é escrito com nome
+    temporário e renomeado no final, então leitores nunca veem um arquivo parcial.
+    """
+    if formato not in FORMATOS:
+        print(f"Formato inválido: {formato}. Use um de: {', '.join(FORMATOS)}.")
+        return None
+
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"consulta{id_relatorio}{FORMATOS[formato]}")
+    temporario = caminho + ".tmp"
+
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+
+        inicio = time.perf_counter()
+        try:
+            with conn.cursor(name=f"exportacao_{id_relatorio}") as cur:
+                cur.itersize = tamanho_lote
+                cur.execute(CONSULTAS_RELATORIOS[id_relatorio])
+                if formato == "csv":
+                    linhas = _escrever_csv(cur, temporario, tamanho_lote)
+                else:
+                    linhas = _escrever_arrow(cur, temporario, formato, tamanho_lote)
+            conn.commit()
+            os.replace(temporario, caminho)
+        except (psycopg.Error, RuntimeError, OSError) as e:
+            conn.rollback()
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            print(f"Erro ao exportar os dados do relatório {id_relatorio}: {e}")
+            return None
+
+    print(f"Dados do relatório {id_relatorio} exportados em: {caminho} "
+          f"({linhas} linhas, {time.perf_counter() - inicio:.2f}s)")
+    return caminho
+
+
+def exportar_todos(formato="parquet", ids=None, pasta=PASTA, tamanho_lote=TAMANHO_LOTE):
+    """Exporta os relatórios indicados (todos, por padrão) e retorna {id: caminho}."""
+    caminhos = {}
+    for id_relatorio in ids or CONSULTAS_RELATORIOS:
+        caminho = exportar(id_relatorio, formato, pasta, tamanho_lote)
+        if caminho:
+            caminhos[id_relatorio] = caminho
+    return caminhos
@@ -0,0 +1,242 @@
+"""
+Instrumentação das consultas ao banco.
+
+Os pools de db_config configuram cada conexão com os cursores deste módulo,
+então tudo o que passa por get_connection()/get_async_connection() (crud,
+reports, ai_assistant, caches) é medido sem alterar quem chama:
+
+- histograma de latência, total de linhas e erros por consulta (texto normalizado);
+- tempo de espera por uma conexão do pool;
+- log de consultas lentas (acima de INSTR_LIMITE_LENTA_MS) em JSON Lines, com
+  captura opcional do plano por EXPLAIN (ANALYZE, BUFFERS) quando INSTR_EXPLAIN=1.
+  O EXPLAIN ANALYZE executa a consulta de novo, por isso só é feito para SELECTs
+  (inclusive com WITH) sem comandos que alteram dados, num savepoint somente
+  leitura que é sempre desfeito.
+
+resumo() devolve as estatísticas e exportar_json() as grava em arquivo.
+"""
+import os
+import re
+import json
+import time
+import threading
+from collections import deque
+from datetime import datetime
+
+import psycopg
+
+INSTR_DESATIVADO = os.getenv("INSTR_DESATIVADO", "0") == "1"
+LIMITE_LENTA_MS = float(os.getenv("INSTR_LIMITE_LENTA_MS", "200"))
+CAPTURAR_EXPLAIN = os.getenv("INSTR_EXPLAIN", "0") == "1"
+LOG_LENTAS = os.getenv("INSTR_LOG_LENTAS", os.path.join(".cache", "consultas_lentas.jsonl"))
+
+# Limites superiores (ms) das faixas do histograma; a última faixa é "acima de 5000"
+FAIXAS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+_lock = threading.Lock()
+_consultas = {}
+_espera = None
+_lentas = deque(maxlen=50)
+_ESPACOS = re.compile(r"\s+")
+_LEITURA = re.compile(r"\s*(SELECT|WITH)\b", re.IGNORECASE)
+# Comandos que alteram dados, inclusive dentro de um WITH, e SELECT ... INTO / FOR UPDATE
+_ESCRITA = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE|INTO|COPY|NEXTVAL|SETVAL)\b", re.IGNORECASE)
+
+
+def _nova_metrica():
+    return {"n": 0, "total_ms": 0.0, "max_ms": 0.0, "linhas": 0, "erros": 0, "faixas": [0] * len(FAIXAS_MS)}
+
+
+def _acumular(metrica, ms):
+    metrica["n"] += 1
+    metrica["total_ms"] += ms
+    metrica["max_ms"] = max(metrica["max_ms"], ms)
+    for i, limite in enumerate(FAIXAS_MS):
+        if ms <= limite:
+            metrica["faixas"][i] += 1
+            break
+
+
+def _texto(query, cur):
+    if isinstance(query, bytes):
+        query = query.decode()
+    elif not isinstance(query, str):
+        try:
+            query = query.as_string(cur)
+        except Exception:
+            query = str(query)
+    return _ESPACOS.sub(" ", query).strip()
+
+
+def registrar_consulta(sql, ms, linhas=None, erro=False):
+    with _lock:
+        metrica = _consultas.get(sql)
+        if metrica is None:
+            metrica = _consultas[sql] = _nova_metrica()
+        _acumular(metrica, ms)
+        if linhas is not None and linhas > 0:
+            metrica["linhas"] += linhas
+        if erro:
+            metrica["erros"] += 1
+
+
+def registrar_espera(segundos):
+    """Tempo gasto aguardando uma conexão do pool (chamado por db_config)."""
+    global _espera
+    with _lock:
+        if _espera is None:
+            _espera = _nova_metrica()
+        _acumular(_espera, segundos * 1000)
+
+
+def _somente_leitura(sql):
+    return bool(_LEITURA.match(sql)) and not _ESCRITA.search(sql)
+
+
+def _explain(cur, sql, params):
+    if not CAPTURAR_EXPLAIN or not _somente_leitura(sql):
+        return None
+    try:
+        # Cursor comum (não instrumentado), dentro de um savepoint sempre desfeito e
+        # somente leitura: uma falha aqui não aborta a transação de quem fez a consulta,
+        # e o que escapar do filtro acima (ex.: uma função que grava) é recusado pelo
+        # servidor. ClientCursor porque EXPLAIN não aceita parâmetros do protocolo.
+        with cur.connection.transaction(force_rollback=True), psycopg.ClientCursor(cur.connection) as explain:
+            explain.execute("SET LOCAL transaction_read_only = on;")
+            explain.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+            return "\n".join(linha[0] for linha in explain.fetchall())
+    except psycopg.Error as e:
+        return f"EXPLAIN falhou: {e}"
+
+
+def _registrar_lenta(sql, ms, linhas, plano):
+    entrada = {
+        "quando": datetime.now().isoformat(timespec="seconds"),
+        "ms": round(ms, 3),
+        "linhas": linhas,
+        "sql": sql,
+        "plano": plano,
+    }
+    with _lock:
+        _lentas.append(entrada)
+        try:
+            pasta = os.path.dirname(LOG_LENTAS)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            with open(LOG_LENTAS, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Erro ao gravar o log de consultas lentas: {e}")
+
+
+def _depois(cur, query, params, inicio, erro, servidor=False):
+    ms = (time.perf_counter() - inicio) * 1000
+    sql = _texto(query, cur)
+    linhas = None if erro or servidor else cur.rowcount
+    registrar_consulta(sql, ms, linhas, erro)
+    if not erro and ms >= LIMITE_LENTA_MS:
+        _registrar_lenta(sql, ms, linhas, None if servidor else _explain(cur, sql, params))
+
+
+class CursorInstrumentado(psycopg.Cursor):
+    def execute(self, query, params=None, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            resultado = super().execute(query, params, **kwargs)
+        except Exception:
+            _depois(self, query, params, inicio, erro=True)
+            raise
+        _depois(self, query, params, inicio, erro=False)
+        return resultado
+
+
+class ServerCursorInstrumentado(psycopg.ServerCursor):
+    """Cursores nomeados: mede só a abertura (DECLARE); as linhas vêm depois, aos lotes."""
+
+    def execute(self, query, params=None, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            resultado = super().execute(query, params, **kwargs)
+        except Exception:
+            _depois(self, query, params, inicio, erro=True, servidor=True)
+            raise
+        _depois(self, query, params, inicio, erro=False, servidor=True)
+        return resultado
+
+
+class AsyncCursorInstrumentado(psycopg.AsyncCursor):
+    async def execute(self, query, params=None, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            resultado = await super().execute(query, params, **kwargs)
+        except Exception:
+            _depois(self, query, params, inicio, erro=True, servidor=True)
+            raise
+        # Sem EXPLAIN no cursor assíncrono: _explain usa um cursor síncrono
+        _depois(self, query, params, inicio, erro=False, servidor=True)
+        return resultado
+
+
+def configurar(conn):
+    """Instala os cursores instrumentados numa conexão (chamado pelos pools de db_config)."""
+    if INSTR_DESATIVADO:
+        return
+    if isinstance(conn, psycopg.AsyncConnection):
+        conn.cursor_factory = AsyncCursorInstrumentado
+    else:
+        conn.cursor_factory = CursorInstrumentado
+        conn.server_cursor_factory = ServerCursorInstrumentado
+
+
+def _percentil_faixas(metrica, p):
+    """Percentil aproximado pelo histograma: limite superior da faixa que o contém."""
+    alvo = metrica["n"] * p / 100
+    acumulado = 0
+    for limite, quantidade in zip(FAIXAS_MS, metrica["faixas"]):
+        acumulado += quantidade
+        if acumulado >= alvo and quantidade:
+            return min(limite, metrica["max_ms"])
+    return metrica["max_ms"]
+
+
+def _resumir(metrica):
+    return {
+        "n": metrica["n"],
+        "total_ms": round(metrica["total_ms"], 3),
+        "media_ms": round(metrica["total_ms"] / metrica["n"], 3) if metrica["n"] else 0.0,
+        "p50_ms": _percentil_faixas(metrica, 50),
+        "p95_ms": _percentil_faixas(metrica, 95),
+        "p99_ms": _percentil_faixas(metrica, 99),
+        "max_ms": round(metrica["max_ms"], 3),
+        "linhas": metrica["linhas"],
+        "erros": metrica["erros"],
+        "histograma": {("+inf" if limite == float("inf") else f"<={limite}"): quantidade
+                       for limite, quantidade in zip(FAIXAS_MS, metrica["faixas"])},
+    }
+
+
+def resumo():
+    """Estatísticas do processo atual, com as consultas ordenadas pelo tempo total."""
+    with _lock:
+        consultas = sorted(_consultas.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        return {
+            "gerado_em": datetime.now().isoformat(timespec="seconds"),
+            "limite_lenta_ms": LIMITE_LENTA_MS,
+            "consultas": [{"sql": sql, **_resumir(m)} for sql, m in consultas],
+            "espera_conexao": _resumir(_espera) if _espera else None,
+            "lentas": list(_lentas),
+        }
+
+
+def exportar_json(caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resumo(), f, ensure_ascii=False, indent=2)
+    return caminho
+
+
+def zerar():
+    global _espera
+    with _lock:
+        _consultas.clear()
+        _lentas.clear()
+        _espera = None
@@ -2,14 +2,18 @@ import os
 import sys
 from typing import Dict, Callable, Any
 from tabulate import tabulate
+import psycopg
 
 from crud import aluno_crud
 from crud import professor_crud
 from crud import projeto_crud
-import reports
+from crud import candidatura_crud
+from crud import exclusao
+import report_views
+import instrumentacao
+import cache_entidades
 import db_setup
-import ai_assistant
-from db_config import get_db_connection
+from db_config import get_connection
 
 
 def clear_screen():
@@ -20,6 +24,72 @@ def pause():
     input("\nPressione Enter para continuar...")
 
 
+def listar_paginado(buscar_pagina, chave, headers, linha, vazio, tamanho_pagina=20):
+    """
+    Exibe uma listagem página por página.
+    'buscar_pagina(limite, apos)' é uma das funções *_page do pacote crud e
+    'chave(registro)' devolve a chave de paginação do último registro exibido.
+    """
+    apos = None
+    exibiu_algum = False
+
+    while True:
+        registros = buscar_pagina(tamanho_pagina, apos)
+        if not registros:
+            break
+
+        exibiu_algum = True
+        print(tabulate([linha(r) for r in registros], headers=headers, tablefmt="grid"))
+
+        if len(registros) < tamanho_pagina:
+            break
+        if input("Enter para a próxima página ou 'q' para parar: ").lower() == 'q':
+            break
+        apos = chave(registros[-1])
+
+    if not exibiu_algum:
+        print(vazio)
+
+
+def ler_ids(mensagem):
+    """Lê uma lista de IDs separados por vírgula. Retorna None se algum não for número."""
+    try:
+        return [int(i) for i in input(mensagem).split(",") if i.strip()]
+    except ValueError:
+        print("IDs inválidos. Use apenas números separados por vírgula.")
+        return None
+
+
+def excluir_em_lote(rotulo, previa, excluir, limite_exibicao=20):
+    """Mostra quantas linhas dependentes cada alvo levaria junto e, se confirmado, exclui em lotes."""
+    ids = ler_ids(f"IDs dos {rotulo}s (separados por vírgula): ")
+    if not ids:
+        return
+
+    alvos = previa(ids)
+    if alvos is None:
+        return
+    if not alvos:
+        print(f"Nenhum {rotulo} encontrado com os IDs informados.")
+        return
+
+    print(f"\nLinhas que seriam excluídas em cascata (mostrando {min(len(alvos), limite_exibicao)} "
+          f"de {len(alvos)}):")
+    print(tabulate(alvos[:limite_exibicao], headers="keys", tablefmt="grid"))
+    dependentes = [k for k in alvos[0] if k not in ("id", "nome")]
+    print("Total: " + ", ".join(f"{t}={sum(a[t] for a in alvos)}" for t in dependentes))
+
+    if input(f"Excluir {len(alvos)} {rotulo}(s)? Esta ação é irreversível. (s/n): ").lower() != 's':
+        print("Operação cancelada.")
+        return
+
+    resultado = excluir([a["id"] for a in alvos])
+    if resultado:
+        print(f"{resultado['excluidos']} {rotulo}(s) excluído(s) em {resultado['lotes']} lote(s).")
+        if resultado["falhas"]:
+            print(f"{len(resultado['falhas'])} lote(s) falharam e não foram excluídos.")
+
+
 def gerenciar_alunos():
     def _create_aluno_interactive():
         print("\n--- Criar Novo Aluno ---")
@@ -33,14 +103,13 @@ def gerenciar_alunos():
 
     def _list_alunos_interactive():
         print("\n--- Listar Alunos ---")
-        alunos = aluno_crud.get_all_alunos()
-        if alunos:
-            headers = ["ID", "Nome Completo", "Email", "Matrícula", "Semestre"]
-            data = [[a['id_usuario'], a['nome_completo'], a['email'], a['matricula'],
-                     a['semestre']] for a in alunos]
-            print(tabulate(data, headers=headers, tablefmt="grid"))
-        else:
-            print("Nenhum aluno cadastrado.")
+        listar_paginado(
+            aluno_crud.get_alunos_page,
+            chave=lambda a: (a['nome_completo'], a['id_usuario']),
+            headers=["ID", "Nome Completo", "Email", "Matrícula", "Semestre"],
+            linha=lambda a: [a['id_usuario'], a['nome_completo'], a['email'], a['matricula'], a['semestre']],
+            vazio="Nenhum aluno cadastrado."
+        )
 
     def _update_aluno_interactive():
         print("\n--- Atualizar Aluno ---")
@@ -79,11 +148,37 @@ def gerenciar_alunos():
             return
         aluno_crud.delete_aluno(id_aluno)
 
+    def _recomendar_vagas_interactive():
+        print("\n--- Recomendar Vagas Abertas ---")
+        try:
+            id_aluno = int(input("ID do Aluno: "))
+        except ValueError:
+            print("ID inválido. Por favor, insira um número.")
+            return
+        # Importado só aqui: numpy e pandas pesam no tempo de abertura do menu
+        import recomendacao_vagas
+        vagas = recomendacao_vagas.vagas_recomendadas(id_aluno)
+        if not vagas:
+            print("Nenhuma vaga aberta nas áreas dos projetos deste aluno.")
+            return
+        print(tabulate(
+            [(v['id_vaga'], v['titulo_projeto'], v['numero_posicoes'], v['prazo_inscricao'], f"{v['pontuacao']:.0%}")
+             for v in vagas],
+            headers=["ID Vaga", "Projeto", "Posições", "Prazo", "Afinidade"], tablefmt="grid"
+        ))
+
+    def _gerar_recomendacoes_interactive():
+        import recomendacao_vagas
+        recomendacao_vagas.gerar_recomendacoes()
+
     menu_options: Dict[str, Callable] = {
         "1": _create_aluno_interactive,
         "2": _list_alunos_interactive,
         "3": _update_aluno_interactive,
         "4": _delete_aluno_interactive,
+        "5": lambda: excluir_em_lote("aluno", exclusao.previa_exclusao_alunos, exclusao.excluir_alunos),
+        "6": _recomendar_vagas_interactive,
+        "7": _gerar_recomendacoes_interactive,
     }
 
     while True:
@@ -93,6 +188,9 @@ def gerenciar_alunos():
         print("2. Listar Alunos")
         print("3. Atualizar Aluno")
         print("4. Deletar Aluno")
+        print("5. Excluir Alunos em Lote")
+        print("6. Recomendar Vagas Abertas para um Aluno")
+        print("7. Gerar Recomendações de Vagas para Todos os Alunos")
         print("0. Voltar")
 
         choice = input("Escolha uma opção: ")
@@ -121,13 +219,13 @@ def gerenciar_professores():
 
     def _list_professores_interactive():
         print("\n--- Listar Professores ---")
-        professores = professor_crud.get_all_professores()
-        if professores:
-            headers = ["ID", "Nome Completo", "Email", "SIAPE", "Sala"]
-            data = [[p['id_usuario'], p['nome_completo'], p['email'], p['siape'], p['sala']] for p in professores]
-            print(tabulate(data, headers=headers, tablefmt="grid"))
-        else:
-            print("Nenhum professor cadastrado.")
+        listar_paginado(
+            professor_crud.get_professores_page,
+            chave=lambda p: (p['nome_completo'], p['id_usuario']),
+            headers=["ID", "Nome Completo", "Email", "SIAPE", "Sala"],
+            linha=lambda p: [p['id_usuario'], p['nome_completo'], p['email'], p['siape'], p['sala']],
+            vazio="Nenhum professor cadastrado."
+        )
 
     def _update_professor_interactive():
         print("\n--- Atualizar Professor ---")
@@ -213,15 +311,14 @@ def gerenciar_projetos():
 
     def _list_projetos_interactive():
         print("\n--- Listar Projetos ---")
-        projetos = projeto_crud.get_all_projetos()
-        if projetos:
-            headers = ["ID", "Título", "Descrição", "Início", "Fim Previsto", "Status", "Orientador"]
-            data = [[p['id_projeto'], p['titulo'], p['descricao'], p['dt_inicio'], p['dt_fim_prevista'],
-                     p['status'],
-                     p['professor_orientador']] for p in projetos]
-            print(tabulate(data, headers=headers, tablefmt="grid"))
-        else:
-            print("Nenhum projeto cadastrado.")
+        listar_paginado(
+            projeto_crud.get_projetos_page,
+            chave=lambda p: (p['titulo'], p['id_projeto']),
+            headers=["ID", "Título", "Descrição", "Início", "Fim Previsto", "Status", "Orientador"],
+            linha=lambda p: [p['id_projeto'], p['titulo'], p['descricao'], p['dt_inicio'], p['dt_fim_prevista'],
+                             p['status'], p['professor_orientador']],
+            vazio="Nenhum projeto cadastrado."
+        )
 
     def _update_projeto_interactive():
         print("\n--- Atualizar Projeto ---")
@@ -259,6 +356,24 @@ def gerenciar_projetos():
         projeto_crud.update_projeto(id_projeto, titulo, descricao, dt_inicio, dt_fim_prevista, status,
                                      id_professor_orientador)
 
+    def _update_projetos_lote_interactive():
+        print("\n--- Atualizar Projetos em Lote ---")
+        ids = ler_ids("IDs dos projetos (separados por vírgula): ")
+        if not ids:
+            return
+
+        print("Deixe em branco para manter o valor atual de cada projeto.")
+        status = input("Novo Status (Proposto, Em Andamento, Concluido, Cancelado): ") or None
+        id_professor_str = input("Novo ID do Professor Orientador: ")
+        id_professor_orientador = int(id_professor_str) if id_professor_str.isdigit() else None
+
+        campos = {"status": status, "id_professor_orientador": id_professor_orientador}
+        resultados = projeto_crud.update_projetos_bulk([(i, campos) for i in ids])
+        falhas = [r for r in resultados or [] if not r["ok"]]
+        if falhas:
+            print(tabulate([(r["id_projeto"], r["erro"]) for r in falhas],
+                           headers=["ID", "Erro"], tablefmt="grid"))
+
     def _delete_projeto_interactive():
         print("\n--- Deletar Projeto ---")
         try:
@@ -273,6 +388,8 @@ def gerenciar_projetos():
         "2": _list_projetos_interactive,
         "3": _update_projeto_interactive,
         "4": _delete_projeto_interactive,
+        "5": _update_projetos_lote_interactive,
+        "6": lambda: excluir_em_lote("projeto", exclusao.previa_exclusao_projetos, exclusao.excluir_projetos),
     }
 
     while True:
@@ -282,6 +399,94 @@ def gerenciar_projetos():
         print("2. Listar Projetos")
         print("3. Atualizar Projeto")
         print("4. Deletar Projeto")
+        print("5. Atualizar Projetos em Lote")
+        print("6. Excluir Projetos em Lote")
+        print("0. Voltar")
+
+        choice = input("Escolha uma opção: ")
+
+        if choice == '0':
+            break
+
+        action = menu_options.get(choice)
+        if action:
+            action()
+        else:
+            print("Opção inválida.")
+
+        pause()
+
+
+def gerenciar_candidaturas():
+    def _ler_inteiro(mensagem):
+        try:
+            return int(input(mensagem))
+        except ValueError:
+            print("ID inválido. Por favor, insira um número.")
+            return None
+
+    def _exibir(candidaturas, vazio):
+        if not candidaturas:
+            print(vazio)
+            return
+        print(tabulate(
+            [[c['id_candidatura'], c['id_aluno'], c['aluno'], c['id_vaga'], c['projeto'], c['dt_candidatura'],
+              c['status']] for c in candidaturas],
+            headers=["ID", "ID Aluno", "Aluno", "ID Vaga", "Projeto", "Data", "Status"], tablefmt="grid"
+        ))
+
+    def _create_candidatura_interactive():
+        print("\n--- Registrar Candidatura ---")
+        id_aluno = _ler_inteiro("ID do Aluno: ")
+        id_vaga = _ler_inteiro("ID da Vaga: ") if id_aluno is not None else None
+        if id_vaga is not None:
+            candidatura_crud.create_candidatura(id_aluno, id_vaga)
+
+    def _list_por_vaga_interactive():
+        id_vaga = _ler_inteiro("ID da Vaga: ")
+        if id_vaga is not None:
+            _exibir(candidatura_crud.get_candidaturas_by_vaga(id_vaga), "Nenhuma candidatura para esta vaga.")
+
+    def _list_por_aluno_interactive():
+        id_aluno = _ler_inteiro("ID do Aluno: ")
+        if id_aluno is not None:
+            _exibir(candidatura_crud.get_candidaturas_by_aluno(id_aluno), "Nenhuma candidatura deste aluno.")
+
+    def _aprovar_interactive():
+        id_candidatura = _ler_inteiro("ID da Candidatura a ser aprovada: ")
+        if id_candidatura is not None:
+            candidatura_crud.aprovar_candidatura(id_candidatura)
+
+    def _update_status_interactive():
+        id_candidatura = _ler_inteiro("ID da Candidatura: ")
+        if id_candidatura is None:
+            return
+        status = input(f"Novo status ({', '.join(candidatura_crud.STATUS_CANDIDATURA)}): ").strip()
+        candidatura_crud.update_status_candidatura(id_candidatura, status)
+
+    def _delete_candidatura_interactive():
+        id_candidatura = _ler_inteiro("ID da Candidatura a ser deletada: ")
+        if id_candidatura is not None:
+            candidatura_crud.delete_candidatura(id_candidatura)
+
+    menu_options: Dict[str, Callable] = {
+        "1": _create_candidatura_interactive,
+        "2": _list_por_vaga_interactive,
+        "3": _list_por_aluno_interactive,
+        "4": _aprovar_interactive,
+        "5": _update_status_interactive,
+        "6": _delete_candidatura_interactive,
+    }
+
+    while True:
+        clear_screen()
+        print("--- Gerenciar Candidaturas ---")
+        print("1. Registrar Candidatura")
+        print("2. Listar Candidaturas de uma Vaga")
+        print("3. Listar Candidaturas de um Aluno")
+        print("4. Aprovar Candidatura")
+        print("5. Alterar Status de Candidatura")
+        print("6. Deletar Candidatura")
         print("0. Voltar")
 
         choice = input("Escolha uma opção: ")
@@ -304,6 +509,7 @@ def menu_crud():
         "1": gerenciar_alunos,
         "2": gerenciar_professores,
         "3": gerenciar_projetos,
+        "4": gerenciar_candidaturas,
     }
 
     while True:
@@ -312,6 +518,7 @@ def menu_crud():
         print("1. Gerenciar Alunos")
         print("2. Gerenciar Professores")
         print("3. Gerenciar Projetos")
+        print("4. Gerenciar Candidaturas")
         print("0. Voltar ao Menu Principal")
 
         choice = input("Escolha uma opção: ")
@@ -329,43 +536,107 @@ def menu_crud():
 
 def menu_relatorios():
     """Exibe o menu de relatórios gerenciais e gera os gráficos."""
-    conn = get_db_connection()
-    if not conn:
-        print("\nErro: Não foi possível conectar ao banco de dados.")
-        pause()
-        return
+    # Importado só aqui: pandas, seaborn e matplotlib levam segundos para carregar
+    import reports
+
+    if not os.path.exists(reports.OUTPUT_DIR):
+        os.makedirs(reports.OUTPUT_DIR)
+        print(f"Pasta '{reports.OUTPUT_DIR}' criada para salvar relatórios.")
 
     menu_actions: Dict[str, Callable] = {
-        "1": lambda: reports.gerar_grafico_consulta1(conn),
-        "2": lambda: reports.gerar_grafico_consulta2(conn),
-        "3": lambda: reports.gerar_grafico_consulta3(conn),
+        "1": reports.gerar_grafico_consulta1,
+        "2": reports.gerar_grafico_consulta2,
+        "3": reports.gerar_grafico_consulta3,
     }
 
-    try:
-        while True:
-            clear_screen()
-            print("--- Menu de Relatórios Gerenciais ---")
-            print("1. Popularidade das Áreas por Engajamento de Alunos")
-            print("2. Ranking de Professores por Volume de Projetos Ativos")
-            print("3. Distribuição de Vagas Abertas por Projeto")
-            print("0. Voltar")
+    while True:
+        clear_screen()
+        # Indicador de defasagem: os relatórios leem de views materializadas
+        idades = report_views.idade_dos_dados()
+
+        def _idade(opcao):
+            return report_views.formatar_idade(idades.get(report_views.VIEWS_RELATORIOS[opcao]))
+
+        print("--- Menu de Relatórios Gerenciais ---")
+        print(f"1. Popularidade das Áreas por Engajamento de Alunos [{_idade('1')}]")
+        print(f"2. Ranking de Professores por Volume de Projetos Ativos [{_idade('2')}]")
+        print(f"3. Distribuição de Vagas Abertas por Projeto [{_idade('3')}]")
+        print("4. Atualizar dados dos relatórios agora")
+        print("5. Gerar todos os relatórios (em paralelo)")
+        print("6. Exportar dados dos relatórios (Parquet/Arrow/CSV)")
+        print("7. Gerar pacotes de relatórios por professor")
+        print("8. Candidaturas por dia/semana por projeto e área [tempo real]")
+        print("0. Voltar")
+
+        choice = input("Escolha uma opção: ")
 
-            choice = input("Escolha uma opção: ")
+        if choice == '0':
+            break
 
-            if choice == '0':
-                break
+        if choice == '4':
+            if report_views.atualizar_views():
+                print("\nDados dos relatórios atualizados com sucesso!")
+            pause()
+            continue
 
-            action = menu_actions.get(choice)
-            if action:
-                action()
-                print("\nRelatório gerado com sucesso!")
-            else:
-                print("Opção inválida.")
+        if choice == '5':
+            reports.executar_todas(workers=len(reports.RELATORIOS))
+            pause()
+            continue
 
+        if choice == '7':
+            import pacotes_professores
+            ids = ler_ids("IDs dos professores (ex.: 1,4; Enter para todos): ")
+            if ids is not None:
+                pacotes_professores.gerar_pacotes(ids or None)
             pause()
-    finally:
-        if conn:
-            conn.close()
+            continue
+
+        if choice == '8':
+            granularidade = input("Granularidade (dia, semana) [semana]: ").strip().lower() or "semana"
+            if granularidade not in report_views.GRANULARIDADES:
+                print("Granularidade inválida.")
+            else:
+                with get_connection() as conn:
+                    if not conn:
+                        print("\nErro: Não foi possível conectar ao banco de dados.")
+                    else:
+                        try:
+                            reports.gerar_grafico_consulta4(conn, granularidade)
+                            print("\nRelatório gerado com sucesso!")
+                        except psycopg.Error as e:
+                            print(f"\nErro ao gerar o relatório: {e}")
+                            print("Aplique as migrações (opção 7 do menu principal) e tente novamente.")
+            pause()
+            continue
+
+        if choice == '6':
+            import exportacao
+            formato = input("Formato (parquet, arrow, csv) [parquet]: ").strip().lower() or "parquet"
+            ids = ler_ids("Relatórios (ex.: 1,3; Enter para todos): ")
+            if ids is not None:
+                exportacao.exportar_todos(formato, ids=ids or None, pasta=reports.OUTPUT_DIR)
+            pause()
+            continue
+
+        action = menu_actions.get(choice)
+        if action:
+            # Cada relatório pega uma conexão do pool só pelo tempo da consulta
+            with get_connection() as conn:
+                if not conn:
+                    print("\nErro: Não foi possível conectar ao banco de dados.")
+                else:
+                    try:
+                        action(conn)
+                        print("\nRelatório gerado com sucesso!")
+                    except psycopg.Error as e:
+                        # Ex.: views dos relatórios ausentes num banco criado antes das migrações
+                        print(f"\nErro ao gerar o relatório: {e}")
+                        print("Aplique as migrações (opção 7 do menu principal) e tente novamente.")
+        else:
+            print("Opção inválida.")
+
+        pause()
 
 
 def drop_all_tables_confirmed():
@@ -385,19 +656,99 @@ def drop_all_tables_confirmed():
     pause()
 
 
-def main():
-    if hasattr(reports, 'OUTPUT_DIR') and not os.path.exists(reports.OUTPUT_DIR):
-        os.makedirs(reports.OUTPUT_DIR)
-        print(f"Pasta '{reports.OUTPUT_DIR}' criada para salvar relatórios.")
+def popular_em_escala():
+    """Pede o número de usuários e gera dados sintéticos com db_setup.seed_scaled."""
+    print("\nOs dados atuais serão substituídos por dados sintéticos.")
+    try:
+        n_usuarios = int(input("Número de usuários (ex.: 10000): "))
+        semente = int(input("Semente [42]: ") or 42)
+    except ValueError:
+        print("Valor inválido. Por favor, digite um número.")
         pause()
+        return
+
+    if n_usuarios <= 0:
+        print("O número de usuários deve ser positivo.")
+    elif input("Confirmar? (s/n): ").lower() == 's':
+        db_setup.seed_scaled(n_usuarios, semente=semente)
+    else:
+        print("Operação cancelada.")
+    pause()
+
+
+def menu_metricas():
+    """Mostra as estatísticas das consultas ao banco coletadas nesta sessão."""
+    while True:
+        clear_screen()
+        dados = instrumentacao.resumo()
+        print("--- Métricas das Consultas ao Banco (sessão atual) ---\n")
+
+        if not dados["consultas"]:
+            print("Nenhuma consulta registrada ainda.")
+        else:
+            print(tabulate(
+                [(c["sql"][:70], c["n"], f"{c['media_ms']:.2f}", f"{c['p95_ms']:.2f}", f"{c['max_ms']:.2f}",
+                  c["linhas"], c["erros"]) for c in dados["consultas"][:15]],
+                headers=["Consulta", "Chamadas", "Média (ms)", "p95 (ms)", "Máx (ms)", "Linhas", "Erros"],
+                tablefmt="grid"
+            ))
+
+        espera = dados["espera_conexao"]
+        if espera:
+            print(f"\nEspera por conexão do pool: {espera['n']} empréstimos, média {espera['media_ms']:.2f} ms, "
+                  f"p95 {espera['p95_ms']:.2f} ms, máx {espera['max_ms']:.2f} ms")
+        print(f"Consultas lentas (>= {dados['limite_lenta_ms']:.0f} ms) nesta sessão: {len(dados['lentas'])} "
+              f"(log em {instrumentacao.LOG_LENTAS})")
+
+        print("\nCache de buscas por ID:")
+        print(tabulate(
+            [(tipo, c["tamanho"], c["capacidade"], c["hits"], c["misses"], f"{c['taxa_acerto']:.1%}",
+              c["despejos"], c["invalidacoes"]) for tipo, c in cache_entidades.estatisticas().items()],
+            headers=["Tipo", "Tamanho", "Capacidade", "Hits", "Misses", "Taxa de acerto", "Despejos", "Invalidações"],
+            tablefmt="grid"
+        ))
+
+        print("\n1. Exportar para JSON")
+        print("2. Zerar as métricas")
+        print("0. Voltar")
+        choice = input("Escolha uma opção: ")
+
+        if choice == '0':
+            return
+        elif choice == '1':
+            caminho = input("Arquivo [metricas_consultas.json]: ") or "metricas_consultas.json"
+            try:
+                print(f"Métricas exportadas para {instrumentacao.exportar_json(caminho)}")
+            except OSError as e:
+                print(f"Erro ao exportar as métricas: {e}")
+            pause()
+        elif choice == '2':
+            instrumentacao.zerar()
+        else:
+            print("Opção inválida.")
+            pause()
+
+
+def menu_ai_assistant():
+    """Carrega o assistente (e o SDK do Gemini) apenas quando a opção é escolhida."""
+    import ai_assistant
+    ai_assistant.menu_ai_assistant()
+
+
+def main():
+    # Atualização periódica das views dos relatórios (desativada se o intervalo for 0)
+    report_views.iniciar_atualizacao_periodica()
 
     main_menu_actions: Dict[str, Callable] = {
         "1": menu_crud,
         "2": menu_relatorios,
-        "3": ai_assistant.menu_ai_assistant,
+        "3": menu_ai_assistant,
         "4": db_setup.create_tables,
         "5": db_setup.seed_data,
         "6": drop_all_tables_confirmed,
+        "7": db_setup.apply_migrations,
+        "8": popular_em_escala,
+        "9": menu_metricas,
     }
 
     while True:
@@ -409,6 +760,9 @@ def main():
         print("4. Criar Estrutura de Tabelas (Requer BD vazio)")
         print("5. Popular Banco de Dados com Dados de Exemplo (Seed)")
         print("6. APAGAR TODAS AS TABELAS (AÇÃO DESTRUTIVA)")
+        print("7. Aplicar Migrações (views dos relatórios, índices e otimizações)")
+        print("8. Popular com Dados Sintéticos em Escala")
+        print("9. Métricas das Consultas ao Banco")
         print("\n0. Sair")
         print("=======================================================")
 
@@ -0,0 +1,46 @@
+-- Indices secundarios para as colunas de chave estrangeira e para os joins dos relatorios.
+-- Todos usam IF NOT EXISTS para que a migracao possa ser reaplicada com seguranca.
+
+-- Projetos por orientador: interesses do professor no assistente, get_projetos_by_professor
+-- e a verificacao de delete_professor. O INCLUDE permite index-only scan no join com projeto_area.
+CREATE INDEX IF NOT EXISTS idx_projeto_orientador
+    ON cpe_enc.projeto (id_professor_orientador) INCLUDE (id_projeto);
+
+-- Indice parcial com o mesmo predicado da consulta 2 (projetos ativos por professor)
+CREATE INDEX IF NOT EXISTS idx_projeto_orientador_ativos
+    ON cpe_enc.projeto (id_professor_orientador) INCLUDE (id_projeto)
+    WHERE status IN ('Em Andamento', 'Proposto');
+
+-- Paginacao por chave das listagens (titulo/nome_completo + id como desempate)
+CREATE INDEX IF NOT EXISTS idx_projeto_titulo_id
+    ON cpe_enc.projeto (titulo, id_projeto);
+CREATE INDEX IF NOT EXISTS idx_usuario_nome_id
+    ON cpe_enc.usuario (nome_completo, id_usuario);
+
+-- A PK (id_projeto, id_area) nao atende buscas por area (consulta 1)
+CREATE INDEX IF NOT EXISTS idx_projeto_area_area
+    ON cpe_enc.projeto_area (id_area, id_projeto);
+
+-- A PK (id_aluno, id_projeto) nao atende buscas por projeto (consulta 1 e cascata de projeto)
+CREATE INDEX IF NOT EXISTS idx_aluno_projeto_projeto
+    ON cpe_enc.aluno_projeto (id_projeto, id_aluno);
+
+-- Vagas por projeto (consulta 3 e cascata de projeto)
+CREATE INDEX IF NOT EXISTS idx_vaga_projeto
+    ON cpe_enc.vaga (id_projeto);
+
+-- Vagas abertas (prazo_inscricao > CURRENT_TIMESTAMP). CURRENT_TIMESTAMP nao e imutavel e nao
+-- pode ir no predicado de um indice parcial, entao o prazo vira a chave e o filtro se torna um
+-- range scan que so toca as vagas abertas; o INCLUDE cobre as colunas da consulta 3.
+CREATE INDEX IF NOT EXISTS idx_vaga_prazo_aberta
+    ON cpe_enc.vaga (prazo_inscricao) INCLUDE (id_projeto, numero_posicoes);
+
+-- Candidaturas por vaga (a UNIQUE (id_aluno, id_vaga) so atende buscas por aluno)
+CREATE INDEX IF NOT EXISTS idx_candidatura_vaga_status
+    ON cpe_enc.candidatura (id_vaga, status);
+
+-- Marcos e publicacoes por projeto (cascata de projeto e consultas por projeto)
+CREATE INDEX IF NOT EXISTS idx_marco_projeto_data
+    ON cpe_enc.marco_calendario (id_projeto, data_marco);
+CREATE INDEX IF NOT EXISTS idx_publicacao_projeto
+    ON cpe_enc.publicacao (id_projeto);
@@ -0,0 +1,58 @@
+-- Views materializadas que sustentam os tres relatorios gerenciais (reports.py).
+-- Cada view tem um indice unico para permitir REFRESH MATERIALIZED VIEW CONCURRENTLY,
+-- que atualiza os dados sem bloquear as leituras dos relatorios.
+
+-- Consulta 1: popularidade das areas por numero de alunos unicos
+CREATE MATERIALIZED VIEW IF NOT EXISTS cpe_enc.mv_popularidade_areas AS
+SELECT ai.id_area,
+       ai.nome_area,
+       COUNT(DISTINCT ap.id_aluno) AS numero_de_alunos_unicos
+FROM cpe_enc.area_de_interesse AS ai
+JOIN cpe_enc.projeto_area AS pa ON ai.id_area = pa.id_area
+JOIN cpe_enc.aluno_projeto AS ap ON pa.id_projeto = ap.id_projeto
+GROUP BY ai.id_area, ai.nome_area;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_popularidade_areas
+    ON cpe_enc.mv_popularidade_areas (id_area);
+
+-- Consulta 2: ranking de professores por projetos ativos
+CREATE MATERIALIZED VIEW IF NOT EXISTS cpe_enc.mv_ranking_professores AS
+SELECT prof.id_usuario AS id_professor,
+       u.nome_completo AS nome_professor,
+       COUNT(p.id_projeto) AS numero_de_projetos
+FROM cpe_enc.professor AS prof
+JOIN cpe_enc.usuario AS u ON prof.id_usuario = u.id_usuario
+JOIN cpe_enc.projeto AS p ON prof.id_usuario = p.id_professor_orientador
+WHERE p.status IN ('Em Andamento', 'Proposto')
+GROUP BY prof.id_usuario, u.nome_completo;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_ranking_professores
+    ON cpe_enc.mv_ranking_professores (id_professor);
+
+-- Consulta 3: vagas abertas por projeto. "Aberta" e avaliado no momento do REFRESH.
+CREATE MATERIALIZED VIEW IF NOT EXISTS cpe_enc.mv_vagas_abertas AS
+SELECT p.id_projeto,
+       p.titulo AS titulo_projeto,
+       u.nome_completo AS professor_orientador,
+       SUM(v.numero_posicoes) AS total_de_vagas_abertas
+FROM cpe_enc.vaga AS v
+JOIN cpe_enc.projeto AS p ON v.id_projeto = p.id_projeto
+JOIN cpe_enc.professor AS prof ON p.id_professor_orientador = prof.id_usuario
+JOIN cpe_enc.usuario AS u ON prof.id_usuario = u.id_usuario
+WHERE v.prazo_inscricao > CURRENT_TIMESTAMP
+GROUP BY p.id_projeto, p.titulo, u.nome_completo;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_vagas_abertas
+    ON cpe_enc.mv_vagas_abertas (id_projeto);
+
+-- Momento da ultima atualizacao de cada view (indicador de defasagem no menu de relatorios)
+CREATE TABLE IF NOT EXISTS cpe_enc.relatorio_atualizacao (
+    nome_view VARCHAR(100) PRIMARY KEY,
+    atualizado_em TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO cpe_enc.relatorio_atualizacao (nome_view) VALUES
+('mv_popularidade_areas'),
+('mv_ranking_professores'),
+('mv_vagas_abertas')
+ON CONFLICT (nome_view) DO NOTHING;
@@ -0,0 +1,121 @@
+-- Rollup diario das candidaturas (relatorio 4: candidaturas por dia/semana por projeto e area).
+-- Uma linha por (dia, vaga, status) com o total de candidaturas, mantida por gatilhos em
+-- cpe_enc.candidatura. O relatorio le daqui, entao seu custo depende do numero de dias e
+-- vagas do periodo, e nao do numero de candidaturas.
+--
+-- Os gatilhos sao por comando (FOR EACH STATEMENT) com tabelas de transicao: um INSERT,
+-- UPDATE ou DELETE em lote vira um unico upsert agregado na rollup. A sessao pode desligar
+-- a manutencao com SET cpe_enc.rollup_desativada = on (usado pela carga de db_setup.seed_scaled,
+-- que recalcula tudo no final com cpe_enc.recalcular_candidatura_diaria()).
+
+CREATE TABLE IF NOT EXISTS cpe_enc.candidatura_diaria (
+    dia DATE NOT NULL,
+    id_vaga INTEGER NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    total INTEGER NOT NULL,
+    CONSTRAINT pk_candidatura_diaria PRIMARY KEY (dia, id_vaga, status),
+    -- Excluir a vaga apaga as candidaturas e tambem a rollup delas
+    CONSTRAINT fk_candidaturadiaria_vaga FOREIGN KEY (id_vaga) REFERENCES cpe_enc.vaga(id_vaga) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_candidatura_diaria_vaga
+    ON cpe_enc.candidatura_diaria (id_vaga);
+
+CREATE OR REPLACE FUNCTION cpe_enc.recalcular_candidatura_diaria() RETURNS void
+LANGUAGE sql AS $$
+    DELETE FROM cpe_enc.candidatura_diaria;
+    INSERT INTO cpe_enc.candidatura_diaria (dia, id_vaga, status, total)
+    SELECT dt_candidatura::date, id_vaga, status, COUNT(*)
+    FROM cpe_enc.candidatura
+    GROUP BY 1, 2, 3;
+$$;
+
+CREATE OR REPLACE FUNCTION cpe_enc.trg_candidatura_diaria_inserir() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF current_setting('cpe_enc.rollup_desativada', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    INSERT INTO cpe_enc.candidatura_diaria AS cd (dia, id_vaga, status, total)
+    SELECT n.dt_candidatura::date, n.id_vaga, n.status, COUNT(*)
+    FROM novas AS n
+    GROUP BY 1, 2, 3
+    ON CONFLICT (dia, id_vaga, status) DO UPDATE SET total = cd.total + EXCLUDED.total;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION cpe_enc.trg_candidatura_diaria_excluir() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF current_setting('cpe_enc.rollup_desativada', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    -- Se a vaga foi excluida, a rollup dela ja saiu em cascata e nada e atualizado aqui
+    UPDATE cpe_enc.candidatura_diaria AS cd
+    SET total = cd.total - a.total
+    FROM (SELECT o.dt_candidatura::date AS dia, o.id_vaga, o.status, COUNT(*) AS total
+          FROM antigas AS o
+          GROUP BY 1, 2, 3) AS a
+    WHERE cd.dia = a.dia AND cd.id_vaga = a.id_vaga AND cd.status = a.status;
+    DELETE FROM cpe_enc.candidatura_diaria AS cd
+    USING (SELECT DISTINCT o.dt_candidatura::date AS dia, o.id_vaga, o.status FROM antigas AS o) AS a
+    WHERE cd.dia = a.dia AND cd.id_vaga = a.id_vaga AND cd.status = a.status AND cd.total <= 0;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION cpe_enc.trg_candidatura_diaria_atualizar() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF current_setting('cpe_enc.rollup_desativada', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    -- So as linhas em que dia, vaga ou status mudaram movem contagem
+    UPDATE cpe_enc.candidatura_diaria AS cd
+    SET total = cd.total - a.total
+    FROM (SELECT o.dt_candidatura::date AS dia, o.id_vaga, o.status, COUNT(*) AS total
+          FROM antigas AS o
+          JOIN novas AS n ON n.id_candidatura = o.id_candidatura
+          WHERE (o.dt_candidatura::date, o.id_vaga, o.status)
+                IS DISTINCT FROM (n.dt_candidatura::date, n.id_vaga, n.status)
+          GROUP BY 1, 2, 3) AS a
+    WHERE cd.dia = a.dia AND cd.id_vaga = a.id_vaga AND cd.status = a.status;
+
+    INSERT INTO cpe_enc.candidatura_diaria AS cd (dia, id_vaga, status, total)
+    SELECT n.dt_candidatura::date, n.id_vaga, n.status, COUNT(*)
+    FROM novas AS n
+    JOIN antigas AS o ON o.id_candidatura = n.id_candidatura
+    WHERE (o.dt_candidatura::date, o.id_vaga, o.status)
+          IS DISTINCT FROM (n.dt_candidatura::date, n.id_vaga, n.status)
+    GROUP BY 1, 2, 3
+    ON CONFLICT (dia, id_vaga, status) DO UPDATE SET total = cd.total + EXCLUDED.total;
+
+    -- Só as chaves que perderam contagem, pela chave primária (sem varrer a rollup)
+    DELETE FROM cpe_enc.candidatura_diaria AS cd
+    USING (SELECT DISTINCT o.dt_candidatura::date AS dia, o.id_vaga, o.status FROM antigas AS o) AS a
+    WHERE cd.dia = a.dia AND cd.id_vaga = a.id_vaga AND cd.status = a.status AND cd.total <= 0;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_candidatura_diaria_ins ON cpe_enc.candidatura;
+CREATE TRIGGER trg_candidatura_diaria_ins
+    AFTER INSERT ON cpe_enc.candidatura
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION cpe_enc.trg_candidatura_diaria_inserir();
+
+DROP TRIGGER IF EXISTS trg_candidatura_diaria_upd ON cpe_enc.candidatura;
+CREATE TRIGGER trg_candidatura_diaria_upd
+    AFTER UPDATE ON cpe_enc.candidatura
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION cpe_enc.trg_candidatura_diaria_atualizar();
+
+DROP TRIGGER IF EXISTS trg_candidatura_diaria_del ON cpe_enc.candidatura;
+CREATE TRIGGER trg_candidatura_diaria_del
+    AFTER DELETE ON cpe_enc.candidatura
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT EXECUTE FUNCTION cpe_enc.trg_candidatura_diaria_excluir();
+
+-- Carga inicial: recria a rollup a partir das candidaturas existentes (idempotente)
+SELECT cpe_enc.recalcular_candidatura_diaria();
@@ -0,0 +1,17 @@
+-- Recomendacoes de vagas abertas por aluno, geradas em lote por recomendacao_vagas.gerar_recomendacoes()
+-- (top-k por aluno, posicao 1 = mais recomendada). A tabela inteira e substituida a cada execucao.
+
+CREATE TABLE IF NOT EXISTS cpe_enc.recomendacao_vaga (
+    id_aluno INTEGER NOT NULL,
+    posicao SMALLINT NOT NULL,
+    id_vaga INTEGER NOT NULL,
+    pontuacao REAL NOT NULL,
+    gerado_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT pk_recomendacao_vaga PRIMARY KEY (id_aluno, posicao),
+    CONSTRAINT fk_recomendacao_aluno FOREIGN KEY (id_aluno) REFERENCES cpe_enc.aluno(id_usuario) ON DELETE CASCADE,
+    CONSTRAINT fk_recomendacao_vaga FOREIGN KEY (id_vaga) REFERENCES cpe_enc.vaga(id_vaga) ON DELETE CASCADE
+);
+
+-- Exclusao de vagas em cascata
+CREATE INDEX IF NOT EXISTS idx_recomendacao_vaga_vaga
+    ON cpe_enc.recomendacao_vaga (id_vaga);
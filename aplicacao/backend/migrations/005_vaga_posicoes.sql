@@ -0,0 +1,65 @@
+-- Contador de posicoes preenchidas por vaga, para que aprovar candidaturas nunca ultrapasse
+-- vaga.numero_posicoes (ver crud/candidatura_crud.aprovar_candidatura).
+--
+-- O gatilho por linha em cpe_enc.candidatura ajusta vaga.posicoes_preenchidas sempre que uma
+-- candidatura entra ou sai do status 'Aprovada'. O incremento e um UPDATE condicional
+-- (posicoes_preenchidas < numero_posicoes): ele trava so a linha da vaga em questao ate o fim
+-- da transacao, entao aprovacoes concorrentes na mesma vaga se revezam no contador e as de
+-- vagas diferentes nao esperam umas pelas outras. Sem posicao livre, o gatilho aborta o comando
+-- com check_violation na restricao 'chk_vaga_posicoes', qualquer que seja o caminho (CRUD ou SQL).
+--
+-- Como a rollup da migration 003, o gatilho respeita SET cpe_enc.rollup_desativada = on
+-- (carga de db_setup.seed_scaled, que chama cpe_enc.recalcular_posicoes_preenchidas() no final).
+
+ALTER TABLE cpe_enc.vaga ADD COLUMN IF NOT EXISTS posicoes_preenchidas INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION cpe_enc.recalcular_posicoes_preenchidas() RETURNS void
+LANGUAGE sql AS $$
+    UPDATE cpe_enc.vaga AS v
+    SET posicoes_preenchidas = a.total
+    FROM (SELECT v2.id_vaga, COUNT(c.id_candidatura)::int AS total
+          FROM cpe_enc.vaga AS v2
+          LEFT JOIN cpe_enc.candidatura AS c ON c.id_vaga = v2.id_vaga AND c.status = 'Aprovada'
+          GROUP BY v2.id_vaga) AS a
+    WHERE v.id_vaga = a.id_vaga AND v.posicoes_preenchidas <> a.total;
+$$;
+
+CREATE OR REPLACE FUNCTION cpe_enc.trg_candidatura_posicoes() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF current_setting('cpe_enc.rollup_desativada', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    -- Libera primeiro: trocar a vaga ou o status de uma aprovada nao conta duas vezes
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'Aprovada' THEN
+        UPDATE cpe_enc.vaga SET posicoes_preenchidas = posicoes_preenchidas - 1
+        WHERE id_vaga = OLD.id_vaga;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'Aprovada' THEN
+        UPDATE cpe_enc.vaga SET posicoes_preenchidas = posicoes_preenchidas + 1
+        WHERE id_vaga = NEW.id_vaga AND posicoes_preenchidas < numero_posicoes;
+        IF NOT FOUND THEN
+            RAISE EXCEPTION 'A vaga % não tem posições livres.', NEW.id_vaga
+                USING ERRCODE = 'check_violation', CONSTRAINT = 'chk_vaga_posicoes',
+                      TABLE = 'vaga', SCHEMA = 'cpe_enc';
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_candidatura_posicoes_ins_del ON cpe_enc.candidatura;
+CREATE TRIGGER trg_candidatura_posicoes_ins_del
+    AFTER INSERT OR DELETE ON cpe_enc.candidatura
+    FOR EACH ROW EXECUTE FUNCTION cpe_enc.trg_candidatura_posicoes();
+
+DROP TRIGGER IF EXISTS trg_candidatura_posicoes_upd ON cpe_enc.candidatura;
+CREATE TRIGGER trg_candidatura_posicoes_upd
+    AFTER UPDATE OF status, id_vaga ON cpe_enc.candidatura
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.id_vaga IS DISTINCT FROM NEW.id_vaga)
+    EXECUTE FUNCTION cpe_enc.trg_candidatura_posicoes();
+
+-- Carga inicial (idempotente). Vagas que ja estejam acima do limite ficam com o total real
+-- e simplesmente nao aceitam novas aprovacoes.
+SELECT cpe_enc.recalcular_posicoes_preenchidas();
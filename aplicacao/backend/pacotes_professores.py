@@ -0,0 +1,228 @@
+"""
+Pacotes de relatórios por professor orientador.
+
+Para cada professor são gerados quatro gráficos, numa pasta própria
+(OUTPUT_DIR = imagens/professores/<id>_<nome>/):
+
+- projetos_ativos.png: linha do tempo dos projetos 'Proposto'/'Em Andamento';
+- alunos_por_projeto.png: alunos vinculados a cada projeto ativo;
+- vagas_abertas.png: posições e candidaturas das vagas com prazo aberto;
+- proximos_marcos.png: marcos dos próximos MARCOS_DIAS dias.
+
+Os dados de todos os professores vêm de quatro consultas set-based (uma por
+gráfico, lidas com leitura_colunar) e são separados por id_professor_orientador
+em memória. A renderização usa a API orientada a objetos do Matplotlib
+(Figure + Agg, sem o estado global do pyplot) e é distribuída entre processos,
+um pacote por tarefa.
+"""
+import os
+import re
+import time
+import unicodedata
+import multiprocessing
+from datetime import date, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import psycopg
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+from db_config import get_connection
+from leitura_colunar import ler_dataframe
+
+OUTPUT_DIR = os.path.join("imagens", "professores")
+MARCOS_DIAS = 90
+TITULO_MAX = 40
+
+CONSULTAS = {
+    "professores": """
+        SELECT prof.id_usuario AS id_professor_orientador, u.nome_completo
+        FROM cpe_enc.professor AS prof
+        JOIN cpe_enc.usuario AS u ON u.id_usuario = prof.id_usuario
+    """,
+    "projetos_ativos": """
+        SELECT p.id_professor_orientador, p.id_projeto, p.titulo, p.status, p.dt_inicio, p.dt_fim_prevista
+        FROM cpe_enc.projeto AS p
+        WHERE p.status IN ('Em Andamento', 'Proposto')
+        ORDER BY p.id_professor_orientador, p.dt_inicio
+    """,
+    "alunos_por_projeto": """
+        SELECT p.id_professor_orientador, p.id_projeto, p.titulo, COUNT(ap.id_aluno) AS alunos
+        FROM cpe_enc.projeto AS p
+        LEFT JOIN cpe_enc.aluno_projeto AS ap ON ap.id_projeto = p.id_projeto
+        WHERE p.status IN ('Em Andamento', 'Proposto')
+        GROUP BY p.id_professor_orientador, p.id_projeto, p.titulo
+        ORDER BY p.id_professor_orientador, alunos DESC
+    """,
+    "vagas_abertas": """
+        SELECT p.id_professor_orientador, v.id_vaga, p.titulo, v.numero_posicoes, v.prazo_inscricao,
+               COUNT(c.id_candidatura) AS candidaturas
+        FROM cpe_enc.vaga AS v
+        JOIN cpe_enc.projeto AS p ON p.id_projeto = v.id_projeto
+        LEFT JOIN cpe_enc.candidatura AS c ON c.id_vaga = v.id_vaga
+        WHERE v.prazo_inscricao > CURRENT_TIMESTAMP
+        GROUP BY p.id_professor_orientador, v.id_vaga, p.titulo, v.numero_posicoes, v.prazo_inscricao
+        ORDER BY p.id_professor_orientador, v.prazo_inscricao
+    """,
+    "proximos_marcos": f"""
+        SELECT p.id_professor_orientador, p.titulo, m.titulo_marco, m.data_marco
+        FROM cpe_enc.marco_calendario AS m
+        JOIN cpe_enc.projeto AS p ON p.id_projeto = m.id_projeto
+        WHERE m.data_marco BETWEEN CURRENT_DATE AND CURRENT_DATE + {MARCOS_DIAS}
+        ORDER BY p.id_professor_orientador, m.data_marco
+    """,
+}
+
+
+def _curto(texto):
+    return texto if len(texto) <= TITULO_MAX else texto[:TITULO_MAX - 1] + "…"
+
+
+def _pasta_professor(id_professor, nome):
+    ascii_ = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode()
+    slug = re.sub(r"[^a-z0-9]+", "_", ascii_.lower()).strip("_")
+    return os.path.join(OUTPUT_DIR, f"{id_professor}_{slug}"[:80])
+
+
+def carregar_dados(ids_professores=None):
+    """
+    Executa as consultas (uma conexão, uma consulta por gráfico) e retorna
+    {id_professor: (nome, {grafico: DataFrame})}, só com os professores pedidos.
+    Retorna None se não for possível consultar o banco.
+    """
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+        try:
+            tabelas = {nome: ler_dataframe(conn, sql) for nome, sql in CONSULTAS.items()}
+        except psycopg.Error as e:
+            print(f"Erro ao carregar os dados dos pacotes de relatórios: {e}")
+            return None
+
+    professores = tabelas.pop("professores")
+    if ids_professores is not None:
+        professores = professores[professores["id_professor_orientador"].isin(list(ids_professores))]
+
+    grupos = {nome: dict(tuple(df.groupby("id_professor_orientador"))) for nome, df in tabelas.items()}
+    vazios = {nome: df.iloc[0:0] for nome, df in tabelas.items()}
+    return {
+        int(id_prof): (nome, {grafico: grupos[grafico].get(id_prof, vazios[grafico]) for grafico in tabelas})
+        for id_prof, nome in zip(professores["id_professor_orientador"], professores["nome_completo"])
+    }
+
+
+def _sem_dados(ax, mensagem):
+    ax.text(0.5, 0.5, mensagem, ha="center", va="center", fontsize=12, color="gray")
+    ax.set_axis_off()
+
+
+def _projetos_ativos(ax, df):
+    if df.empty:
+        return _sem_dados(ax, "Nenhum projeto ativo")
+    hoje = pd.Timestamp(date.today())
+    inicio = df["dt_inicio"]
+    # Sem fim previsto: a barra vai até hoje (ou até o início, se for futuro)
+    fim = df["dt_fim_prevista"].fillna(max(inicio.max(), hoje))
+    cores = df["status"].map({"Em Andamento": "tab:blue", "Proposto": "tab:orange"})
+    ax.barh([_curto(t) for t in df["titulo"]], (fim - inicio).dt.days,
+            left=mdates.date2num(inicio), color=list(cores))
+    ax.axvline(mdates.date2num(hoje), color="gray", linestyle="--", linewidth=1)
+    ax.xaxis_date()
+    ax.invert_yaxis()
+    ax.set_xlabel("Período (azul: em andamento, laranja: proposto)")
+
+
+def _alunos_por_projeto(ax, df):
+    if df.empty:
+        return _sem_dados(ax, "Nenhum projeto ativo")
+    ax.barh([_curto(t) for t in df["titulo"]], df["alunos"], color="tab:green")
+    ax.invert_yaxis()
+    ax.set_xlabel("Alunos vinculados")
+
+
+def _vagas_abertas(ax, df):
+    if df.empty:
+        return _sem_dados(ax, "Nenhuma vaga aberta")
+    rotulos = [f"{_curto(t)} (#{v})" for t, v in zip(df["titulo"], df["id_vaga"])]
+    posicoes = range(len(df))
+    ax.barh([p - 0.2 for p in posicoes], df["numero_posicoes"], height=0.4, label="Posições")
+    ax.barh([p + 0.2 for p in posicoes], df["candidaturas"], height=0.4, label="Candidaturas")
+    ax.set_yticks(list(posicoes), rotulos)
+    ax.invert_yaxis()
+    ax.legend()
+
+
+def _proximos_marcos(ax, df):
+    if df.empty:
+        return _sem_dados(ax, f"Nenhum marco nos próximos {MARCOS_DIAS} dias")
+    projetos = list(dict.fromkeys(df["titulo"]))
+    linha = {titulo: i for i, titulo in enumerate(projetos)}
+    y = [linha[t] for t in df["titulo"]]
+    ax.scatter(df["data_marco"], y, color="tab:purple", zorder=3)
+    for x, yi, rotulo in zip(df["data_marco"], y, df["titulo_marco"]):
+        ax.annotate(rotulo, (x, yi), textcoords="offset points", xytext=(4, 4), fontsize=8)
+    ax.set_yticks(range(len(projetos)), [_curto(t) for t in projetos])
+    ax.set_xlim(date.today(), date.today() + timedelta(days=MARCOS_DIAS))
+    ax.invert_yaxis()
+    ax.grid(axis="x", alpha=0.3)
+
+
+GRAFICOS = {
+    "projetos_ativos": ("Projetos ativos", _projetos_ativos),
+    "alunos_por_projeto": ("Alunos por projeto", _alunos_por_projeto),
+    "vagas_abertas": ("Vagas abertas", _vagas_abertas),
+    "proximos_marcos": (f"Próximos marcos ({MARCOS_DIAS} dias)", _proximos_marcos),
+}
+
+
+def renderizar_pacote(id_professor, nome, dados, pasta):
+    """Gera os gráficos de um professor em 'pasta' (roda no processo de renderização)."""
+    os.makedirs(pasta, exist_ok=True)
+    for grafico, (titulo, desenhar) in GRAFICOS.items():
+        df = dados[grafico]
+        # Figure direto (sem pyplot): nada de estado global, e o canvas Agg é criado no savefig
+        fig = Figure(figsize=(10, max(3.0, 0.45 * len(df) + 1.5)))
+        ax = fig.subplots()
+        desenhar(ax, df)
+        ax.set_title(f"{titulo} — {nome}")
+        fig.tight_layout()
+        fig.savefig(os.path.join(pasta, f"{grafico}.png"))
+    return pasta
+
+
+def gerar_pacotes(ids_professores=None, workers=None):
+    """
+    Gera os pacotes dos professores indicados (todos, por padrão) e retorna
+    {id_professor: pasta}. As renderizações são distribuídas em 'workers' processos.
+    """
+    inicio = time.perf_counter()
+    dados = carregar_dados(ids_professores)
+    if dados is None:
+        return {}
+    consulta = time.perf_counter() - inicio
+
+    if not dados:
+        print("Nenhum professor encontrado.")
+        return {}
+    # Cada processo importa pandas/matplotlib: não sobe mais processos do que pacotes
+    workers = min(workers or os.cpu_count() or 1, len(dados))
+    pastas = {}
+    # 'spawn' evita herdar via fork as threads do pool de conexões
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=contexto) as executor:
+        futuros = {
+            executor.submit(renderizar_pacote, id_prof, nome, graficos, _pasta_professor(id_prof, nome)): id_prof
+            for id_prof, (nome, graficos) in dados.items()
+        }
+        for futuro in as_completed(futuros):
+            id_prof = futuros[futuro]
+            try:
+                pastas[id_prof] = futuro.result()
+            except Exception as e:
+                print(f"Erro ao gerar o pacote do professor {id_prof}: {e}")
+            print(f"\rPacotes gerados: {len(pastas)}/{len(dados)}", end="", flush=True)
+
+    print(f"\n{len(pastas)} pacote(s) em '{OUTPUT_DIR}' "
+          f"(consultas {consulta:.2f}s, total {time.perf_counter() - inicio:.2f}s).")
+    return pastas
@@ -0,0 +1,243 @@
+"""
+Recomendação de vagas abertas para alunos, pelo perfil de áreas.
+
+O perfil do aluno é o número de projetos dele (aluno_projeto) em cada área
+(projeto_area), como em similaridade.vetor_aluno; o de uma vaga aberta
+(prazo_inscricao no futuro) são as áreas do seu projeto. A pontuação é o
+cosseno entre os dois vetores (0 a 1).
+
+Todos os alunos são pontuados de uma vez: três consultas set-based (perfis,
+áreas das vagas abertas e pares aluno-vaga excluídos) lidas com
+leitura_colunar, duas matrizes densas NumPy normalizadas por linha (alunos x
+áreas e vagas x áreas) e, a cada BLOCO_ALUNOS alunos, um produto de matrizes
+seguido de argpartition para o top-k de cada linha. Ficam de fora as vagas às
+quais o aluno já se candidatou, as dos projetos de que ele já participa e as
+que já preencheram todas as posições (vaga.posicoes_preenchidas, migrations/005).
+Alunos sem projetos não têm perfil e não recebem recomendações.
+
+gerar_recomendacoes() grava o resultado em cpe_enc.recomendacao_vaga
+(migrations/004), para o lote noturno:
+    python recomendacao_vagas.py --k 10
+"""
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import psycopg
+from db_config import get_connection
+from leitura_colunar import ler_dataframe
+
+K_PADRAO = 10
+BLOCO_ALUNOS = 2048  # linhas da matriz de pontuações calculadas por vez (BLOCO_ALUNOS x vagas float32)
+
+_SQL_PERFIS = """
+    SELECT ap.id_aluno, pa.id_area, COUNT(*)::float4 AS peso
+    FROM cpe_enc.aluno_projeto AS ap
+    JOIN cpe_enc.projeto_area AS pa ON pa.id_projeto = ap.id_projeto
+    {filtro}
+    GROUP BY ap.id_aluno, pa.id_area
+"""
+_SQL_VAGAS = """
+    SELECT v.id_vaga, pa.id_area
+    FROM cpe_enc.vaga AS v
+    JOIN cpe_enc.projeto_area AS pa ON pa.id_projeto = v.id_projeto
+    WHERE v.prazo_inscricao > CURRENT_TIMESTAMP AND v.posicoes_preenchidas < v.numero_posicoes
+"""
+_SQL_EXCLUIDAS = """
+    SELECT c.id_aluno, c.id_vaga
+    FROM cpe_enc.candidatura AS c
+    JOIN cpe_enc.vaga AS v ON v.id_vaga = c.id_vaga
+    WHERE v.prazo_inscricao > CURRENT_TIMESTAMP {filtro_c}
+    UNION
+    SELECT ap.id_aluno, v.id_vaga
+    FROM cpe_enc.aluno_projeto AS ap
+    JOIN cpe_enc.vaga AS v ON v.id_projeto = ap.id_projeto
+    WHERE v.prazo_inscricao > CURRENT_TIMESTAMP {filtro_ap}
+"""
+
+
+def _filtro(coluna, ids_alunos, prefixo):
+    if ids_alunos is None:
+        return ""
+    # ids convertidos para int: o literal do array não tem como carregar SQL
+    return f"{prefixo} {coluna} = ANY('{{{','.join(str(int(i)) for i in ids_alunos)}}}'::int[])"
+
+
+def _carregar(conn, ids_alunos=None):
+    perfis = ler_dataframe(conn, _SQL_PERFIS.format(filtro=_filtro("ap.id_aluno", ids_alunos, "WHERE")))
+    vagas = ler_dataframe(conn, _SQL_VAGAS)
+    excluidas = ler_dataframe(conn, _SQL_EXCLUIDAS.format(filtro_c=_filtro("c.id_aluno", ids_alunos, "AND"),
+                                                          filtro_ap=_filtro("ap.id_aluno", ids_alunos, "AND")))
+    return perfis, vagas, excluidas
+
+
+def _matriz_normalizada(linhas, colunas, pesos, forma):
+    """Matriz densa float32 com as linhas normalizadas (norma 1; linhas vazias ficam zeradas)."""
+    matriz = np.zeros(forma, dtype=np.float32)
+    np.add.at(matriz, (linhas, colunas), pesos)
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    np.divide(matriz, normas, out=matriz, where=normas > 0)
+    return matriz
+
+
+def _posicoes(ids, valores):
+    """Posição de cada valor no array ordenado 'ids' e a máscara dos valores encontrados."""
+    pos = np.minimum(np.searchsorted(ids, valores), len(ids) - 1)
+    return pos, ids[pos] == valores
+
+
+def calcular(k=K_PADRAO, ids_alunos=None, bloco=BLOCO_ALUNOS):
+    """
+    Pontua as vagas abertas para os alunos indicados (todos, por padrão) e retorna um
+    DataFrame (id_aluno, posicao, id_vaga, pontuacao) com até k vagas por aluno,
+    da mais para a menos recomendada. Só entram vagas com pontuação > 0.
+    Retorna None se não for possível consultar o banco.
+    """
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+        try:
+            perfis, vagas, excluidas = _carregar(conn, ids_alunos)
+        except psycopg.Error as e:
+            print(f"Erro ao carregar os dados para a recomendação de vagas: {e}")
+            return None
+
+    vazio = pd.DataFrame({"id_aluno": np.array([], dtype=np.int32), "posicao": np.array([], dtype=np.int16),
+                          "id_vaga": np.array([], dtype=np.int32), "pontuacao": np.array([], dtype=np.float32)})
+    if perfis.empty or vagas.empty or k <= 0:
+        return vazio
+
+    alunos, linha_aluno = np.unique(perfis["id_aluno"].to_numpy(), return_inverse=True)
+    ids_vagas, linha_vaga = np.unique(vagas["id_vaga"].to_numpy(), return_inverse=True)
+    areas = np.union1d(perfis["id_area"].to_numpy(), vagas["id_area"].to_numpy())
+    matriz_alunos = _matriz_normalizada(linha_aluno, np.searchsorted(areas, perfis["id_area"].to_numpy()),
+                                        perfis["peso"].to_numpy(dtype=np.float32), (len(alunos), len(areas)))
+    matriz_vagas = _matriz_normalizada(linha_vaga, np.searchsorted(areas, vagas["id_area"].to_numpy()),
+                                       np.float32(1.0), (len(ids_vagas), len(areas)))
+    areas_vagas = np.ascontiguousarray(matriz_vagas.T)
+
+    # Pares excluídos como (linha do aluno, coluna da vaga), ordenados por aluno para fatiar por bloco
+    exc_linha, achou_a = _posicoes(alunos, excluidas["id_aluno"].to_numpy())
+    exc_coluna, achou_v = _posicoes(ids_vagas, excluidas["id_vaga"].to_numpy())
+    manter = achou_a & achou_v
+    ordem = np.argsort(exc_linha[manter], kind="stable")
+    exc_linha, exc_coluna = exc_linha[manter][ordem], exc_coluna[manter][ordem]
+
+    k = min(k, len(ids_vagas))
+    partes = []
+    for inicio in range(0, len(alunos), bloco):
+        fim = min(inicio + bloco, len(alunos))
+        # Cosseno de cada aluno do bloco com todas as vagas: as linhas já têm norma 1
+        pontuacoes = matriz_alunos[inicio:fim] @ areas_vagas
+        de, ate = np.searchsorted(exc_linha, [inicio, fim])
+        pontuacoes[exc_linha[de:ate] - inicio, exc_coluna[de:ate]] = 0.0
+
+        melhores = np.argpartition(-pontuacoes, k - 1, axis=1)[:, :k]
+        valores = np.take_along_axis(pontuacoes, melhores, axis=1)
+        ordem = np.argsort(-valores, axis=1, kind="stable")
+        melhores = np.take_along_axis(melhores, ordem, axis=1)
+        valores = np.take_along_axis(valores, ordem, axis=1)
+
+        positivos = valores > 0
+        linhas, posicoes = np.nonzero(positivos)
+        partes.append(pd.DataFrame({
+            "id_aluno": alunos[inicio + linhas].astype(np.int32),
+            "posicao": (posicoes + 1).astype(np.int16),
+            "id_vaga": ids_vagas[melhores[positivos]].astype(np.int32),
+            "pontuacao": valores[positivos],
+        }))
+    return pd.concat(partes, ignore_index=True) if partes else vazio
+
+
+def gravar(recomendacoes, ids_alunos=None):
+    """
+    Substitui as recomendações dos alunos indicados (todas, por padrão) em
+    cpe_enc.recomendacao_vaga numa única transação: quem lê a tabela vê as
+    recomendações antigas até o COMMIT. Retorna o número de linhas gravadas ou None.
+    """
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return None
+        try:
+            with conn.cursor() as cur:
+                if ids_alunos is None:
+                    cur.execute("DELETE FROM cpe_enc.recomendacao_vaga;")
+                else:
+                    cur.execute("DELETE FROM cpe_enc.recomendacao_vaga WHERE id_aluno = ANY(%s);",
+                                (list(ids_alunos),))
+                with cur.copy("COPY cpe_enc.recomendacao_vaga (id_aluno, posicao, id_vaga, pontuacao) "
+                              "FROM STDIN") as copy:
+                    for linha in zip(*(recomendacoes[c].tolist()
+                                       for c in ("id_aluno", "posicao", "id_vaga", "pontuacao"))):
+                        copy.write_row(linha)
+            conn.commit()
+            return len(recomendacoes)
+        except psycopg.Error as e:
+            conn.rollback()
+            print(f"Erro ao gravar as recomendações de vagas: {e}")
+            return None
+
+
+def gerar_recomendacoes(k=K_PADRAO, ids_alunos=None):
+    """Calcula e grava as recomendações (lote noturno). Retorna o número de linhas gravadas ou None."""
+    inicio = time.perf_counter()
+    recomendacoes = calcular(k, ids_alunos)
+    if recomendacoes is None:
+        return None
+    calculo = time.perf_counter() - inicio
+
+    linhas = gravar(recomendacoes, ids_alunos)
+    if linhas is not None:
+        print(f"{linhas} recomendações para {recomendacoes['id_aluno'].nunique()} aluno(s) "
+              f"(cálculo {calculo:.2f}s, total {time.perf_counter() - inicio:.2f}s).")
+    return linhas
+
+
+def vagas_recomendadas(id_aluno, k=5):
+    """
+    Calcula na hora as k vagas abertas mais indicadas para o aluno e retorna uma lista
+    de dicts {id_vaga, titulo_projeto, numero_posicoes, prazo_inscricao, pontuacao}.
+    """
+    recomendacoes = calcular(k, [id_aluno])
+    if recomendacoes is None or recomendacoes.empty:
+        return []
+
+    with get_connection() as conn:
+        if not conn:
+            return []
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT v.id_vaga, p.titulo, v.numero_posicoes, v.prazo_inscricao
+                    FROM cpe_enc.vaga AS v
+                    JOIN cpe_enc.projeto AS p ON p.id_projeto = v.id_projeto
+                    WHERE v.id_vaga = ANY(%s);
+                    """,
+                    (recomendacoes["id_vaga"].tolist(),)
+                )
+                vagas = {linha[0]: linha[1:] for linha in cur.fetchall()}
+        except psycopg.Error as e:
+            print(f"Erro ao buscar as vagas recomendadas: {e}")
+            return []
+
+    return [
+        {"id_vaga": id_vaga, "titulo_projeto": vagas[id_vaga][0], "numero_posicoes": vagas[id_vaga][1],
+         "prazo_inscricao": vagas[id_vaga][2], "pontuacao": pontuacao}
+        for id_vaga, pontuacao in zip(recomendacoes["id_vaga"].tolist(), recomendacoes["pontuacao"].tolist())
+        if id_vaga in vagas
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera as recomendações de vagas abertas para todos os alunos.")
+    parser.add_argument("--k", type=int, default=K_PADRAO, help="vagas recomendadas por aluno")
+    args = parser.parse_args()
+    if gerar_recomendacoes(args.k) is None:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
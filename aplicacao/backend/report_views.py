@@ -0,0 +1,171 @@
+"""
+Atualização das views materializadas que alimentam os relatórios gerenciais.
+
+As views são criadas por migrations/002_relatorios_mv.sql. O relatório 4
+(candidaturas ao longo do tempo) não usa view: lê da rollup
+cpe_enc.candidatura_diaria, mantida por gatilhos (migrations/003) e sempre
+em dia. Este módulo não
+depende de pandas/matplotlib, para que o menu principal possa agendar a
+atualização e mostrar a defasagem sem carregar o módulo de relatórios.
+"""
+import os
+import threading
+import psycopg
+from db_config import get_connection
+
+# Opção do menu de relatórios -> view materializada correspondente
+VIEWS_RELATORIOS = {
+    "1": "mv_popularidade_areas",
+    "2": "mv_ranking_professores",
+    "3": "mv_vagas_abertas",
+}
+
+# Relatório 4: candidaturas por período, por projeto e por área, nos últimos SERIE_DIAS dias.
+# A rollup tem uma linha por (dia, vaga, status), então o custo depende dos dias e vagas
+# do período, e não do número de candidaturas.
+GRANULARIDADES = {"dia": "day", "semana": "week"}
+SERIE_DIAS = 180
+
+
+def consulta_candidaturas(granularidade="semana", dias=SERIE_DIAS):
+    """SQL do relatório 4 em formato longo: periodo, dimensao ('projeto'/'area'), nome, candidaturas."""
+    return f"""
+        WITH por_projeto AS (
+            SELECT date_trunc('{GRANULARIDADES[granularidade]}', cd.dia)::date AS periodo,
+                   v.id_projeto, SUM(cd.total)::bigint AS candidaturas
+            FROM cpe_enc.candidatura_diaria AS cd
+            JOIN cpe_enc.vaga AS v ON v.id_vaga = cd.id_vaga
+            WHERE cd.dia >= CURRENT_DATE - {int(dias)}
+            GROUP BY 1, 2
+        )
+        SELECT pp.periodo, 'projeto' AS dimensao, p.titulo AS nome, SUM(pp.candidaturas)::bigint AS candidaturas
+        FROM por_projeto AS pp
+        JOIN cpe_enc.projeto AS p ON p.id_projeto = pp.id_projeto
+        GROUP BY pp.periodo, p.id_projeto, p.titulo
+        UNION ALL
+        SELECT pp.periodo, 'area', ai.nome_area, SUM(pp.candidaturas)::bigint
+        FROM por_projeto AS pp
+        JOIN cpe_enc.projeto_area AS pa ON pa.id_projeto = pp.id_projeto
+        JOIN cpe_enc.area_de_interesse AS ai ON ai.id_area = pa.id_area
+        GROUP BY pp.periodo, ai.id_area, ai.nome_area
+        ORDER BY 1, 2, 3;
+    """
+
+
+# id do relatório (reports.RELATORIOS) -> consulta que alimenta o gráfico, usada
+# tanto por reports quanto pela exportação dos dados (exportacao)
+CONSULTAS_RELATORIOS = {
+    1: """
+        SELECT nome_area, numero_de_alunos_unicos
+        FROM cpe_enc.mv_popularidade_areas
+        ORDER BY numero_de_alunos_unicos DESC;
+    """,
+    2: """
+        SELECT nome_professor, numero_de_projetos
+        FROM cpe_enc.mv_ranking_professores
+        ORDER BY numero_de_projetos ASC;
+    """,
+    3: """
+        SELECT titulo_projeto, professor_orientador, total_de_vagas_abertas
+        FROM cpe_enc.mv_vagas_abertas
+        ORDER BY total_de_vagas_abertas DESC;
+    """,
+    4: consulta_candidaturas(),
+}
+
+_parar_agendamento = threading.Event()
+_thread_agendamento = None
+
+
+def atualizar_views(views=None, concurrently=True):
+    """
+    Executa REFRESH MATERIALIZED VIEW nas views indicadas (todas, por padrão).
+    Com concurrently=True as leituras dos relatórios não são bloqueadas durante a atualização.
+    Cada view é atualizada e registrada em sua própria transação curta.
+    """
+    views = views or list(VIEWS_RELATORIOS.values())
+    modo = "CONCURRENTLY " if concurrently else ""
+
+    with get_connection() as conn:
+        if not conn:
+            print("Erro: Não foi possível conectar ao banco de dados.")
+            return False
+
+        try:
+            with conn.cursor() as cur:
+                for view in views:
+                    cur.execute(f"REFRESH MATERIALIZED VIEW {modo}cpe_enc.{view};")
+                    cur.execute(
+                        """
+                        INSERT INTO cpe_enc.relatorio_atualizacao (nome_view, atualizado_em)
+                        VALUES (%s, clock_timestamp())
+                        ON CONFLICT (nome_view) DO UPDATE SET atualizado_em = EXCLUDED.atualizado_em;
+                        """,
+                        (view,)
+                    )
+                    conn.commit()
+            return True
+        except psycopg.Error as e:
+            conn.rollback()
+            print(f"Erro ao atualizar as views dos relatórios: {e}")
+            return False
+
+
+def idade_dos_dados():
+    """Retorna {nome_view: timedelta desde a última atualização}."""
+    with get_connection() as conn:
+        if not conn:
+            return {}
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT nome_view, CURRENT_TIMESTAMP - atualizado_em
+                    FROM cpe_enc.relatorio_atualizacao;
+                    """
+                )
+                return dict(cur.fetchall())
+        except psycopg.Error as e:
+            print(f"Erro ao consultar a atualização dos relatórios: {e}")
+            return {}
+
+
+def formatar_idade(idade):
+    """Texto curto para o indicador de defasagem (ex.: 'há 12 min')."""
+    if idade is None:
+        return "nunca atualizado"
+    minutos = int(idade.total_seconds() // 60)
+    if minutos < 1:
+        return "atualizado agora"
+    if minutos < 60:
+        return f"há {minutos} min"
+    if minutos < 60 * 24:
+        return f"há {minutos // 60} h"
+    return f"há {minutos // (60 * 24)} dia(s)"
+
+
+def iniciar_atualizacao_periodica(intervalo_segundos=None):
+    """
+    Atualiza as views em segundo plano a cada 'intervalo_segundos'
+    (padrão: RELATORIOS_INTERVALO_ATUALIZACAO do .env; 0 desativa).
+    """
+    global _thread_agendamento
+    if intervalo_segundos is None:
+        intervalo_segundos = float(os.getenv("RELATORIOS_INTERVALO_ATUALIZACAO", "0"))
+    if intervalo_segundos <= 0 or _thread_agendamento is not None:
+        return
+
+    def _executar():
+        while not _parar_agendamento.wait(intervalo_segundos):
+            atualizar_views()
+
+    _parar_agendamento.clear()
+    _thread_agendamento = threading.Thread(target=_executar, name="atualizacao-relatorios", daemon=True)
+    _thread_agendamento.start()
+
+
+def parar_atualizacao_periodica():
+    global _thread_agendamento
+    _parar_agendamento.set()
+    _thread_agendamento = None
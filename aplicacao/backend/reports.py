@@ -1,114 +1,374 @@
 import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # Os gráficos só são salvos em arquivo; o pandas (relatório 4) importa o pyplot
 import seaborn as sns
-import matplotlib.pyplot as plt
-from db_config import get_db_connection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from db_config import get_connection
+from report_views import CONSULTAS_RELATORIOS, SERIE_DIAS, consulta_candidaturas
+from leitura_colunar import ler_dataframe
 
 OUTPUT_DIR = "imagens"
+# Gráficos guardados por relatório em OUTPUT_DIR/cache (os menos usados recentemente saem primeiro)
+CACHE_MAX_POR_RELATORIO = int(os.getenv("RELATORIOS_CACHE_MAX", "10"))
 
-def gerar_grafico_consulta1(conn):
+_lock_manifesto = threading.Lock()
+
+
+def consultar_1(conn):
     print("Executando Consulta 1: Popularidade das Áreas...")
 
-    sql = """
-        SELECT ai.nome_area,
-               COUNT(DISTINCT ap.id_aluno) AS numero_de_alunos_unicos
-        FROM cpe_enc.area_de_interesse AS ai
-        JOIN cpe_enc.projeto_area AS pa ON ai.id_area = pa.id_area
-        JOIN cpe_enc.aluno_projeto AS ap ON pa.id_projeto = ap.id_projeto
-        GROUP BY ai.nome_area
-        ORDER BY numero_de_alunos_unicos DESC;
+    # Lê da view materializada (ver report_views.atualizar_views)
+    return ler_dataframe(conn, CONSULTAS_RELATORIOS[1])
+
+
+def _nova_figura(figsize):
+    """
+    Figura com canvas Agg próprio, sem o estado global do pyplot: as renderizações
+    podem rodar em threads diferentes ao mesmo tempo (ver executar_todas).
     """
-    df = pd.read_sql(sql, conn)
-
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x='nome_area', y='numero_de_alunos_unicos', data=df, palette='Blues_d')
-    plt.title('Popularidade das Áreas por Engajamento de Alunos')
-    plt.xlabel('Área de Interesse')
-    plt.ylabel('Número de Alunos Únicos')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-
-    path = os.path.join(OUTPUT_DIR, 'consulta1.png')
-    plt.savefig(path)
-    plt.close()
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def renderizar_1(df, path=None):
+    fig = _nova_figura((10, 6))
+    ax = fig.subplots()
+    sns.barplot(x='nome_area', y='numero_de_alunos_unicos', data=df, palette='Blues_d', ax=ax)
+    ax.set_title('Popularidade das Áreas por Engajamento de Alunos')
+    ax.set_xlabel('Área de Interesse')
+    ax.set_ylabel('Número de Alunos Únicos')
+    for rotulo in ax.get_xticklabels():
+        rotulo.set_rotation(45)
+        rotulo.set_horizontalalignment('right')
+    fig.tight_layout()
+
+    path = path or os.path.join(OUTPUT_DIR, 'consulta1.png')
+    fig.savefig(path)
     print(f"Gráfico 1 salvo em: {path}\n")
+    return path
 
 
-def gerar_grafico_consulta2(conn):
+def gerar_grafico_consulta1(conn):
+    return gerar_relatorio(1, conn)
+
+
+def consultar_2(conn):
     print("Executando Consulta 2: Ranking de Professores...")
 
-    sql = """
-        SELECT u.nome_completo AS nome_professor,
-               COUNT(p.id_projeto) AS numero_de_projetos
-        FROM cpe_enc.professor AS prof
-        JOIN cpe_enc.usuario AS u ON prof.id_usuario = u.id_usuario
-        JOIN cpe_enc.projeto AS p ON prof.id_usuario = p.id_professor_orientador
-        WHERE p.status IN ('Em Andamento', 'Proposto')
-        GROUP BY u.nome_completo
-        ORDER BY numero_de_projetos ASC;
-    """
-    df = pd.read_sql(sql, conn)
-
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x='numero_de_projetos', y='nome_professor', data=df, palette='Reds_r')
-    plt.title('Ranking de Professores por Volume de Orientação')
-    plt.xlabel('Número de Projetos Ativos')
-    plt.ylabel('Professor')
-    plt.tight_layout()
-
-    path = os.path.join(OUTPUT_DIR, 'consulta2.png')
-    plt.savefig(path)
-    plt.close()
+    return ler_dataframe(conn, CONSULTAS_RELATORIOS[2])
+
+
+def renderizar_2(df, path=None):
+    fig = _nova_figura((10, 6))
+    ax = fig.subplots()
+    sns.barplot(x='numero_de_projetos', y='nome_professor', data=df, palette='Reds_r', ax=ax)
+    ax.set_title('Ranking de Professores por Volume de Orientação')
+    ax.set_xlabel('Número de Projetos Ativos')
+    ax.set_ylabel('Professor')
+    fig.tight_layout()
+
+    path = path or os.path.join(OUTPUT_DIR, 'consulta2.png')
+    fig.savefig(path)
     print(f"Gráfico 2 salvo em: {path}\n")
+    return path
 
 
-def gerar_grafico_consulta3(conn):
+def gerar_grafico_consulta2(conn):
+    return gerar_relatorio(2, conn)
+
+
+def consultar_3(conn):
     print("Executando Consulta 3: Vagas Abertas por Projeto...")
 
-    sql = """
-        SELECT p.titulo AS titulo_projeto,
-               u.nome_completo AS professor_orientador,
-               SUM(v.numero_posicoes) AS total_de_vagas_abertas
-        FROM cpe_enc.vaga AS v
-        JOIN cpe_enc.projeto AS p ON v.id_projeto = p.id_projeto
-        JOIN cpe_enc.professor AS prof ON p.id_professor_orientador = prof.id_usuario
-        JOIN cpe_enc.usuario AS u ON prof.id_usuario = u.id_usuario
-        WHERE v.prazo_inscricao > CURRENT_TIMESTAMP
-        GROUP BY p.titulo, u.nome_completo
-        ORDER BY total_de_vagas_abertas DESC;
-    """
-    df = pd.read_sql(sql, conn)
-
-    plt.figure(figsize=(10, 10))
-    plt.pie(
-        df['total_de_vagas_abertas'],
-        labels=df['titulo_projeto'],
-        autopct='%1.1f%%',
-        startangle=140,
-        textprops={'fontsize': 10}
-    )
-    plt.title('Distribuição de Vagas Abertas por Projeto', fontsize=14)
-    plt.axis('equal')
-    plt.tight_layout()
-
-    path = os.path.join(OUTPUT_DIR, 'consulta3.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
+    return ler_dataframe(conn, CONSULTAS_RELATORIOS[3])
+
+
+def renderizar_3(df, path=None):
+    fig = _nova_figura((10, 10))
+    ax = fig.subplots()
+    if df['total_de_vagas_abertas'].sum() > 0:
+        ax.pie(
+            df['total_de_vagas_abertas'],
+            labels=df['titulo_projeto'],
+            autopct='%1.1f%%',
+            startangle=140,
+            textprops={'fontsize': 10}
+        )
+        ax.axis('equal')
+    else:
+        # pie não aceita só fatias zeradas
+        ax.text(0.5, 0.5, "Nenhuma vaga aberta", ha="center", va="center", color="gray")
+        ax.set_axis_off()
+    ax.set_title('Distribuição de Vagas Abertas por Projeto', fontsize=14)
+    fig.tight_layout()
+
+    path = path or os.path.join(OUTPUT_DIR, 'consulta3.png')
+    fig.savefig(path, bbox_inches='tight')
     print(f"Gráfico 3 salvo em: {path}\n")
+    return path
+
+
+def gerar_grafico_consulta3(conn):
+    return gerar_relatorio(3, conn)
+
+
+SERIES_MAX = 8  # projetos/áreas com mais candidaturas exibidos em cada painel
+
+
+def consultar_4(conn, granularidade="semana"):
+    print(f"Executando Consulta 4: Candidaturas por {granularidade}...")
+
+    # Lê da rollup diária mantida por gatilhos, não de candidatura
+    df = ler_dataframe(conn, consulta_candidaturas(granularidade))
+    df.attrs["granularidade"] = granularidade
+    return df
+
+
+def renderizar_4(df, path=None):
+    granularidade = df.attrs.get("granularidade", "semana")
+    fig = _nova_figura((12, 10))
+    eixos = fig.subplots(2, 1, sharex=True)
+    for ax, (dimensao, rotulo) in zip(eixos, [("area", "Área"), ("projeto", "Projeto")]):
+        dados = df[df['dimensao'] == dimensao]
+        if dados.empty:
+            ax.text(0.5, 0.5, "Nenhuma candidatura no período", ha="center", va="center", color="gray")
+            ax.set_title(f"Candidaturas por {granularidade} e {rotulo.lower()}")
+            continue
+        serie = dados.pivot_table(index='periodo', columns='nome', values='candidaturas',
+                                  aggfunc='sum', fill_value=0)
+        principais = serie.sum().nlargest(SERIES_MAX).index
+        serie[principais].plot(ax=ax, marker='o', markersize=3)
+        ax.set_title(f"Candidaturas por {granularidade} e {rotulo.lower()} "
+                     f"({len(principais)} com mais candidaturas, últimos {SERIE_DIAS} dias)")
+        ax.set_ylabel('Candidaturas')
+        ax.legend(title=rotulo, fontsize=8, loc='upper left', bbox_to_anchor=(1.01, 1))
+    eixos[-1].set_xlabel('Dia' if granularidade == 'dia' else 'Semana (início)')
+    fig.tight_layout()
+
+    path = path or os.path.join(OUTPUT_DIR, 'consulta4.png')
+    fig.savefig(path, bbox_inches='tight')
+    print(f"Gráfico 4 salvo em: {path}\n")
+    return path
+
+
+def gerar_grafico_consulta4(conn, granularidade="semana"):
+    return gerar_relatorio(4, conn, granularidade=granularidade)
 
 
-def executar_todas():
+# id do relatório -> (consulta, renderização)
+RELATORIOS = {
+    1: (consultar_1, renderizar_1),
+    2: (consultar_2, renderizar_2),
+    3: (consultar_3, renderizar_3),
+    4: (consultar_4, renderizar_4),
+}
+
+
+# Cache de gráficos endereçado pelo conteúdo: a chave é o hash do resultado da
+# consulta (e do código da renderização), então dados iguais reaproveitam o PNG
+# já gerado em vez de renderizar de novo. O manifesto (cache/manifesto.json)
+# registra, por chave, o relatório, os tempos de consulta e de renderização e os hits.
+
+def _pasta_cache():
+    return os.path.join(OUTPUT_DIR, "cache")
+
+
+def _caminho_manifesto():
+    return os.path.join(_pasta_cache(), "manifesto.json")
+
+
+def _ler_manifesto():
+    try:
+        with open(_caminho_manifesto(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_manifesto(manifesto):
+    caminho = _caminho_manifesto()
+    with open(caminho + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    os.replace(caminho + ".tmp", caminho)
+
+
+def hash_resultado(id_relatorio, df):
+    """Hash do resultado da consulta (colunas, tipos e valores) e do código que o renderiza."""
+    codigo = RELATORIOS[id_relatorio][1].__code__
+    h = hashlib.sha256()
+    h.update(f"{id_relatorio}|{list(df.columns)}|{[str(t) for t in df.dtypes]}|{sorted(df.attrs.items())}".encode())
+    h.update(codigo.co_code)
+    h.update(repr(codigo.co_consts).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def _buscar_no_cache(chave, consulta_ms):
+    """Retorna o PNG já renderizado para 'chave', registrando o hit, ou None."""
+    arquivo = os.path.join(_pasta_cache(), f"{chave}.png")
+    with _lock_manifesto:
+        manifesto = _ler_manifesto()
+        entrada = manifesto.get(chave)
+        if entrada is None or not os.path.exists(arquivo):
+            return None
+        entrada["hits"] += 1
+        entrada["ultimo_uso"] = time.time()
+        entrada["ultima_consulta_ms"] = round(consulta_ms, 3)
+        _gravar_manifesto(manifesto)
+    return arquivo
+
+
+def _registrar_renderizacao(id_relatorio, chave, consulta_ms, render_ms):
+    with _lock_manifesto:
+        manifesto = _ler_manifesto()
+        agora = time.time()
+        manifesto[chave] = {
+            "relatorio": id_relatorio,
+            "arquivo": f"{chave}.png",
+            "criado_em": agora,
+            "ultimo_uso": agora,
+            "consulta_ms": round(consulta_ms, 3),
+            "ultima_consulta_ms": round(consulta_ms, 3),
+            "render_ms": round(render_ms, 3),
+            "hits": 0,
+        }
+        do_relatorio = sorted((c for c, e in manifesto.items() if e["relatorio"] == id_relatorio),
+                              key=lambda c: manifesto[c]["ultimo_uso"], reverse=True)
+        for antiga in do_relatorio[CACHE_MAX_POR_RELATORIO:]:
+            entrada = manifesto.pop(antiga)
+            try:
+                os.remove(os.path.join(_pasta_cache(), entrada["arquivo"]))
+            except OSError:
+                pass
+        _gravar_manifesto(manifesto)
+
+
+def _publicar(id_relatorio, arquivo):
+    """Copia o PNG do cache para OUTPUT_DIR/consultaN.png, o caminho que os usuários conhecem."""
+    destino = os.path.join(OUTPUT_DIR, f"consulta{id_relatorio}.png")
+    shutil.copyfile(arquivo, destino)
+    return destino
+
+
+def _renderizar_medindo(id_relatorio, df, path):
+    """Renderiza e retorna (caminho, ms); roda numa thread de renderização."""
+    inicio = time.perf_counter()
+    path = RELATORIOS[id_relatorio][1](df, path)
+    return path, (time.perf_counter() - inicio) * 1000
+
+
+def _consultar(id_relatorio, conn, **parametros):
+    inicio = time.perf_counter()
+    df = RELATORIOS[id_relatorio][0](conn, **parametros)
+    return df, (time.perf_counter() - inicio) * 1000
+
+
+def gerar_relatorio(id_relatorio, conn, **parametros):
+    """
+    Consulta e gera o gráfico do relatório, reaproveitando o PNG do cache quando o
+    resultado da consulta não mudou. Retorna o caminho de OUTPUT_DIR/consultaN.png.
+    'parametros' são repassados à função de consulta (ex.: granularidade do relatório 4).
+    """
+    df, consulta_ms = _consultar(id_relatorio, conn, **parametros)
+    chave = hash_resultado(id_relatorio, df)
+
+    arquivo = _buscar_no_cache(chave, consulta_ms)
+    if arquivo:
+        print(f"Dados do relatório {id_relatorio} sem alterações: gráfico reaproveitado do cache.\n")
+    else:
+        os.makedirs(_pasta_cache(), exist_ok=True)
+        arquivo, render_ms = _renderizar_medindo(id_relatorio, df, os.path.join(_pasta_cache(), f"{chave}.png"))
+        _registrar_renderizacao(id_relatorio, chave, consulta_ms, render_ms)
+    return _publicar(id_relatorio, arquivo)
+
+
+def _consultar_com_pool(id_relatorio):
+    """Executa a consulta de um relatório numa conexão própria do pool (roda em thread)."""
+    with get_connection() as conn:
+        if not conn:
+            raise RuntimeError("Não foi possível conectar ao banco.")
+        return _consultar(id_relatorio, conn)
+
+
+def _executar_sequencial(ids):
+    caminhos = {}
+    with get_connection() as conn:
+        if not conn:
+            print("Não foi possível conectar ao banco.")
+            return caminhos
+        for id_relatorio in ids:
+            caminhos[id_relatorio] = gerar_relatorio(id_relatorio, conn)
+    return caminhos
+
+
+def executar_todas(ids=None, workers=None):
+    """
+    Gera os relatórios indicados (todos, por padrão) e retorna {id: caminho do PNG}.
+    Com workers > 1, as consultas rodam em paralelo em conexões separadas do pool e
+    cada renderização é enviada a um pool de threads assim que sua consulta termina.
+    As renderizações usam Figure + Agg (sem o estado global do pyplot), então podem
+    rodar em threads; como desenhar segura o GIL na maior parte do tempo, o ganho vem
+    de sobrepor as consultas umas às outras e às renderizações, sem o custo de subir
+    processos que reimportam pandas/matplotlib (benchmarks/bench_relatorios.py).
+    Relatórios cujo resultado já está no cache de gráficos não são renderizados.
+    """
+    ids = list(ids or RELATORIOS)
+    workers = workers or len(ids)
+
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
         print(f"Pasta '{OUTPUT_DIR}' criada.")
+    os.makedirs(_pasta_cache(), exist_ok=True)
+
+    inicio = time.perf_counter()
+    if workers <= 1:
+        caminhos = _executar_sequencial(ids)
+    else:
+        caminhos = {}
+        with ThreadPoolExecutor(max_workers=workers) as consultas, \
+                ThreadPoolExecutor(max_workers=workers) as renderizacoes:
+            futuros_consulta = {consultas.submit(_consultar_com_pool, i): i for i in ids}
+            futuros_render = {}
+            for futuro in as_completed(futuros_consulta):
+                id_relatorio = futuros_consulta[futuro]
+                try:
+                    df, consulta_ms = futuro.result()
+                except Exception as e:
+                    print(f"Erro na consulta do relatório {id_relatorio}: {e}")
+                    continue
+
+                chave = hash_resultado(id_relatorio, df)
+                arquivo = _buscar_no_cache(chave, consulta_ms)
+                if arquivo:
+                    caminhos[id_relatorio] = _publicar(id_relatorio, arquivo)
+                    continue
+                destino = os.path.join(_pasta_cache(), f"{chave}.png")
+                futuro_render = renderizacoes.submit(_renderizar_medindo, id_relatorio, df, destino)
+                futuros_render[futuro_render] = (id_relatorio, chave, consulta_ms)
+
+            for futuro in as_completed(futuros_render):
+                id_relatorio, chave, consulta_ms = futuros_render[futuro]
+                try:
+                    arquivo, render_ms = futuro.result()
+                except Exception as e:
+                    print(f"Erro ao renderizar o relatório {id_relatorio}: {e}")
+                    continue
+                _registrar_renderizacao(id_relatorio, chave, consulta_ms, render_ms)
+                caminhos[id_relatorio] = _publicar(id_relatorio, arquivo)
 
-    conn = get_db_connection()
-    if conn:
-        gerar_grafico_consulta1(conn)
-        gerar_grafico_consulta2(conn)
-        gerar_grafico_consulta3(conn)
-        conn.close()
-        print("Conexão com o banco de dados fechada.")
-        print("Todos os gráficos foram gerados com sucesso!")
+    duracao = time.perf_counter() - inicio
+    if len(caminhos) == len(ids):
+        print(f"Todos os gráficos foram gerados com sucesso! ({duracao:.2f}s)")
     else:
-        print("Não foi possível conectar ao banco.")
+        print(f"{len(caminhos)} de {len(ids)} gráficos gerados ({duracao:.2f}s).")
+    return caminhos
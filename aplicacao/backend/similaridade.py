@@ -0,0 +1,254 @@
+"""
+Recomendação local de professores por similaridade de áreas de interesse.
+
+Mantém em memória uma matriz professor x área (NumPy, float32) em que cada
+célula é o número de projetos do professor naquela área, montada a partir de
+projeto_area + projeto.id_professor_orientador. O vetor do aluno é montado da
+mesma forma a partir de aluno_projeto, e a similaridade (cosseno ou Jaccard
+ponderado) contra todos os professores é uma única operação vetorizada.
+
+A matriz é densa: o número de áreas é pequeno (dezenas), então uma linha por
+professor custa poucos bytes e evita a dependência de scipy.sparse.
+
+Alterações em projetos feitas pelo CRUD chegam via eventos.publicar("projeto", id);
+os projetos marcados são recarregados e só a contribuição deles é refeita na
+próxima consulta. SIMILARIDADE_TTL (segundos) força uma reconstrução completa
+de tempos em tempos, cobrindo alterações feitas fora deste processo.
+"""
+import os
+import time
+import threading
+import numpy as np
+import psycopg
+from db_config import get_connection
+import area_cache
+import eventos
+
+SIMILARIDADE_TTL = float(os.getenv("SIMILARIDADE_TTL", "600"))
+METRICAS = ("cosseno", "jaccard")
+
+_matriz = None                 # professores x áreas
+_linha_professor = {}          # id_professor -> linha da matriz
+_professores = []              # linha da matriz -> id_professor
+_coluna_area = {}              # id_area -> coluna da matriz
+_areas = []                    # coluna da matriz -> id_area
+_projetos = {}                 # id_projeto -> (id_professor, (id_area, ...))
+_projetos_sujos = set()
+_construida_em = 0.0
+_lock = threading.Lock()
+
+_SQL_PROJETOS = """
+    SELECT p.id_projeto, p.id_professor_orientador,
+           COALESCE(array_agg(pa.id_area) FILTER (WHERE pa.id_area IS NOT NULL), '{}')
+    FROM cpe_enc.projeto p
+             LEFT JOIN cpe_enc.projeto_area pa ON pa.id_projeto = p.id_projeto
+    {filtro}
+    GROUP BY p.id_projeto, p.id_professor_orientador;
+"""
+
+
+def _marcar_projeto(id_projeto):
+    with _lock:
+        _projetos_sujos.add(id_projeto)
+
+
+eventos.assinar("projeto", _marcar_projeto)
+
+
+def _buscar_projetos(ids=None):
+    """Retorna {id_projeto: (id_professor, (id_area, ...))} de todos os projetos ou dos ids indicados."""
+    if ids is None:
+        sql, params = _SQL_PROJETOS.format(filtro=""), None
+    else:
+        sql, params = _SQL_PROJETOS.format(filtro="WHERE p.id_projeto = ANY(%s)"), (list(ids),)
+
+    with get_connection() as conn:
+        if not conn:
+            return None
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                return {id_projeto: (id_prof, tuple(areas)) for id_projeto, id_prof, areas in cur.fetchall()}
+        except psycopg.Error as e:
+            print(f"Erro ao carregar os projetos para a similaridade: {e}")
+            return None
+
+
+def _garantir_indices(id_professor, ids_area):
+    """Cria linha/colunas novas na matriz quando aparecem professores ou áreas desconhecidos."""
+    global _matriz
+    novas_areas = [a for a in ids_area if a not in _coluna_area]
+    for id_area in novas_areas:
+        _coluna_area[id_area] = len(_areas)
+        _areas.append(id_area)
+    novo_professor = id_professor not in _linha_professor
+    if novo_professor:
+        _linha_professor[id_professor] = len(_professores)
+        _professores.append(id_professor)
+
+    if novas_areas or novo_professor:
+        maior = np.zeros((len(_professores), len(_areas)), dtype=np.float32)
+        maior[:_matriz.shape[0], :_matriz.shape[1]] = _matriz
+        _matriz = maior
+
+
+def _aplicar(id_professor, ids_area, sinal):
+    if not ids_area:
+        return
+    _garantir_indices(id_professor, ids_area)
+    colunas = [_coluna_area[a] for a in ids_area]
+    _matriz[_linha_professor[id_professor], colunas] += sinal
+
+
+def _reconstruir():
+    global _matriz, _construida_em
+    projetos = _buscar_projetos()
+    if projetos is None:
+        return False
+
+    _professores[:] = sorted({prof for prof, _ in projetos.values()})
+    _linha_professor.clear()
+    _linha_professor.update({p: i for i, p in enumerate(_professores)})
+    _areas[:] = sorted({a for _, areas in projetos.values() for a in areas})
+    _coluna_area.clear()
+    _coluna_area.update({a: j for j, a in enumerate(_areas)})
+
+    _matriz = np.zeros((len(_professores), len(_areas)), dtype=np.float32)
+    linhas = [_linha_professor[prof] for prof, areas in projetos.values() for _ in areas]
+    colunas = [_coluna_area[a] for _, areas in projetos.values() for a in areas]
+    np.add.at(_matriz, (linhas, colunas), 1.0)
+
+    _projetos.clear()
+    _projetos.update(projetos)
+    _projetos_sujos.clear()
+    _construida_em = time.monotonic()
+    return True
+
+
+def _atualizar_sujos():
+    """Refaz só a contribuição dos projetos alterados desde a última consulta."""
+    sujos = set(_projetos_sujos)
+    atuais = _buscar_projetos(sujos)
+    if atuais is None:
+        return False
+
+    for id_projeto in sujos:
+        if id_projeto in _projetos:
+            _aplicar(*_projetos.pop(id_projeto), -1.0)
+        if id_projeto in atuais:
+            _projetos[id_projeto] = atuais[id_projeto]
+            _aplicar(*atuais[id_projeto], 1.0)
+    _projetos_sujos.difference_update(sujos)
+    return True
+
+
+def _matriz_atualizada():
+    with _lock:
+        if _matriz is None or time.monotonic() - _construida_em > SIMILARIDADE_TTL:
+            _reconstruir()
+        elif _projetos_sujos:
+            _atualizar_sujos()
+        return _matriz is not None
+
+
+def invalidar():
+    """Descarta a matriz; a próxima consulta a reconstrói do banco."""
+    global _matriz
+    with _lock:
+        _matriz = None
+
+
+def vetor_aluno(id_aluno, coluna_area=None):
+    """Vetor de áreas do aluno (nº de projetos dele em cada área), nas colunas da matriz."""
+    if coluna_area is None:
+        coluna_area = dict(_coluna_area)
+    with get_connection() as conn:
+        if not conn:
+            return None
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT pa.id_area, COUNT(*)
+                    FROM cpe_enc.aluno_projeto ap
+                             JOIN cpe_enc.projeto_area pa ON pa.id_projeto = ap.id_projeto
+                    WHERE ap.id_aluno = %s
+                    GROUP BY pa.id_area;
+                    """,
+                    (id_aluno,)
+                )
+                contagens = cur.fetchall()
+        except psycopg.Error as e:
+            print(f"Erro ao buscar os interesses do aluno: {e}")
+            return None
+
+    vetor = np.zeros(len(coluna_area), dtype=np.float32)
+    for id_area, total in contagens:
+        if id_area in coluna_area:
+            vetor[coluna_area[id_area]] = total
+    return vetor
+
+
+def pontuar(matriz, vetor, metrica="cosseno"):
+    """Similaridade de cada linha da matriz com o vetor (0 a 1)."""
+    if metrica == "jaccard":
+        uniao = np.maximum(matriz, vetor).sum(axis=1)
+        return np.divide(np.minimum(matriz, vetor).sum(axis=1), uniao,
+                         out=np.zeros(len(matriz), dtype=np.float32), where=uniao > 0)
+    normas = np.linalg.norm(matriz, axis=1) * np.linalg.norm(vetor)
+    return np.divide(matriz @ vetor, normas, out=np.zeros(len(matriz), dtype=np.float32), where=normas > 0)
+
+
+def _nomes_professores(ids):
+    with get_connection() as conn:
+        if not conn:
+            return {}
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT id_usuario, nome_completo FROM cpe_enc.usuario WHERE id_usuario = ANY(%s);",
+                            (list(ids),))
+                return dict(cur.fetchall())
+        except psycopg.Error as e:
+            print(f"Erro ao buscar os nomes dos professores: {e}")
+            return {}
+
+
+def professores_similares(id_aluno, k=5, metrica="cosseno"):
+    """
+    Retorna os k professores cujas áreas (pelos projetos que orientam) mais se parecem
+    com as do aluno, como lista de dicts {id_professor, nome_completo, similaridade,
+    areas_em_comum}, do mais para o menos similar. Lista vazia se o aluno não tiver
+    áreas ou se nenhum professor tiver área em comum.
+    """
+    if metrica not in METRICAS:
+        raise ValueError(f"Métrica inválida: {metrica}. Use uma de {METRICAS}.")
+    if not _matriz_atualizada():
+        return []
+
+    with _lock:
+        matriz = _matriz.copy()
+        professores = list(_professores)
+        areas = list(_areas)
+        coluna_area = dict(_coluna_area)
+    vetor = vetor_aluno(id_aluno, coluna_area)
+    if vetor is None or not vetor.any() or len(matriz) == 0:
+        return []
+
+    pontuacoes = pontuar(matriz, vetor, metrica)
+    k = min(k, int(np.count_nonzero(pontuacoes)))
+    if k == 0:
+        return []
+    melhores = np.argpartition(-pontuacoes, k - 1)[:k]
+    melhores = melhores[np.argsort(-pontuacoes[melhores])]
+
+    nomes = _nomes_professores(professores[i] for i in melhores)
+    resultado = []
+    for i in melhores:
+        comuns = np.flatnonzero((matriz[i] > 0) & (vetor > 0))
+        resultado.append({
+            "id_professor": professores[i],
+            "nome_completo": nomes.get(professores[i]),
+            "similaridade": float(pontuacoes[i]),
+            "areas_em_comum": area_cache.nomes([areas[j] for j in comuns]),
+        })
+    return resultado